@@ -1,33 +1,27 @@
-import { useEffect } from 'react';
+import { lazy, Suspense, useEffect } from 'react';
 import { BrowserRouter as Router, Routes, Route, Navigate, useLocation } from 'react-router-dom';
-import { QueryClient, useQueryClient } from '@tanstack/react-query';
-import { PersistQueryClientProvider } from '@tanstack/react-query-persist-client';
-import { createSyncStoragePersister } from '@tanstack/query-sync-storage-persister';
-import { ReactQueryDevtools } from '@tanstack/react-query-devtools';
+import { QueryClient, QueryClientProvider, useQueryClient } from '@tanstack/react-query';
 import './styles/variables.css';
 import './styles/global.css';
 import BottomNav from './components/layout/BottomNav';
 import Header from './components/common/Header';
-import AuthPage from './pages/auth/AuthPage';
 import Home from './pages/home/Home';
-import ProductDetail from './pages/products/ProductDetail';
-import ChatRoom from './pages/chat/ChatRoom';
-import MessagesList from './pages/chat/MessagesList';
-import SellerDashboard from './pages/seller/SellerDashboard';
-import AddProduct from './pages/seller/AddProduct';
-import EditProduct from './pages/seller/EditProduct';
-import EditStore from './pages/seller/EditStore';
-import AffiliateDashboard from './pages/affiliate/AffiliateDashboard';
-import OrdersList from './pages/orders/OrdersList';
-import ProfilePage from './pages/profile/ProfilePage';
-import AccountSettings from './pages/profile/AccountSettings';
-import TransactionHistory from './pages/profile/TransactionHistory';
-import AdminDashboard from './pages/admin/AdminDashboard';
-import StorePage from './pages/store/StorePage';
-import PaymentSuccess from './pages/orders/PaymentSuccess';
+import { pages, preloadForRole } from './routes';
+import { persistQueryCache, queryPersister } from './lib/queryPersister';
 import { AuthProvider } from './context/AuthContext';
 import { useAuth } from './hooks/useAuth';
 
+const {
+    AuthPage, ProductDetail, StorePage, MessagesList, ChatRoom, OrdersList, PaymentSuccess, ProfilePage,
+    AccountSettings, TransactionHistory, AdminDashboard, SellerDashboard, AddProduct, EditProduct, EditStore,
+    AffiliateDashboard
+} = pages;
+
+// Dev-only: the branch is dropped from production builds, so the devtools chunk is never emitted
+const ReactQueryDevtools = import.meta.env.DEV
+    ? lazy(() => import('@tanstack/react-query-devtools').then(m => ({ default: m.ReactQueryDevtools })))
+    : () => null;
+
 const queryClient = new QueryClient({
     defaultOptions: {
         queries: {
@@ -35,38 +29,41 @@ const queryClient = new QueryClient({
             gcTime: 1000 * 60 * 30, // 30 minutes
             retry: 1,
             refetchOnWindowFocus: false,
+            // Per-query IndexedDB persistence, see PERSIST_POLICY in lib/queryPersister
+            persister: queryPersister,
         },
     },
 });
 
-const persister = createSyncStoragePersister({
-    storage: window.localStorage,
-});
+// Let the E2E suite (testsprite_tests/support/readiness.py) wait for real idleness
+if (import.meta.env.DEV) {
+    (window as any).__zwaQueryIdle = () =>
+        queryClient.isFetching() === 0 && queryClient.isMutating() === 0;
+}
 
-const persistOptions = {
-    persister,
-    maxAge: 1000 * 60 * 60 * 24, // 24 hours
-    buster: 'v1', // Increment this to clear cache on deploy
-};
+persistQueryCache(queryClient);
+
+// Drop the single-blob cache left by the previous localStorage persister
+window.localStorage.removeItem('REACT_QUERY_OFFLINE_CACHE');
 
 function App() {
     return (
-        <PersistQueryClientProvider
-            client={queryClient}
-            persistOptions={persistOptions}
-        >
+        <QueryClientProvider client={queryClient}>
             <AuthProvider>
                 <Router>
                     <AppContent />
                 </Router>
             </AuthProvider>
-            <ReactQueryDevtools initialIsOpen={false} />
-        </PersistQueryClientProvider>
+            <Suspense fallback={null}>
+                <ReactQueryDevtools initialIsOpen={false} />
+            </Suspense>
+        </QueryClientProvider>
     );
 }
 
 import { useBootstrapData } from './hooks/useBootstrapData';
 import { useYabetooReturn } from './hooks/useYabetooReturn';
+import { useUnreadRealtime } from './hooks/useUnreadCounters';
 
 function AppContent() {
     const { user, profile, loading } = useAuth();
@@ -80,6 +77,9 @@ function AppContent() {
     // Handle Yabetoo payment gateway returns
     useYabetooReturn();
 
+    // Unread badges and conversation previews, one realtime channel per user
+    useUnreadRealtime(user?.id);
+
     // Global Affiliate Tracking
     useEffect(() => {
         const params = new URLSearchParams(location.search);
@@ -93,6 +93,12 @@ function AppContent() {
         }
     }, [location.search]);
 
+    // Warm the chunks this role is likely to open next, once the browser is idle
+    useEffect(() => {
+        if (loading) return;
+        return preloadForRole(user ? profile?.role || 'buyer' : null);
+    }, [loading, user, profile?.role]);
+
     // Show loading spinner only during initial auth check
     // AuthContext now ensures profile is loaded before setting loading=false
     if (loading) {
@@ -111,47 +117,53 @@ function AppContent() {
         <div className="app-container">
             {user && <Header />}
             <main style={{ flex: 1, paddingBottom: isAdminRoute ? '0' : '90px', width: '100%' }}>
-                <Routes>
-                    <Route path="/auth" element={!user ? <AuthPage /> : <Navigate to="/" />} />
-
-                    {/* Public Routes - Accessible to visitors */}
-                    <Route path="/" element={<Home />} />
-                    <Route path="/product/:id" element={<ProductDetail />} />
-                    <Route path="/store/:sellerId" element={<StorePage />} />
-                    <Route path="/search" element={<Navigate to="/" replace />} />
-
-                    {/* Protected Routes - Require authentication */}
-                    <Route path="/messages" element={user ? <MessagesList /> : <Navigate to="/auth" />} />
-                    <Route path="/chat/:id" element={user ? <ChatRoom /> : <Navigate to="/auth" />} />
-                    <Route path="/orders" element={user ? <OrdersList /> : <Navigate to="/auth" />} />
-                    <Route path="/payment-success" element={user ? <PaymentSuccess /> : <Navigate to="/auth" />} />
-                    <Route path="/profile" element={user ? <ProfilePage /> : <Navigate to="/auth" />} />
-                    <Route path="/profile/settings" element={user ? <AccountSettings /> : <Navigate to="/auth" />} />
-                    <Route path="/profile/transactions" element={user ? <TransactionHistory /> : <Navigate to="/auth" />} />
-
-                    {/* Admin Routes */}
-                    <Route
-                        path="/admin"
-                        element={user && profile?.role === 'admin' ? <AdminDashboard /> : <Navigate to="/" />}
-                    />
-
-                    {/* Seller Routes */}
-                    <Route path="/seller/dashboard" element={user ? <SellerDashboard /> : <Navigate to="/auth" />} />
-                    <Route path="/seller/add-product" element={user ? <AddProduct /> : <Navigate to="/auth" />} />
-                    <Route path="/seller/edit-product/:id" element={user ? <EditProduct /> : <Navigate to="/auth" />} />
-                    <Route path="/seller/edit-store" element={user ? <EditStore /> : <Navigate to="/auth" />} />
-
-                    {/* Affiliate Routes */}
-                    <Route
-                        path="/affiliate"
-                        element={
-                            user ? (
-                                profile?.role === 'affiliate' ? <AffiliateDashboard /> :
-                                    profile ? <Navigate to="/" /> : null // Show nothing (or a loader) while profile is fetching
-                            ) : <Navigate to="/auth" />
-                        }
-                    />
-                </Routes>
+                <Suspense fallback={
+                    <div className="app-loading-screen">
+                        <div className="loading-spinner"></div>
+                    </div>
+                }>
+                    <Routes>
+                        <Route path="/auth" element={!user ? <AuthPage /> : <Navigate to="/" />} />
+
+                        {/* Public Routes - Accessible to visitors */}
+                        <Route path="/" element={<Home />} />
+                        <Route path="/product/:id" element={<ProductDetail />} />
+                        <Route path="/store/:sellerId" element={<StorePage />} />
+                        <Route path="/search" element={<Navigate to="/" replace />} />
+
+                        {/* Protected Routes - Require authentication */}
+                        <Route path="/messages" element={user ? <MessagesList /> : <Navigate to="/auth" />} />
+                        <Route path="/chat/:id" element={user ? <ChatRoom /> : <Navigate to="/auth" />} />
+                        <Route path="/orders" element={user ? <OrdersList /> : <Navigate to="/auth" />} />
+                        <Route path="/payment-success" element={user ? <PaymentSuccess /> : <Navigate to="/auth" />} />
+                        <Route path="/profile" element={user ? <ProfilePage /> : <Navigate to="/auth" />} />
+                        <Route path="/profile/settings" element={user ? <AccountSettings /> : <Navigate to="/auth" />} />
+                        <Route path="/profile/transactions" element={user ? <TransactionHistory /> : <Navigate to="/auth" />} />
+
+                        {/* Admin Routes */}
+                        <Route
+                            path="/admin"
+                            element={user && profile?.role === 'admin' ? <AdminDashboard /> : <Navigate to="/" />}
+                        />
+
+                        {/* Seller Routes */}
+                        <Route path="/seller/dashboard" element={user ? <SellerDashboard /> : <Navigate to="/auth" />} />
+                        <Route path="/seller/add-product" element={user ? <AddProduct /> : <Navigate to="/auth" />} />
+                        <Route path="/seller/edit-product/:id" element={user ? <EditProduct /> : <Navigate to="/auth" />} />
+                        <Route path="/seller/edit-store" element={user ? <EditStore /> : <Navigate to="/auth" />} />
+
+                        {/* Affiliate Routes */}
+                        <Route
+                            path="/affiliate"
+                            element={
+                                user ? (
+                                    profile?.role === 'affiliate' ? <AffiliateDashboard /> :
+                                        profile ? <Navigate to="/" /> : null // Show nothing (or a loader) while profile is fetching
+                                ) : <Navigate to="/auth" />
+                            }
+                        />
+                    </Routes>
+                </Suspense>
             </main>
             {!isAdminRoute && <BottomNav />}
         </div>
@@ -1,5 +1,6 @@
 import React from 'react';
 import { X, ZoomIn } from 'lucide-react';
+import { imageProps } from '../../lib/images';
 
 interface ImageLightboxProps {
     isOpen: boolean;
@@ -24,7 +25,7 @@ const ImageLightbox: React.FC<ImageLightboxProps> = ({ isOpen, imageUrl, title,
                     </button>
                 </div>
                 <div style={styles.imageContainer}>
-                    <img src={imageUrl} alt={title} style={styles.image} />
+                    <img {...imageProps(imageUrl, 'lightbox')} alt={title} style={styles.image} />
                 </div>
                 <div style={styles.hint}>
                     Cliquez à l'extérieur pour fermer
@@ -2,12 +2,15 @@ import React, { useState, useEffect, useRef } from 'react';
 import { Bell, Package, Wallet, Info } from 'lucide-react';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../../hooks/useAuth';
-import { useQuery } from '@tanstack/react-query';
+import { useQuery, useQueryClient } from '@tanstack/react-query';
+import { useUnreadCounters } from '../../hooks/useUnreadCounters';
+import { UnreadCounters } from '../../services/unreadService';
 import { notificationService, Notification } from '../../services/notificationService';
 
 const NotificationBell = () => {
     const { user } = useAuth();
     const navigate = useNavigate();
+    const queryClient = useQueryClient();
     const [isOpen, setIsOpen] = useState(false);
     const dropdownRef = useRef<HTMLDivElement>(null);
 
@@ -23,21 +26,11 @@ const NotificationBell = () => {
         staleTime: 1000 * 60 * 5, // 5 minutes
     });
 
-    const { data: initialUnreadCount = 0 } = useQuery({
-        queryKey: ['notifications-unread', user?.id],
-        queryFn: async () => {
-            if (!user?.id) return 0;
-            const { count } = await notificationService.getUnreadCount(user.id);
-            return count || 0;
-        },
-        enabled: !!user?.id,
-        // Short stale time for unread count as it changes often
-        staleTime: 1000 * 30,
-    });
+    // Server-maintained total, pushed by the per-user unread channel (useUnreadRealtime)
+    const { data: counters } = useUnreadCounters(user?.id);
 
     // Local state to handle real-time updates on TOP of the cached data
     const [realtimeNotifications, setRealtimeNotifications] = useState<Notification[]>([]);
-    const [realtimeUnreadOffset, setRealtimeUnreadOffset] = useState(0);
 
     // Combine cached + realtime
     // Note: In a real production app, we might just invalidating query on event, 
@@ -46,7 +39,13 @@ const NotificationBell = () => {
         return [...realtimeNotifications, ...initialNotifications].slice(0, 20);
     }, [realtimeNotifications, initialNotifications]);
 
-    const unreadCount = initialUnreadCount + realtimeUnreadOffset;
+    const unreadCount = counters?.notifications_unread || 0;
+
+    const setUnreadCount = (update: (count: number) => number) => {
+        queryClient.setQueryData<UnreadCounters>(['unread-counters', user?.id], (prev) =>
+            prev && { ...prev, notifications_unread: Math.max(0, update(prev.notifications_unread)) }
+        );
+    };
 
     useEffect(() => {
         if (!user) return;
@@ -54,7 +53,6 @@ const NotificationBell = () => {
         // Subscribe to real-time
         const subscription = notificationService.subscribe(user.id, (newNotif) => {
             setRealtimeNotifications(prev => [newNotif, ...prev]);
-            setRealtimeUnreadOffset(prev => prev + 1);
         });
 
         // Click outside listener
@@ -83,7 +81,7 @@ const NotificationBell = () => {
         if (!notif.is_read) {
             await notificationService.markAsRead(notif.id);
             // Optimistic update
-            setRealtimeUnreadOffset(prev => Math.max(-initialUnreadCount, prev - 1));
+            setUnreadCount(count => count - 1);
             setRealtimeNotifications(prev => prev.map(n => n.id === notif.id ? { ...n, is_read: true } : n));
             // Invalidate to be sure
             // queryClient.invalidateQueries({ queryKey: ['notifications'] });
@@ -99,8 +97,8 @@ const NotificationBell = () => {
         if (!user) return;
         await notificationService.markAllAsRead(user.id);
 
-        // Reset realtime offset to negative of initial to make total 0
-        setRealtimeUnreadOffset(-initialUnreadCount);
+        // Optimistic reset; the trigger-maintained total confirms it over realtime
+        setUnreadCount(() => 0);
         // Mark all realtime as read
         setRealtimeNotifications(prev => prev.map(n => ({ ...n, is_read: true })));
         // Note: We should probably refetch here to sync up perfectly
@@ -16,6 +16,7 @@ const KYCRequestModal: React.FC<KYCRequestModalProps> = ({ isOpen, onClose, sell
     const [whatsapp, setWhatsapp] = useState(existingRequest?.whatsapp_number || '');
     const [notes, setNotes] = useState('');
     const [loading, setLoading] = useState(false);
+    const [uploadProgress, setUploadProgress] = useState({ id_card: 0, selfie: 0 });
     const [error, setError] = useState('');
 
     const [idCardPreview, setIdCardPreview] = useState<string | null>(null);
@@ -27,9 +28,9 @@ const KYCRequestModal: React.FC<KYCRequestModalProps> = ({ isOpen, onClose, sell
         const file = e.target.files?.[0];
         if (!file) return;
 
-        // Vérifier la taille (max 5MB)
-        if (file.size > 5 * 1024 * 1024) {
-            setError('La photo ne doit pas dépasser 5MB');
+        // Vérifier la taille (max 15MB, la photo est compressée avant l'envoi)
+        if (file.size > 15 * 1024 * 1024) {
+            setError('La photo ne doit pas dépasser 15MB');
             return;
         }
 
@@ -76,27 +77,31 @@ const KYCRequestModal: React.FC<KYCRequestModalProps> = ({ isOpen, onClose, sell
             let idCardUrl = existingRequest?.id_card_url;
             let selfieUrl = existingRequest?.selfie_with_id_url;
 
-            // Upload nouvelle photo ID si changée
-            if (idCardFile) {
-                const { url, error: uploadError } = await kycService.uploadKYCDocument(idCardFile, sellerId, 'id_card');
-                if (uploadError) {
-                    setError('Erreur lors de l\'upload de la carte d\'identité');
-                    setLoading(false);
-                    return;
-                }
-                idCardUrl = url;
-            }
+            // Upload des nouvelles photos (en parallèle) si changées
+            setUploadProgress({ id_card: idCardFile ? 0 : 1, selfie: selfieFile ? 0 : 1 });
+            const [idCardUpload, selfieUpload] = await Promise.all([
+                idCardFile
+                    ? kycService.uploadKYCDocument(idCardFile, sellerId, 'id_card', fraction =>
+                        setUploadProgress(prev => ({ ...prev, id_card: fraction })))
+                    : null,
+                selfieFile
+                    ? kycService.uploadKYCDocument(selfieFile, sellerId, 'selfie', fraction =>
+                        setUploadProgress(prev => ({ ...prev, selfie: fraction })))
+                    : null,
+            ]);
 
-            // Upload nouveau selfie si changé
-            if (selfieFile) {
-                const { url, error: uploadError } = await kycService.uploadKYCDocument(selfieFile, sellerId, 'selfie');
-                if (uploadError) {
-                    setError('Erreur lors de l\'upload du selfie');
-                    setLoading(false);
-                    return;
-                }
-                selfieUrl = url;
+            if (idCardUpload?.error) {
+                setError('Erreur lors de l\'upload de la carte d\'identité');
+                setLoading(false);
+                return;
+            }
+            if (selfieUpload?.error) {
+                setError('Erreur lors de l\'upload du selfie');
+                setLoading(false);
+                return;
             }
+            if (idCardUpload) idCardUrl = idCardUpload.url;
+            if (selfieUpload) selfieUrl = selfieUpload.url;
 
             // Soumettre ou re-soumettre la demande
             let result;
@@ -255,7 +260,7 @@ const KYCRequestModal: React.FC<KYCRequestModalProps> = ({ isOpen, onClose, sell
                             cursor: loading ? 'not-allowed' : 'pointer'
                         }}
                     >
-                        {loading ? '⏳ Envoi en cours...' : '✅ Soumettre ma demande'}
+                        {loading ? `⏳ Envoi en cours... ${Math.round((uploadProgress.id_card + uploadProgress.selfie) * 50)}%` : '✅ Soumettre ma demande'}
                     </button>
                 </div>
             </div>
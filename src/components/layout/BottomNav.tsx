@@ -1,22 +1,21 @@
 import { Home, ShoppingBag, User, Briefcase, MessageSquare, TrendingUp } from 'lucide-react';
 import { NavLink } from 'react-router-dom';
 import { useAuth } from '../../hooks/useAuth';
-import { chatService } from '../../services/chatService';
-import { useQuery } from '@tanstack/react-query';
+import { useUnreadCounters } from '../../hooks/useUnreadCounters';
+import { preloadRoute } from '../../routes';
 import '../../styles/variables.css';
 
+// Start fetching a tab's chunk as soon as the pointer (or finger) reaches it
+const warm = (to: string) => ({
+    onMouseEnter: () => preloadRoute(to),
+    onTouchStart: () => preloadRoute(to),
+});
+
 const BottomNav = () => {
     const { profile, user, loading } = useAuth();
-    const { data: unreadCount = 0 } = useQuery({
-        queryKey: ['unread-messages-count', user?.id],
-        queryFn: async () => {
-            if (!user?.id) return 0;
-            return chatService.getUnreadCount(user.id);
-        },
-        enabled: !!user?.id,
-        refetchInterval: 30000, // Refresh every 30 seconds
-        staleTime: 30000,
-    });
+    // Pushed by the per-user realtime channel (useUnreadRealtime), no polling
+    const { data: counters } = useUnreadCounters(user?.id);
+    const unreadCount = counters?.messages_unread || 0;
 
     // Visitor navigation - show simplified nav for non-authenticated users
     if (!user) {
@@ -26,7 +25,7 @@ const BottomNav = () => {
                     <Home size={24} />
                     <span style={styles.label}>Accueil</span>
                 </NavLink>
-                <NavLink to="/auth" style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
+                <NavLink to="/auth" {...warm('/auth')} style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
                     <User size={24} />
                     <span style={styles.label}>Se connecter</span>
                 </NavLink>
@@ -47,11 +46,11 @@ const BottomNav = () => {
     if (role === 'seller') {
         return (
             <nav style={styles.nav}>
-                <NavLink to="/seller/dashboard" style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
+                <NavLink to="/seller/dashboard" {...warm('/seller/dashboard')} style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
                     <Briefcase size={24} />
                     <span style={styles.label}>Business</span>
                 </NavLink>
-                <NavLink to="/messages" style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
+                <NavLink to="/messages" {...warm('/messages')} style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
                     <div style={{ position: 'relative' }}>
                         <MessageSquare size={24} />
                         {unreadCount > 0 && (
@@ -66,11 +65,11 @@ const BottomNav = () => {
                     <Home size={24} />
                     <span style={styles.label}>Marché</span>
                 </NavLink>
-                <NavLink to="/orders" style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
+                <NavLink to="/orders" {...warm('/orders')} style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
                     <ShoppingBag size={24} />
                     <span style={styles.label}>Ventes</span>
                 </NavLink>
-                <NavLink to="/profile" style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
+                <NavLink to="/profile" {...warm('/profile')} style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
                     <User size={24} />
                     <span style={styles.label}>Profil</span>
                 </NavLink>
@@ -85,11 +84,11 @@ const BottomNav = () => {
                     <Home size={24} />
                     <span style={styles.label}>Marché</span>
                 </NavLink>
-                <NavLink to="/affiliate" style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
+                <NavLink to="/affiliate" {...warm('/affiliate')} style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
                     <TrendingUp size={24} />
                     <span style={styles.label}>Affiliation</span>
                 </NavLink>
-                <NavLink to="/messages" style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
+                <NavLink to="/messages" {...warm('/messages')} style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
                     <div style={{ position: 'relative' }}>
                         <MessageSquare size={24} />
                         {unreadCount > 0 && (
@@ -100,7 +99,7 @@ const BottomNav = () => {
                     </div>
                     <span style={styles.label}>Messages</span>
                 </NavLink>
-                <NavLink to="/profile" style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
+                <NavLink to="/profile" {...warm('/profile')} style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
                     <User size={24} />
                     <span style={styles.label}>Profil</span>
                 </NavLink>
@@ -115,7 +114,7 @@ const BottomNav = () => {
                 <Home size={24} />
                 <span style={styles.label}>Accueil</span>
             </NavLink>
-            <NavLink to="/messages" style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
+            <NavLink to="/messages" {...warm('/messages')} style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
                 <div style={{ position: 'relative' }}>
                     <MessageSquare size={24} />
                     {unreadCount > 0 && (
@@ -126,11 +125,11 @@ const BottomNav = () => {
                 </div>
                 <span style={styles.label}>Messages</span>
             </NavLink>
-            <NavLink to="/orders" style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
+            <NavLink to="/orders" {...warm('/orders')} style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
                 <ShoppingBag size={24} />
                 <span style={styles.label}>Achats</span>
             </NavLink>
-            <NavLink to="/profile" style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
+            <NavLink to="/profile" {...warm('/profile')} style={({ isActive }) => ({ ...styles.link, color: isActive ? 'var(--primary)' : 'var(--text-secondary)' })}>
                 <User size={24} />
                 <span style={styles.label}>Profil</span>
             </NavLink>
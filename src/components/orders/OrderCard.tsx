@@ -1,5 +1,6 @@
 import { Package, Clock, Store, MessageSquare, Star, AlertCircle, User, CreditCard } from 'lucide-react';
 import { useNavigate } from 'react-router-dom';
+import { imageProps } from '../../lib/images';
 
 interface Order {
     id: string;
@@ -195,7 +196,7 @@ const OrderCard = ({ order, userRole, onViewDetails, onAction }: OrderCardProps)
             {/* Product */}
             <div style={styles.product}>
                 <img
-                    src={order.products?.image_url || '/placeholder.png'}
+                    {...imageProps(order.products?.image_url || '/placeholder.png', 'icon')}
                     alt={order.products?.name}
                     style={styles.productImage}
                 />
@@ -1,5 +1,6 @@
 import { X, Package, User, Phone, MapPin, DollarSign, Calendar, MessageSquare, ShieldCheck, Clock, CheckCircle2, Truck, ExternalLink } from 'lucide-react';
 import { useNavigate } from 'react-router-dom';
+import { imageProps } from '../../lib/images';
 
 interface Order {
     id: string;
@@ -189,7 +190,7 @@ const OrderDetailsModal = ({ isOpen, onClose, order, userRole }: OrderDetailsMod
                         </div>
                         <div className="premium-card" style={styles.premiumProductCard}>
                             <img
-                                src={order.products?.image_url || '/placeholder.png'}
+                                {...imageProps(order.products?.image_url || '/placeholder.png', 'thumb')}
                                 alt={order.products?.name}
                                 style={styles.productImage}
                             />
@@ -1,5 +1,6 @@
 import React, { useState } from 'react';
 import { ShieldCheck } from 'lucide-react';
+import { imageProps } from '../../lib/images';
 
 interface ProductCardProps {
     image: string;
@@ -9,9 +10,10 @@ interface ProductCardProps {
     seller: string;
     isVerified: boolean;
     moq: number;
+    placeholder?: string | null; // LQIP data URL stored on the product row
 }
 
-const ProductCard: React.FC<ProductCardProps> = ({ image, name, price, originalPrice, seller, isVerified, moq }) => {
+const ProductCard: React.FC<ProductCardProps> = ({ image, name, price, originalPrice, seller, isVerified, moq, placeholder }) => {
     const [imgError, setImgError] = useState(false);
 
     // Calculate discount percentage
@@ -19,19 +21,23 @@ const ProductCard: React.FC<ProductCardProps> = ({ image, name, price, originalP
         ? Math.round(((parseFloat(originalPrice) - parseFloat(price)) / parseFloat(originalPrice)) * 100)
         : 0;
 
-    // Optimized image URL for low data (Supabase transformation)
-    const optimizedImage = image.includes('supabase.co/storage')
-        ? `${image}?width=400&quality=70`
-        : image;
+    // Grid-sized variants (Cloudinary or Supabase transformations) instead of the original upload
+    const thumb = imageProps(image, 'thumb');
 
     return (
         <div className="premium-card" style={styles.card}>
-            <div style={styles.imageContainer}>
+            <div
+                style={{
+                    ...styles.imageContainer,
+                    ...(placeholder ? { backgroundImage: `url(${placeholder})`, backgroundSize: 'cover' } : {})
+                }}
+            >
                 <img
-                    src={imgError ? 'https://via.placeholder.com/400x400?text=Produit' : optimizedImage}
+                    {...(imgError ? { src: 'https://via.placeholder.com/400x400?text=Produit' } : thumb)}
                     alt={name}
                     style={styles.image}
                     loading="lazy"
+                    decoding="async"
                     onError={() => setImgError(true)}
                 />
                 {discountPercent > 0 && (
@@ -1,5 +1,6 @@
 import { createContext, useEffect, useState, ReactNode, useRef } from 'react';
 import { supabase } from '../lib/supabase';
+import { clearPersistedQueries } from '../lib/queryPersister';
 import { Session, User } from '@supabase/supabase-js';
 import { useQueryClient } from '@tanstack/react-query';
 
@@ -68,6 +69,7 @@ export const AuthProvider = ({ children }: { children: ReactNode }) => {
             console.log('[AuthContext] 🗑️ Clearing local cache...');
             queryClient.clear();
             sessionStorage.clear();
+            clearPersistedQueries();
 
             // 2. Sign out from Supabase (Background)
             // We don't await this to block the UI, just let it happen
@@ -1,71 +1,57 @@
 import { useQuery } from '@tanstack/react-query';
 import { supabase } from '../lib/supabase';
 
+export type AdminStatsBucket = 'day' | 'week' | 'month';
+
 export const useAdminStats = () => {
     return useQuery({
         queryKey: ['admin-stats'],
         queryFn: async () => {
-            // GMV & Commissions from delivered orders
-            const { data: orderStats, error: orderError } = await supabase
-                .from('orders')
-                .select('amount, commission_amount, status, created_at')
-                .eq('status', 'delivered');
-
-            if (orderError) throw orderError;
-
-            // Active orders
-            const { count: activeOrderCount, error: activeError } = await supabase
-                .from('orders')
-                .select('*', { count: 'exact', head: true })
-                .in('status', ['pending', 'processing', 'shipped']);
-
-            if (activeError) throw activeError;
-
-            // Today's completed orders
-            const today = new Date().toISOString().split('T')[0];
-            const { count: todayCount, error: todayError } = await supabase
-                .from('orders')
-                .select('*', { count: 'exact', head: true })
-                .eq('status', 'delivered')
-                .gte('created_at', today);
-
-            if (todayError) throw todayError;
-
-            // User counts
-            const { count: sellerCount } = await supabase.from('profiles').select('*', { count: 'exact', head: true }).eq('role', 'seller');
-            const { count: verifiedSellerCount } = await supabase.from('profiles').select('*', { count: 'exact', head: true }).eq('role', 'seller').eq('kyc_verified', true);
-            const { count: affiliateCount } = await supabase.from('profiles').select('*', { count: 'exact', head: true }).eq('role', 'affiliate');
-            const { count: buyerCount } = await supabase.from('profiles').select('*', { count: 'exact', head: true }).eq('role', 'buyer');
-
-            // Product count
-            const { count: productCount } = await supabase.from('products').select('*', { count: 'exact', head: true });
+            // One RPC over the pre-aggregated rollups (see 20260204_admin_stats_rollups.sql)
+            const { data, error } = await supabase.rpc('get_admin_stats');
 
-            // Pending withdrawals
-            const { data: pendingWithdrawals, count: pendingCount } = await supabase
-                .from('transactions')
-                .select('amount', { count: 'exact' })
-                .eq('type', 'withdrawal')
-                .eq('status', 'pending');
-
-            const gmv = orderStats?.reduce((sum, o) => sum + Number(o.amount), 0) || 0;
-            const commissions = orderStats?.reduce((sum, o) => sum + Number(o.commission_amount || 0), 0) || 0;
-            const pendingAmount = pendingWithdrawals?.reduce((sum, t) => sum + Number(t.amount), 0) || 0;
+            if (error) throw error;
 
             return {
-                totalGMV: gmv,
-                totalCommissions: commissions,
-                totalOrders: orderStats?.length || 0,
-                totalSellers: sellerCount || 0,
-                totalAffiliates: affiliateCount || 0,
-                totalBuyers: buyerCount || 0,
-                totalProducts: productCount || 0,
-                pendingWithdrawals: pendingCount || 0,
-                pendingWithdrawalAmount: pendingAmount,
-                verifiedSellers: verifiedSellerCount || 0,
-                activeOrders: activeOrderCount || 0,
-                completedToday: todayCount || 0,
+                totalGMV: Number(data.total_gmv || 0),
+                totalCommissions: Number(data.total_commissions || 0),
+                totalOrders: Number(data.total_orders || 0),
+                totalSellers: data.total_sellers || 0,
+                totalAffiliates: data.total_affiliates || 0,
+                totalBuyers: data.total_buyers || 0,
+                totalProducts: data.total_products || 0,
+                pendingWithdrawals: data.pending_withdrawals || 0,
+                pendingWithdrawalAmount: Number(data.pending_withdrawal_amount || 0),
+                verifiedSellers: data.verified_sellers || 0,
+                activeOrders: data.active_orders || 0,
+                completedToday: Number(data.completed_today || 0),
+                refreshedAt: data.refreshed_at as string,
             };
         },
         staleTime: 60000, // 1 minute
     });
 };
+
+export const useAdminStatsSeries = (bucket: AdminStatsBucket = 'day', from?: string, to?: string) => {
+    return useQuery({
+        queryKey: ['admin-stats-series', bucket, from, to],
+        queryFn: async () => {
+            const { data, error } = await supabase.rpc('get_admin_stats_series', {
+                p_bucket: bucket,
+                ...(from ? { p_from: from } : {}),
+                ...(to ? { p_to: to } : {}),
+            });
+
+            if (error) throw error;
+
+            return (data || []).map((row: any) => ({
+                bucket: row.bucket as string,
+                gmv: Number(row.gmv || 0),
+                commissions: Number(row.commissions || 0),
+                deliveredOrders: Number(row.delivered_orders || 0),
+                createdOrders: Number(row.created_orders || 0),
+            }));
+        },
+        staleTime: 5 * 60000, // 5 minutes
+    });
+};
@@ -1,76 +1,67 @@
-import { useQuery } from '@tanstack/react-query';
+import { useInfiniteQuery } from '@tanstack/react-query';
 import { supabase } from '../lib/supabase';
 
-export const useAffiliateStats = (userId: string | undefined) => {
-    return useQuery({
-        queryKey: ['affiliate-stats', userId],
-        queryFn: async () => {
-            if (!userId) return null;
-
-            // 1. Fetch delivered orders for earned commissions
-            const { data: deliveredOrders, error: deliveredError } = await supabase
-                .from('orders')
-                .select('amount, commission_amount')
-                .eq('affiliate_id', userId)
-                .eq('status', 'delivered');
-
-            if (deliveredError) throw deliveredError;
-
-            // 2. Fetch pending orders (paid/shipped but not delivered yet)
-            const { data: pendingOrders, error: pendingError } = await supabase
-                .from('orders')
-                .select('amount, commission_amount')
-                .eq('affiliate_id', userId)
-                .in('status', ['paid', 'shipped']);
-
-            if (pendingError) throw pendingError;
+export interface AffiliateProductSales {
+    product_id: string;
+    product_name: string;
+    product_image: string;
+    product_price: number;
+    sales_count: number;
+    total_earned: number;
+    last_sale: string;
+}
 
-            // 3. Fetch sales by product (delivered)
-            const { data: salesData, error: salesError } = await supabase
-                .from('orders')
-                .select('product_id, commission_amount, created_at, products(name, image_url, price)')
-                .eq('affiliate_id', userId)
-                .eq('status', 'delivered')
-                .order('created_at', { ascending: false });
+const SALES_PAGE_SIZE = 20;
 
-            if (salesError) throw salesError;
+interface AffiliateStatsPage {
+    totalEarned: number;
+    pendingEarnings: number;
+    salesCount: number;
+    pendingSalesCount: number;
+    productCount: number;
+    salesByProduct: AffiliateProductSales[];
+}
 
-            const totalEarned = (deliveredOrders || []).reduce((sum, o) => sum + Number(o.commission_amount || 0), 0);
-            const pendingEarnings = (pendingOrders || []).reduce((sum, o) => sum + Number(o.commission_amount || 0), 0);
-
-            // Group by product
-            const groupedSales: any[] = [];
-            const productMap = new Map();
+export const useAffiliateStats = (userId: string | undefined) => {
+    return useInfiniteQuery({
+        queryKey: ['affiliate-stats', userId],
+        queryFn: async ({ pageParam }): Promise<AffiliateStatsPage | null> => {
+            if (!userId) return null;
 
-            (salesData || []).forEach((order: any) => {
-                const productId = order.product_id;
-                const product = order.products;
-                if (!productMap.has(productId)) {
-                    productMap.set(productId, {
-                        product_id: productId,
-                        product_name: product?.name || 'Produit',
-                        product_image: product?.image_url || '',
-                        product_price: product?.price || 0,
-                        sales_count: 0,
-                        total_earned: 0,
-                        last_sale: order.created_at
-                    });
-                }
-                const sale = productMap.get(productId);
-                sale.sales_count++;
-                sale.total_earned += Number(order.commission_amount || 0);
+            // Totals and one page of products come pre-aggregated (affiliate_product_earnings)
+            const { data, error } = await supabase.rpc('get_affiliate_stats', {
+                p_affiliate_id: userId,
+                p_limit: SALES_PAGE_SIZE,
+                p_offset: pageParam
             });
 
-            const salesByProduct = Array.from(productMap.values()).sort((a, b) => b.total_earned - a.total_earned);
+            if (error) throw error;
 
             return {
-                totalEarned,
-                pendingEarnings,
-                salesCount: (deliveredOrders || []).length,
-                pendingSalesCount: (pendingOrders || []).length,
-                salesByProduct
+                totalEarned: Number(data.total_earned || 0),
+                pendingEarnings: Number(data.pending_earnings || 0),
+                salesCount: Number(data.sales_count || 0),
+                pendingSalesCount: Number(data.pending_sales_count || 0),
+                productCount: Number(data.product_count || 0),
+                salesByProduct: (data.sales_by_product || []).map((sale: any) => ({
+                    ...sale,
+                    product_price: Number(sale.product_price || 0),
+                    total_earned: Number(sale.total_earned || 0)
+                }))
             };
         },
+        initialPageParam: 0,
+        getNextPageParam: (lastPage, allPages, lastOffset) => {
+            if (!lastPage || lastPage.salesByProduct.length < SALES_PAGE_SIZE) return undefined;
+            const nextOffset = lastOffset + SALES_PAGE_SIZE;
+            return nextOffset < lastPage.productCount ? nextOffset : undefined;
+        },
+        // Totals from the first page, products from every page loaded so far
+        select: (data) => {
+            const [first] = data.pages;
+            if (!first) return null;
+            return { ...first, salesByProduct: data.pages.flatMap(page => page?.salesByProduct || []) };
+        },
         enabled: !!userId,
         staleTime: 1000 * 60 * 5, // 5 minutes
         gcTime: 1000 * 60 * 60 * 24, // 24 hours
@@ -1,6 +1,7 @@
-import { useMutation, useQueryClient } from '@tanstack/react-query';
+import { InfiniteData, useMutation, useQueryClient } from '@tanstack/react-query';
 import { useCallback } from 'react';
-import { chatService, Message } from '../services/chatService';
+import { chatService, Conversation, Message } from '../services/chatService';
+import { mergeMessage, MessagePage } from './useMessages';
 
 export const useChatActions = (conversationId?: string) => {
     const queryClient = useQueryClient();
@@ -29,45 +30,56 @@ export const useChatActions = (conversationId?: string) => {
         // Optimistic UI Update
         onMutate: async (newMsg) => {
             await queryClient.cancelQueries({ queryKey: ['messages', conversationId] });
-            const previousMessages = queryClient.getQueryData<Message[]>(['messages', conversationId]);
+            const tempId = `temp-${Date.now()}`;
+            const optimisticMsg: Message = {
+                id: tempId,
+                conversation_id: conversationId!,
+                sender_id: newMsg.senderId,
+                content: newMsg.content,
+                media_url: newMsg.media?.url,
+                media_type: newMsg.media?.type,
+                sticker_id: newMsg.stickerId,
+                order_id: newMsg.orderId,
+                created_at: new Date().toISOString(),
+            };
 
-            if (previousMessages) {
-                const optimisticMsg: Message = {
-                    id: `temp-${Date.now()}`,
-                    conversation_id: conversationId!,
-                    sender_id: newMsg.senderId,
-                    content: newMsg.content,
-                    media_url: newMsg.media?.url,
-                    media_type: newMsg.media?.type,
-                    sticker_id: newMsg.stickerId,
-                    order_id: newMsg.orderId,
-                    created_at: new Date().toISOString(),
-                };
+            mergeMessage(queryClient, conversationId!, optimisticMsg);
 
-                queryClient.setQueryData(['messages', conversationId], [...previousMessages, optimisticMsg]);
+            return { tempId };
+        },
+        onSuccess: (data, newMsg, context) => {
+            // Swap the placeholder for the stored row (realtime may already have delivered it)
+            if (data && context) {
+                mergeMessage(queryClient, conversationId!, data as Message, context.tempId);
             }
-
-            return { previousMessages };
         },
         onError: (err, newMsg, context) => {
-            if (context?.previousMessages) {
-                queryClient.setQueryData(['messages', conversationId], context.previousMessages);
+            if (context) {
+                queryClient.setQueryData<InfiniteData<MessagePage>>(['messages', conversationId], (oldData) =>
+                    oldData && {
+                        ...oldData,
+                        pages: oldData.pages.map(page => ({
+                            ...page,
+                            messages: page.messages.filter(m => m.id !== context.tempId)
+                        }))
+                    }
+                );
             }
         },
-        onSettled: () => {
-            queryClient.invalidateQueries({ queryKey: ['messages', conversationId] });
-            queryClient.invalidateQueries({ queryKey: ['conversations'] });
-        },
     });
 
     // Mutation for marking messages as read
     const markAsReadMutation = useMutation({
         mutationFn: async (userId: string) => {
             if (!conversationId) return;
-            return await chatService.markAsRead(conversationId, userId);
+            const { error } = await chatService.markAsRead(conversationId, userId);
+            if (error) throw error;
         },
-        onSuccess: () => {
-            queryClient.invalidateQueries({ queryKey: ['conversations'] });
+        onSuccess: (_data, userId) => {
+            // Clear the badge right away; the server-side totals follow on the unread channel
+            queryClient.setQueryData<Conversation[]>(['conversations', userId], (conversations) =>
+                conversations?.map(c => (c.id === conversationId ? { ...c, unread_count: 0 } : c))
+            );
         }
     });
 
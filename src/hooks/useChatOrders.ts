@@ -0,0 +1,73 @@
+import { useEffect, useMemo } from 'react';
+import { useQueries, useQueryClient } from '@tanstack/react-query';
+import { chatService, Message, MessageOrder } from '../services/chatService';
+
+// Order cards in the chat are loaded lazily, one cache entry per order_id (shared by every
+// message that references it). Lookups requested in the same tick go out as one `in` query.
+// Realtime UPDATEs on those orders invalidate their entry, so a payment or a shipment by the
+// other party shows up without waiting for the cache to go stale.
+let pending = new Map<string, Array<{ resolve: (order: MessageOrder | null) => void; reject: (err: unknown) => void }>>();
+let flushScheduled = false;
+
+const flush = async () => {
+    const batch = pending;
+    pending = new Map();
+    flushScheduled = false;
+
+    const { data, error } = await chatService.getOrderSummaries(Array.from(batch.keys()));
+    batch.forEach((waiters, orderId) => {
+        const order = data.find(o => o.id === orderId) || null;
+        waiters.forEach(({ resolve, reject }) => (error ? reject(error) : resolve(order)));
+    });
+};
+
+const loadOrderSummary = (orderId: string) =>
+    new Promise<MessageOrder | null>((resolve, reject) => {
+        pending.set(orderId, [...(pending.get(orderId) || []), { resolve, reject }]);
+        if (!flushScheduled) {
+            flushScheduled = true;
+            setTimeout(flush, 0);
+        }
+    });
+
+// Module-level so useQueries can memoize the combined map between renders
+const byOrderId = (results: Array<{ data?: MessageOrder | null }>) => {
+    const orders: Record<string, MessageOrder> = {};
+    results.forEach(({ data }) => {
+        if (data) orders[data.id] = data;
+    });
+    return orders;
+};
+
+// Realtime `in` filters accept at most 100 values; the newest offers matter most
+const MAX_WATCHED_ORDERS = 100;
+
+export const useChatOrders = (messages: Message[]) => {
+    const queryClient = useQueryClient();
+    const orderIds = useMemo(
+        () => Array.from(new Set(messages.map(m => m.order_id).filter((id): id is string => !!id))),
+        [messages]
+    );
+    const watchedIds = orderIds.slice(-MAX_WATCHED_ORDERS).sort().join(',');
+
+    useEffect(() => {
+        if (!watchedIds) return;
+
+        const subscription = chatService.subscribeToOrders(watchedIds.split(','), (orderId) => {
+            queryClient.invalidateQueries({ queryKey: ['chat-order', orderId] });
+        });
+
+        return () => {
+            subscription.unsubscribe();
+        };
+    }, [watchedIds, queryClient]);
+
+    return useQueries({
+        queries: orderIds.map(orderId => ({
+            queryKey: ['chat-order', orderId],
+            queryFn: () => loadOrderSummary(orderId),
+            staleTime: 1000 * 60, // Status changes are pushed by the realtime invalidation above
+        })),
+        combine: byOrderId,
+    });
+};
@@ -1,18 +1,60 @@
 import { useEffect } from 'react';
-import { useQuery, useQueryClient } from '@tanstack/react-query';
-import { chatService, Message } from '../services/chatService';
+import { InfiniteData, QueryClient, useInfiniteQuery, useQueryClient } from '@tanstack/react-query';
+import { chatService, Message, MESSAGE_PAGE_SIZE } from '../services/chatService';
+import { PageCursor } from '../lib/keyset';
 
-export const useMessages = (conversationId: string | undefined) => {
+export interface MessagePage {
+    messages: Message[];
+    nextCursor: PageCursor | null;
+}
+
+type MessagesCache = InfiniteData<MessagePage, PageCursor | null>;
+
+// Insert (or replace `replaceId` with) a message in the newest cached window, without refetching
+export const mergeMessage = (
+    queryClient: QueryClient,
+    conversationId: string,
+    message: Message,
+    replaceId?: string
+) => {
+    queryClient.setQueryData<MessagesCache>(['messages', conversationId], (oldData) => {
+        if (!oldData || oldData.pages.length === 0) return oldData;
+
+        const alreadyCached = oldData.pages.some(page => page.messages.some(m => m.id === message.id));
+        const [newest, ...older] = oldData.pages;
+        let messages = replaceId ? newest.messages.filter(m => m.id !== replaceId) : newest.messages;
+
+        if (alreadyCached) {
+            if (messages === newest.messages) return oldData;
+        } else {
+            messages = [...messages, message].sort(
+                (a, b) => new Date(a.created_at).getTime() - new Date(b.created_at).getTime()
+            );
+        }
+
+        return { ...oldData, pages: [{ ...newest, messages }, ...older] };
+    });
+};
+
+export const useMessages = (conversationId: string | undefined, pageSize: number = MESSAGE_PAGE_SIZE) => {
     const queryClient = useQueryClient();
 
-    const query = useQuery({
+    // pages[0] is the newest window; older pages are appended as the user scrolls up
+    const query = useInfiniteQuery({
         queryKey: ['messages', conversationId],
-        queryFn: async () => {
-            if (!conversationId) return [];
-            const { data, error } = await chatService.getMessages(conversationId);
+        queryFn: async ({ pageParam }): Promise<MessagePage> => {
+            if (!conversationId) return { messages: [], nextCursor: null };
+            const { data, error, nextCursor } = await chatService.getMessages(conversationId, {
+                limit: pageSize,
+                before: pageParam
+            });
             if (error) throw error;
-            return data || [];
+            return { messages: data, nextCursor };
         },
+        initialPageParam: null as PageCursor | null,
+        getNextPageParam: (lastPage) => lastPage.nextCursor ?? undefined,
+        // Flatten to one chronological list: oldest page first
+        select: (data) => data.pages.slice().reverse().flatMap(page => page.messages),
         enabled: !!conversationId,
         staleTime: 0, // Messages should be as fresh as possible
     });
@@ -24,20 +66,9 @@ export const useMessages = (conversationId: string | undefined) => {
         const subscription = chatService.subscribeToMessages(conversationId, (newMessage) => {
             console.log("📩 [Realtime] New message received:", newMessage.id);
 
-            // Update the messages cache
-            queryClient.setQueryData(['messages', conversationId], (oldData: Message[] | undefined) => {
-                if (!oldData) return [newMessage];
-
-                // Avoid duplicates
-                if (oldData.find(m => m.id === newMessage.id)) return oldData;
-
-                return [...oldData, newMessage].sort(
-                    (a, b) => new Date(a.created_at).getTime() - new Date(b.created_at).getTime()
-                );
-            });
-
-            // Also invalidate conversations list to update previews
-            queryClient.invalidateQueries({ queryKey: ['conversations'] });
+            // Merge into the cached window instead of refetching every loaded page
+            mergeMessage(queryClient, conversationId, newMessage);
+            // Conversation previews and unread counters arrive on the user's unread channel
         });
 
         return () => {
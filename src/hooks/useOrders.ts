@@ -1,5 +1,6 @@
 import { useInfiniteQuery } from '@tanstack/react-query';
 import { orderService } from '../services/orderService';
+import { PageCursor } from '../lib/keyset';
 
 export const useOrders = (params: {
     userId: string | undefined,
@@ -9,26 +10,24 @@ export const useOrders = (params: {
 }) => {
     return useInfiniteQuery({
         queryKey: ['orders', params.userId, params.role, params.status, params.search],
-        queryFn: async ({ pageParam = 0 }) => {
-            if (!params.userId) return { data: [], count: 0 };
+        queryFn: async ({ pageParam }) => {
+            if (!params.userId) return { data: [], count: 0, nextCursor: null };
 
-            const { data, error, count } = await orderService.getPaginatedOrders({
+            // Keyset pagination: no count needed, the cursor says whether there is more
+            const { data, error, count, nextCursor } = await orderService.getPaginatedOrders({
                 userId: params.userId,
                 role: params.role,
                 status: params.status,
                 search: params.search,
-                page: pageParam,
+                cursor: pageParam,
                 limit: 10
             });
 
             if (error) throw error;
-            return { data: data || [], count: count || 0 };
-        },
-        initialPageParam: 0,
-        getNextPageParam: (lastPage, allPages) => {
-            const loadedCount = allPages.reduce((sum, page) => sum + page.data.length, 0);
-            return loadedCount < lastPage.count ? allPages.length : undefined;
+            return { data: data || [], count: count || 0, nextCursor };
         },
+        initialPageParam: null as PageCursor | null,
+        getNextPageParam: (lastPage) => lastPage.nextCursor ?? undefined,
         enabled: !!params.userId,
         staleTime: 1000, // 1 second - refresh often to catch status changes
     });
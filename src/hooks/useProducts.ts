@@ -1,5 +1,6 @@
 import { useInfiniteQuery } from '@tanstack/react-query';
 import { productService } from '../services/productService';
+import { PageCursor } from '../lib/keyset';
 
 export const useProducts = (
     filters?: {
@@ -9,28 +10,30 @@ export const useProducts = (
         moqOne?: boolean;
         promoOnly?: boolean;
         sellerId?: string;
+        cityId?: string;
     },
     sortBy?: 'relevance' | 'price_asc' | 'price_desc' | 'newest',
     limit: number = 20
 ) => {
     return useInfiniteQuery({
         queryKey: ['products', filters, sortBy],
-        queryFn: async ({ pageParam = 0 }) => {
-            // Use optimized query for better performance
-            const { data, error, count } = await productService.getPaginatedProductsOptimized(
-                pageParam,
+        queryFn: async ({ pageParam }) => {
+            // Use optimized query for better performance; keyset pages, estimated count on the first
+            const { data, error, count, nextCursor } = await productService.getPaginatedProductsOptimized(
+                0,
                 limit,
                 filters,
-                sortBy
+                sortBy,
+                { cursor: pageParam, countMode: pageParam ? null : 'estimated' }
             );
             if (error) throw error;
             return {
                 products: data || [],
-                nextPage: (data && data.length === limit) ? pageParam + 1 : undefined,
+                nextPage: nextCursor ?? undefined,
                 totalCount: count || 0
             };
         },
-        initialPageParam: 0,
+        initialPageParam: null as PageCursor | null,
         getNextPageParam: (lastPage) => lastPage.nextPage,
         staleTime: 1000 * 60 * 5, // 5 minutes
         gcTime: 1000 * 60 * 60 * 24, // 24 hours
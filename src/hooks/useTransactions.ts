@@ -1,18 +1,25 @@
-import { useQuery } from '@tanstack/react-query';
+import { useInfiniteQuery } from '@tanstack/react-query';
 import { transactionService } from '../services/transactionService';
+import { PageCursor } from '../lib/keyset';
 
 export const useTransactions = (
     userId: string | undefined,
-    filter: 'all' | 'purchase' | 'sale' | 'commission' | 'withdrawal' = 'all'
+    filter: 'all' | 'purchase' | 'sale' | 'commission' | 'withdrawal' = 'all',
+    pageSize: number = 30
 ) => {
-    return useQuery({
+    return useInfiniteQuery({
         queryKey: ['transactions', userId, filter],
-        queryFn: async () => {
-            if (!userId) return [];
-            const { data, error } = await transactionService.getTransactionsByUser(userId, filter);
+        queryFn: async ({ pageParam }) => {
+            if (!userId) return { data: [], nextCursor: null };
+            const { data, error, nextCursor } = await transactionService.getTransactionsByUser(userId, filter, {
+                limit: pageSize,
+                cursor: pageParam
+            });
             if (error) throw error;
-            return data || [];
+            return { data: data || [], nextCursor };
         },
+        initialPageParam: null as PageCursor | null,
+        getNextPageParam: (lastPage) => lastPage.nextCursor ?? undefined,
         enabled: !!userId,
         staleTime: 1000 * 60 * 5, // 5 minutes cache
         gcTime: 1000 * 60 * 30, // 30 minutes garbage collection
@@ -0,0 +1,62 @@
+import { useEffect } from 'react';
+import { useQuery, useQueryClient } from '@tanstack/react-query';
+import { Conversation, unreadCountFor } from '../services/chatService';
+import { EMPTY_UNREAD_COUNTERS, unreadService } from '../services/unreadService';
+
+// Badge totals; kept current by useUnreadRealtime, so no polling
+export const useUnreadCounters = (userId: string | undefined) => {
+    return useQuery({
+        queryKey: ['unread-counters', userId],
+        queryFn: async () => {
+            if (!userId) return EMPTY_UNREAD_COUNTERS;
+            const { data, error } = await unreadService.getCounters(userId);
+            if (error) throw error;
+            return data;
+        },
+        enabled: !!userId,
+        staleTime: Infinity,
+    });
+};
+
+// Mounted once (AppContent): pushes counter and conversation changes into the caches
+export const useUnreadRealtime = (userId: string | undefined) => {
+    const queryClient = useQueryClient();
+
+    useEffect(() => {
+        if (!userId) return;
+
+        const subscription = unreadService.subscribe(userId, {
+            onCounters: (counters) => {
+                queryClient.setQueryData(['unread-counters', userId], {
+                    messages_unread: counters.messages_unread,
+                    notifications_unread: counters.notifications_unread
+                });
+            },
+            onConversation: (row) => {
+                const conversations = queryClient.getQueryData<Conversation[]>(['conversations', userId]);
+                const hidden = row.buyer_id === userId ? row.hidden_for_buyer : row.hidden_for_seller;
+
+                if (!conversations) return;
+                if (hidden) {
+                    queryClient.setQueryData(['conversations', userId], conversations.filter(c => c.id !== row.id));
+                    return;
+                }
+                // New or unhidden conversation: the list itself changed, refetch it
+                if (!conversations.some(c => c.id === row.id)) {
+                    queryClient.invalidateQueries({ queryKey: ['conversations', userId] });
+                    return;
+                }
+
+                // Patch counters and previews in place; row has no embeds, keep the cached ones
+                const updated = conversations
+                    .map(c => (c.id === row.id ? { ...c, ...row, unread_count: unreadCountFor(row, userId) } : c))
+                    .sort((a, b) => (b.last_message_at || '').localeCompare(a.last_message_at || ''));
+                queryClient.setQueryData(['conversations', userId], updated);
+            }
+        });
+
+        return () => {
+            subscription.unsubscribe();
+        };
+    }, [userId, queryClient]);
+};
@@ -1,29 +1,78 @@
+import { ProgressCallback, UploadError, uploadFile, uploadFiles, withRetry } from './uploadManager';
+
 export const CLOUDINARY_CONFIG = {
     cloudName: 'dtajc7kty',
     apiKey: '358346747748937',
     uploadPreset: 'zwa_uploads',
 };
 
-export const uploadToCloudinary = async (file: File): Promise<string> => {
-    const formData = new FormData();
-    formData.append('file', file);
-    formData.append('upload_preset', CLOUDINARY_CONFIG.uploadPreset);
-
-    // Use 'auto' to handle images, videos, and other files
-    const response = await fetch(
-        `https://api.cloudinary.com/v1_1/${CLOUDINARY_CONFIG.cloudName}/auto/upload`,
-        {
-            method: 'POST',
-            body: formData,
-        }
-    );
-
-    if (!response.ok) {
-        const errorData = await response.json();
-        throw new Error(errorData.error?.message || 'Failed to upload to Cloudinary');
-    }
-
-    const data = await response.json();
-    console.log("Cloudinary Upload Response Data:", data);
-    return data.secure_url;
+// Cloudinary chunked uploads: every chunk but the last must be at least 5 MB. Compressed
+// photos fit in one request; videos are sent in chunks, each retried on its own, so a
+// dropped connection resumes from the failed chunk instead of restarting the file.
+const CHUNK_SIZE = 6 * 1024 * 1024;
+const REQUEST_TIMEOUT_MS = 60000;
+
+const UPLOAD_URL = `https://api.cloudinary.com/v1_1/${CLOUDINARY_CONFIG.cloudName}/auto/upload`;
+
+// XMLHttpRequest rather than fetch: only XHR reports upload progress
+const postChunk = (body: FormData, headers: Record<string, string>, onProgress: (loaded: number) => void) =>
+    new Promise<any>((resolve, reject) => {
+        const xhr = new XMLHttpRequest();
+        xhr.open('POST', UPLOAD_URL);
+        xhr.timeout = REQUEST_TIMEOUT_MS;
+        Object.entries(headers).forEach(([name, value]) => xhr.setRequestHeader(name, value));
+
+        xhr.upload.onprogress = (event) => onProgress(event.loaded);
+        xhr.onload = () => {
+            let data: any = {};
+            try {
+                data = JSON.parse(xhr.responseText);
+            } catch {
+                // Non-JSON error page
+            }
+            if (xhr.status >= 200 && xhr.status < 300) resolve(data);
+            else reject(new UploadError(
+                data.error?.message || 'Failed to upload to Cloudinary',
+                xhr.status >= 500 || xhr.status === 429
+            ));
+        };
+        xhr.onerror = () => reject(new UploadError('Network error during upload', true));
+        xhr.ontimeout = () => reject(new UploadError('Upload timed out', true));
+        xhr.send(body);
+    });
+
+const sendToCloudinary = async (file: File, onProgress: (loaded: number, total: number) => void) => {
+    const total = file.size;
+    const chunked = total > CHUNK_SIZE;
+    const uploadId = `${Date.now()}-${Math.random().toString(36).slice(2, 10)}`;
+    let data: any = null;
+    let start = 0;
+
+    do {
+        const chunkStart = start;
+        const end = Math.min(chunkStart + CHUNK_SIZE, total);
+        const headers: Record<string, string> = chunked
+            ? { 'X-Unique-Upload-Id': uploadId, 'Content-Range': `bytes ${chunkStart}-${end - 1}/${total}` }
+            : {};
+
+        data = await withRetry(() => {
+            const formData = new FormData();
+            formData.append('file', chunked ? file.slice(chunkStart, end) : file, file.name);
+            formData.append('upload_preset', CLOUDINARY_CONFIG.uploadPreset);
+            // `loaded` includes multipart overhead, hence the clamp to the chunk size
+            return postChunk(formData, headers, loaded => onProgress(chunkStart + Math.min(loaded, end - chunkStart), total));
+        });
+        start = end;
+    } while (start < total);
+
+    if (!data?.secure_url) throw new UploadError('Cloudinary returned no URL', false);
+    return data.secure_url as string;
 };
+
+// Compressed (photos), deduplicated, resumable upload; resolves with the public URL
+export const uploadToCloudinary = (file: File, onProgress?: ProgressCallback): Promise<string> =>
+    uploadFile(file, { namespace: 'cloudinary', send: sendToCloudinary, onProgress, persistDedupe: true });
+
+// Several files in parallel (bounded), progress weighted by size; URLs in input order
+export const uploadManyToCloudinary = (files: File[], onProgress?: ProgressCallback): Promise<string[]> =>
+    uploadFiles(files, { namespace: 'cloudinary', send: sendToCloudinary, onProgress, persistDedupe: true });
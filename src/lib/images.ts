@@ -0,0 +1,140 @@
+// Image service: size-specific variants of stored image URLs, plus client-side preparation of
+// uploads (downscale before sending, tiny LQIP placeholder stored on the product row).
+
+export type ImageVariant = 'icon' | 'thumb' | 'detail' | 'lightbox';
+
+const VARIANTS: Record<ImageVariant, { widths: number[]; quality: number; sizes: string }> = {
+    icon: { widths: [64, 128], quality: 70, sizes: '64px' },
+    thumb: { widths: [200, 320, 480], quality: 70, sizes: '(max-width: 600px) 50vw, 240px' },
+    detail: { widths: [480, 800, 1200], quality: 80, sizes: '(max-width: 800px) 100vw, 800px' },
+    lightbox: { widths: [1200, 1800, 2400], quality: 85, sizes: '100vw' },
+};
+
+const CLOUDINARY_IMAGE = /^(https:\/\/res\.cloudinary\.com\/[^/]+\/image\/upload\/)(.+)$/;
+const SUPABASE_OBJECT = '/storage/v1/object/public/';
+const SUPABASE_RENDER = '/storage/v1/render/image/public/';
+
+const isTransformable = (url: string) => CLOUDINARY_IMAGE.test(url) || url.includes(SUPABASE_OBJECT);
+
+// URL of `url` resized to `width`; other hosts are returned unchanged
+export const imageUrl = (url: string | null | undefined, width: number, quality: number = 75) => {
+    if (!url) return '';
+
+    const cloudinary = url.match(CLOUDINARY_IMAGE);
+    if (cloudinary) {
+        // f_auto picks AVIF/WebP per browser; c_limit never upscales
+        return `${cloudinary[1]}f_auto,q_${quality},c_limit,w_${width}/${cloudinary[2]}`;
+    }
+
+    if (url.includes(SUPABASE_OBJECT)) {
+        // Image transformation endpoint (serves WebP when the browser accepts it)
+        const base = url.split('?')[0].replace(SUPABASE_OBJECT, SUPABASE_RENDER);
+        return `${base}?width=${width}&quality=${quality}&resize=contain`;
+    }
+
+    return url;
+};
+
+// Props for <img>: a default src plus srcset/sizes so the browser picks the right width
+export const imageProps = (url: string | null | undefined, variant: ImageVariant) => {
+    const { widths, quality, sizes } = VARIANTS[variant];
+    if (!url || !isTransformable(url)) return { src: url || '' };
+
+    return {
+        src: imageUrl(url, widths[1] || widths[0], quality),
+        srcSet: widths.map(width => `${imageUrl(url, width, quality)} ${width}w`).join(', '),
+        sizes,
+    };
+};
+
+// Full-size viewing (new tab, lightbox) without shipping the original upload
+export const largeImageUrl = (url: string | null | undefined) =>
+    imageUrl(url, VARIANTS.lightbox.widths[1], VARIANTS.lightbox.quality);
+
+// --- Upload side ---------------------------------------------------------
+
+export const MAX_UPLOAD_DIMENSION = 2048;
+export const UPLOAD_QUALITY = 0.85;
+const PLACEHOLDER_WIDTH = 16;
+
+// Photos worth re-encoding; GIF (animation) and SVG (vector) are uploaded as they are
+export const isCompressible = (file: Blob) =>
+    file.type.startsWith('image/') && file.type !== 'image/gif' && file.type !== 'image/svg+xml';
+
+// Re-encoded output is already small when it fits and weighs less than this
+export const needsDownscale = (size: number, width: number, height: number, maxDimension: number = MAX_UPLOAD_DIMENSION) =>
+    Math.max(width, height) > maxDimension || size >= 500 * 1024;
+
+// Hex SHA-256 of a file's bytes, used to deduplicate uploads; null for large files (videos)
+export const contentHash = async (file: Blob, maxBytes: number = 25 * 1024 * 1024) => {
+    if (file.size > maxBytes || !crypto.subtle) return null;
+    const digest = await crypto.subtle.digest('SHA-256', await file.arrayBuffer());
+    return Array.from(new Uint8Array(digest), byte => byte.toString(16).padStart(2, '0')).join('');
+};
+
+// Browsers without WebP encoding fall back to PNG, hence the extension from the blob type
+export const renameForType = (name: string, type: string) =>
+    `${name.replace(/\.[^.]+$/, '')}.${type.split('/')[1] || 'webp'}`;
+
+const toBlob = (canvas: HTMLCanvasElement, quality: number) =>
+    new Promise<Blob | null>(resolve => canvas.toBlob(resolve, 'image/webp', quality));
+
+const drawScaled = (source: CanvasImageSource, width: number, height: number, maxDimension: number) => {
+    const scale = Math.min(1, maxDimension / Math.max(width, height));
+    const canvas = document.createElement('canvas');
+    canvas.width = Math.max(1, Math.round(width * scale));
+    canvas.height = Math.max(1, Math.round(height * scale));
+    canvas.getContext('2d')?.drawImage(source, 0, 0, canvas.width, canvas.height);
+    return canvas;
+};
+
+// Downscale a photo to at most `maxDimension` px (WebP) before upload; other files pass through.
+// Main-thread fallback for browsers where the upload worker cannot run (see uploadManager.ts)
+export const downscaleImage = async (file: File, maxDimension: number = MAX_UPLOAD_DIMENSION, quality: number = UPLOAD_QUALITY) => {
+    if (!isCompressible(file)) return file;
+
+    try {
+        const bitmap = await createImageBitmap(file, { imageOrientation: 'from-image' });
+        if (!needsDownscale(file.size, bitmap.width, bitmap.height, maxDimension)) {
+            bitmap.close();
+            return file;
+        }
+
+        const canvas = drawScaled(bitmap, bitmap.width, bitmap.height, maxDimension);
+        bitmap.close();
+        const blob = await toBlob(canvas, quality);
+        if (!blob || blob.size >= file.size) return file;
+
+        return new File([blob], renameForType(file.name, blob.type), { type: blob.type });
+    } catch (err) {
+        console.warn('[Images] ⚠️ Downscale failed, uploading original:', err);
+        return file;
+    }
+};
+
+// Tiny blurred-looking preview (data URL, a few hundred bytes) for products.image_placeholder
+export const createPlaceholder = async (source: File | string): Promise<string | null> => {
+    try {
+        let image: CanvasImageSource;
+        let width: number;
+        let height: number;
+
+        if (typeof source === 'string') {
+            const img = new Image();
+            img.crossOrigin = 'anonymous';
+            img.src = imageUrl(source, 64, 50);
+            await img.decode();
+            [image, width, height] = [img, img.naturalWidth, img.naturalHeight];
+        } else {
+            const bitmap = await createImageBitmap(source, { imageOrientation: 'from-image' });
+            [image, width, height] = [bitmap, bitmap.width, bitmap.height];
+        }
+
+        const canvas = drawScaled(image, width, height, PLACEHOLDER_WIDTH);
+        if (image instanceof ImageBitmap) image.close();
+        return canvas.toDataURL('image/webp', 0.5);
+    } catch (err) {
+        console.warn('[Images] ⚠️ Placeholder generation failed:', err);
+        return null;
+    }
+};
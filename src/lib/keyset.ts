@@ -0,0 +1,25 @@
+// Keyset (cursor) pagination: instead of .range(from, to), which makes Postgres skip every
+// earlier row and count the whole set, each page starts strictly after the last row seen,
+// ordered by (sort column, id). Pair every sort with a composite index on (column, id).
+
+export interface PageCursor {
+    value: string | number;
+    id: string;
+}
+
+// Counting is opt-in in cursor mode; 'estimated' uses the planner's row estimate on big sets
+export type CountMode = 'exact' | 'estimated' | 'planned';
+
+// PostgREST `or` expression for "(column, id) after cursor" in the given direction
+export const keysetFilter = (column: string, ascending: boolean, cursor: PageCursor) => {
+    const op = ascending ? 'gt' : 'lt';
+    const value = `"${cursor.value}"`;
+    return `${column}.${op}.${value},and(${column}.eq.${value},id.${op}.${cursor.id})`;
+};
+
+// Cursor for the page after `rows`, or null when this was the last page
+export const nextCursor = (rows: any[] | null | undefined, limit: number, column: string): PageCursor | null => {
+    if (!rows || rows.length < limit) return null;
+    const last = rows[rows.length - 1];
+    return { value: last[column], id: last.id };
+};
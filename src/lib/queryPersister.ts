@@ -0,0 +1,232 @@
+import { Query, QueryClient, QueryFunctionContext } from '@tanstack/react-query';
+
+// Per-query persistence of the React Query cache in IndexedDB (QueryClient `persister` option).
+// Each query is stored under its own key, so a write never re-serializes the whole client and a
+// cold start only reads back the queries the first route actually mounts. Writes are batched
+// off the fetch path; the store is capped in size and evicts the least recently used entries.
+
+const DB_NAME = 'zwa-query-cache';
+const BUSTER = 'v3'; // Increment this to clear cache on deploy
+const MAX_BYTES = 4 * 1024 * 1024;
+const MAX_ENTRY_BYTES = 512 * 1024;
+const WRITE_THROTTLE_MS = 1000;
+
+const HOUR = 1000 * 60 * 60;
+const DAY = 24 * HOUR;
+
+interface PersistPolicy {
+    maxAge: number;
+    firstPageOnly?: boolean; // infinite queries: keep only the first page
+}
+
+// Query key families (queryKey[0]) that survive a reload, and for how long.
+// Anything not listed (realtime counters, order embeds, admin series...) stays in memory only.
+export const PERSIST_POLICY: Record<string, PersistPolicy> = {
+    categories: { maxAge: 7 * DAY },
+    profile: { maxAge: DAY },
+    conversations: { maxAge: DAY },
+    messages: { maxAge: DAY, firstPageOnly: true },
+    products: { maxAge: HOUR, firstPageOnly: true },
+    product: { maxAge: HOUR },
+    store: { maxAge: HOUR },
+    orders: { maxAge: HOUR, firstPageOnly: true },
+    orderCounts: { maxAge: HOUR },
+    notifications: { maxAge: HOUR },
+    'seller-stats': { maxAge: HOUR },
+    'affiliate-stats': { maxAge: HOUR, firstPageOnly: true },
+};
+
+interface Entry {
+    hash: string;
+    buster: string;
+    dataUpdatedAt: number;
+    payload: string;
+}
+
+// Kept in a separate store so startup only reads this small index, never the payloads
+interface Meta {
+    hash: string;
+    size: number;
+    accessedAt: number;
+}
+
+const request = <T>(req: IDBRequest<T>) =>
+    new Promise<T>((resolve, reject) => {
+        req.onsuccess = () => resolve(req.result);
+        req.onerror = () => reject(req.error);
+    });
+
+let dbPromise: Promise<IDBDatabase | null> | null = null;
+
+const openDb = () => {
+    dbPromise = dbPromise || new Promise<IDBDatabase | null>(resolve => {
+        if (typeof indexedDB === 'undefined') return resolve(null);
+        const open = indexedDB.open(DB_NAME, 1);
+        open.onupgradeneeded = () => {
+            open.result.createObjectStore('entries', { keyPath: 'hash' });
+            open.result.createObjectStore('meta', { keyPath: 'hash' });
+        };
+        open.onsuccess = () => resolve(open.result);
+        open.onerror = () => resolve(null); // e.g. private browsing: memory-only cache
+    });
+    return dbPromise;
+};
+
+let metaPromise: Promise<Map<string, Meta>> | null = null;
+
+const loadMeta = () => {
+    metaPromise = metaPromise || openDb()
+        .then(async db => {
+            const rows = db ? await request<Meta[]>(db.transaction('meta').objectStore('meta').getAll()) : [];
+            return new Map(rows.map(row => [row.hash, row]));
+        })
+        .catch(() => new Map<string, Meta>());
+    return metaPromise;
+};
+
+// Pending work, flushed together: queries to write (null = delete) and entries read since last flush
+const pendingWrites = new Map<string, Query | null>();
+const pendingTouches = new Set<string>();
+let flushTimer: number | null = null;
+
+const scheduleFlush = () => {
+    if (flushTimer !== null) return;
+    flushTimer = window.setTimeout(() => {
+        const run = () => {
+            flushTimer = null;
+            flush().catch(err => console.warn('[QueryPersister] ⚠️ Flush failed:', err));
+        };
+        if ('requestIdleCallback' in window) window.requestIdleCallback(run, { timeout: 2000 });
+        else run();
+    }, WRITE_THROTTLE_MS);
+};
+
+const flush = async () => {
+    const [db, meta] = await Promise.all([openDb(), loadMeta()]);
+    const writes = Array.from(pendingWrites);
+    const touches = Array.from(pendingTouches);
+    pendingWrites.clear();
+    pendingTouches.clear();
+    if (!db) return;
+
+    const tx = db.transaction(['entries', 'meta'], 'readwrite');
+    const entries = tx.objectStore('entries');
+    const metaStore = tx.objectStore('meta');
+    const now = Date.now();
+
+    const remove = (hash: string) => {
+        entries.delete(hash);
+        metaStore.delete(hash);
+        meta.delete(hash);
+    };
+
+    for (const [hash, query] of writes) {
+        // Serialized here, once per batch, with the query's latest data
+        const policy = query ? policyFor(query) : undefined;
+        const payload = query && policy && query.state.data !== undefined
+            ? JSON.stringify(trim(query.state.data, policy))
+            : null;
+        if (!query || !payload || payload.length > MAX_ENTRY_BYTES) {
+            remove(hash);
+            continue;
+        }
+        const row: Meta = { hash, size: payload.length, accessedAt: now };
+        entries.put({ hash, buster: BUSTER, dataUpdatedAt: query.state.dataUpdatedAt, payload } as Entry);
+        metaStore.put(row);
+        meta.set(hash, row);
+    }
+
+    for (const hash of touches) {
+        const row = meta.get(hash);
+        if (row && !writes.some(([written]) => written === hash)) {
+            row.accessedAt = now;
+            metaStore.put(row);
+        }
+    }
+
+    // LRU eviction down to the size cap
+    let total = Array.from(meta.values()).reduce((sum, row) => sum + row.size, 0);
+    const byAge = Array.from(meta.values()).sort((a, b) => a.accessedAt - b.accessedAt);
+    for (const row of byAge) {
+        if (total <= MAX_BYTES) break;
+        remove(row.hash);
+        total -= row.size;
+    }
+
+    await new Promise<void>((resolve, reject) => {
+        tx.oncomplete = () => resolve();
+        tx.onerror = () => reject(tx.error);
+        tx.onabort = () => reject(tx.error);
+    });
+};
+
+const restore = async (hash: string, policy: PersistPolicy) => {
+    const db = await openDb();
+    if (!db) return null;
+
+    const entry = await request<Entry | undefined>(db.transaction('entries').objectStore('entries').get(hash))
+        .catch(() => undefined);
+    if (!entry) return null;
+
+    if (entry.buster !== BUSTER || Date.now() - entry.dataUpdatedAt > policy.maxAge) {
+        pendingWrites.set(hash, null);
+        scheduleFlush();
+        return null;
+    }
+
+    pendingTouches.add(hash);
+    scheduleFlush();
+    return entry;
+};
+
+const trim = (data: any, policy: PersistPolicy) =>
+    policy.firstPageOnly && data && Array.isArray(data.pages)
+        ? { pages: data.pages.slice(0, 1), pageParams: data.pageParams.slice(0, 1) }
+        : data;
+
+const policyFor = (query: Query): PersistPolicy | undefined => PERSIST_POLICY[String(query.queryKey[0])];
+
+// QueryClient `persister`: restores a query from IndexedDB instead of fetching it
+export const queryPersister = async <T>(
+    queryFn: (context: QueryFunctionContext) => T | Promise<T>,
+    context: QueryFunctionContext,
+    query: Query
+): Promise<T> => {
+    const policy = policyFor(query);
+    if (!policy) return queryFn(context);
+
+    // Lazy rehydration: only when a mounted query has nothing in memory yet
+    if (query.state.data === undefined) {
+        const entry = await restore(query.queryHash, policy);
+        if (entry) {
+            // Keep the original timestamp so staleTime decides whether to refetch right after
+            setTimeout(() => {
+                query.setState({ dataUpdatedAt: entry.dataUpdatedAt });
+                if (query.isStale()) query.fetch();
+            }, 0);
+            return JSON.parse(entry.payload) as T;
+        }
+    }
+
+    return queryFn(context);
+};
+
+// Writes follow every successful update, fetched or set by hand (realtime merges, optimistic UI)
+export const persistQueryCache = (queryClient: QueryClient) =>
+    queryClient.getQueryCache().subscribe(event => {
+        if (event.type !== 'updated' || event.action.type !== 'success' || !policyFor(event.query)) return;
+        pendingWrites.set(event.query.queryHash, event.query);
+        scheduleFlush();
+    });
+
+// Logout: nothing from the previous account may be rehydrated
+export const clearPersistedQueries = async () => {
+    pendingWrites.clear();
+    pendingTouches.clear();
+    const [db, meta] = await Promise.all([openDb(), loadMeta()]);
+    meta.clear();
+    if (!db) return;
+    const tx = db.transaction(['entries', 'meta'], 'readwrite');
+    tx.objectStore('entries').clear();
+    tx.objectStore('meta').clear();
+};
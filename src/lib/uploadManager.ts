@@ -0,0 +1,204 @@
+import { contentHash, downscaleImage, renameForType } from './images';
+import type { PrepareResponse } from '../workers/imageWorker';
+
+// Upload manager: every file goes through the same pipeline before reaching its destination
+// (Cloudinary, Supabase Storage...):
+//   1. prepare in a Web Worker: SHA-256 of the original + resize/re-encode of photos
+//   2. deduplicate on that hash: a file already sent (or being sent) reuses its URL
+//   3. wait for a slot (MAX_PARALLEL uploads at a time across the app)
+//   4. send through the destination's `send`, which retries/resumes on its own
+// Progress is reported as a 0..1 fraction per file, or weighted by size for batches.
+
+const MAX_PARALLEL = 3;
+const RETRY_DELAYS_MS = [1000, 3000, 8000];
+const DEDUPE_STORAGE_KEY = 'zwa_upload_cache';
+const MAX_DEDUPE_ENTRIES = 200;
+
+export type ProgressCallback = (fraction: number) => void;
+
+// `loaded`/`total` in bytes of the prepared file
+export type UploadSender = (file: File, onProgress: (loaded: number, total: number) => void) => Promise<string>;
+
+export interface UploadOptions {
+    namespace: string; // Deduplication scope, e.g. 'cloudinary' or 'kyc'
+    send: UploadSender;
+    onProgress?: ProgressCallback;
+    persistDedupe?: boolean; // Remember hashes across reloads (public URLs only)
+}
+
+export class UploadError extends Error {
+    retryable: boolean;
+
+    constructor(message: string, retryable: boolean) {
+        super(message);
+        this.name = 'UploadError';
+        this.retryable = retryable;
+    }
+}
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+// Retries network failures and 5xx/429 responses with backoff; other errors are thrown at once
+export const withRetry = async <T>(task: () => Promise<T>): Promise<T> => {
+    for (let attempt = 0; ; attempt++) {
+        try {
+            return await task();
+        } catch (err) {
+            const retryable = !(err instanceof UploadError) || err.retryable;
+            if (!retryable || attempt >= RETRY_DELAYS_MS.length) throw err;
+            console.warn(`[Upload] ⚠️ Attempt ${attempt + 1} failed, retrying:`, err);
+            await sleep(RETRY_DELAYS_MS[attempt] * (0.8 + Math.random() * 0.4));
+        }
+    }
+};
+
+// --- 1. Preparation (worker, main-thread fallback) ---------------------------
+
+interface PreparedFile {
+    file: File;
+    hash: string | null;
+}
+
+let worker: Worker | null = null;
+let workerBroken = typeof Worker === 'undefined' || typeof OffscreenCanvas === 'undefined';
+let nextRequestId = 0;
+const pendingPrepares = new Map<number, (response: PrepareResponse) => void>();
+
+const getWorker = () => {
+    if (!worker) {
+        worker = new Worker(new URL('../workers/imageWorker.ts', import.meta.url), { type: 'module' });
+        worker.onmessage = (event: MessageEvent<PrepareResponse>) => {
+            pendingPrepares.get(event.data.id)?.(event.data);
+            pendingPrepares.delete(event.data.id);
+        };
+        worker.onerror = () => {
+            // Module workers unsupported or crashed: answer what is pending from the main thread
+            workerBroken = true;
+            worker?.terminate();
+            worker = null;
+            pendingPrepares.forEach((resolve, id) => resolve({ id, error: 'worker unavailable' }));
+            pendingPrepares.clear();
+        };
+    }
+    return worker;
+};
+
+const prepareOnMainThread = async (file: File): Promise<PreparedFile> => ({
+    file: await downscaleImage(file),
+    hash: await contentHash(file).catch(() => null),
+});
+
+const prepare = async (file: File): Promise<PreparedFile> => {
+    if (workerBroken) return prepareOnMainThread(file);
+
+    const id = nextRequestId++;
+    const response = await new Promise<PrepareResponse>(resolve => {
+        pendingPrepares.set(id, resolve);
+        getWorker().postMessage({ id, file });
+    });
+    if (response.error) return prepareOnMainThread(file);
+
+    const blob = response.blob;
+    return {
+        file: blob ? new File([blob], renameForType(file.name, blob.type), { type: blob.type }) : file,
+        hash: response.hash ?? null,
+    };
+};
+
+// --- 2. Deduplication ----------------------------------------------------------
+
+const inFlight = new Map<string, Promise<string>>();
+
+const readDedupeStore = (): Record<string, string> => {
+    try {
+        return JSON.parse(localStorage.getItem(DEDUPE_STORAGE_KEY) || '{}');
+    } catch {
+        return {};
+    }
+};
+
+const rememberUpload = (key: string, url: string) => {
+    const entries = Object.entries(readDedupeStore()).filter(([k]) => k !== key);
+    entries.push([key, url]);
+    try {
+        // Insertion order is kept, so the oldest hashes are dropped first
+        localStorage.setItem(DEDUPE_STORAGE_KEY, JSON.stringify(Object.fromEntries(entries.slice(-MAX_DEDUPE_ENTRIES))));
+    } catch {
+        // Storage full or unavailable: deduplication stays per session
+    }
+};
+
+// --- 3. Concurrency limit --------------------------------------------------------
+
+let activeUploads = 0;
+const waitingUploads: Array<() => void> = [];
+
+const withSlot = async <T>(task: () => Promise<T>): Promise<T> => {
+    if (activeUploads < MAX_PARALLEL) activeUploads++;
+    else await new Promise<void>(resolve => waitingUploads.push(resolve)); // Slot handed over as is
+    try {
+        return await task();
+    } finally {
+        const next = waitingUploads.shift();
+        if (next) next();
+        else activeUploads--;
+    }
+};
+
+// --- Public API --------------------------------------------------------------------
+
+export const uploadFile = async (file: File, options: UploadOptions): Promise<string> => {
+    const { namespace, send, onProgress, persistDedupe } = options;
+    onProgress?.(0);
+
+    const prepared = await prepare(file);
+    const key = prepared.hash ? `${namespace}:${prepared.hash}` : null;
+
+    if (key) {
+        const known = inFlight.get(key) || (persistDedupe ? readDedupeStore()[key] : undefined);
+        if (known) {
+            const url = await known;
+            onProgress?.(1);
+            return url;
+        }
+    }
+
+    const upload = withSlot(() =>
+        send(prepared.file, (loaded, total) => onProgress?.(total ? Math.min(1, loaded / total) : 0))
+    );
+
+    if (!key) {
+        const url = await upload;
+        onProgress?.(1);
+        return url;
+    }
+
+    inFlight.set(key, upload);
+    try {
+        const url = await upload;
+        if (persistDedupe) rememberUpload(key, url);
+        onProgress?.(1);
+        return url;
+    } catch (err) {
+        inFlight.delete(key); // A failed upload must not be reused
+        throw err;
+    }
+};
+
+// Uploads in parallel (within the global limit); URLs are returned in input order
+export const uploadFiles = (files: File[], options: UploadOptions): Promise<string[]> => {
+    const { onProgress } = options;
+    const totalBytes = files.reduce((sum, file) => sum + file.size, 0) || 1;
+    const fractions = files.map(() => 0);
+    const report = () => onProgress?.(files.reduce((sum, file, i) => sum + file.size * fractions[i], 0) / totalBytes);
+
+    return Promise.all(files.map((file, i) =>
+        uploadFile(file, {
+            ...options,
+            onProgress: fraction => {
+                fractions[i] = fraction;
+                report();
+            },
+        })
+    ));
+};
@@ -1,6 +1,71 @@
+import { useState } from 'react';
 import { TrendingUp, Wallet, Users, ShoppingBag, AlertCircle, Package, DollarSign, CheckCircle, Clock, Loader2 } from 'lucide-react';
 import { SkeletonAffiliateStats, SkeletonBar } from '../../../components/common/SkeletonLoader';
-import { useAdminStats } from '../../../hooks/useAdminStats';
+import { useAdminStats, useAdminStatsSeries, AdminStatsBucket } from '../../../hooks/useAdminStats';
+
+// Période affichée pour chaque granularité de la série
+const SERIES_RANGES: Record<AdminStatsBucket, { label: string, days: number }> = {
+    day: { label: 'Jour', days: 30 },
+    week: { label: 'Semaine', days: 7 * 12 },
+    month: { label: 'Mois', days: 365 },
+};
+
+const daysAgo = (days: number) => new Date(Date.now() - days * 86400000).toISOString().slice(0, 10);
+
+const formatBucket = (bucket: string, granularity: AdminStatsBucket) => {
+    const date = new Date(`${bucket}T00:00:00`);
+    if (granularity === 'month') return date.toLocaleDateString('fr-FR', { month: 'short', year: 'numeric' });
+    const label = date.toLocaleDateString('fr-FR', { day: 'numeric', month: 'short' });
+    return granularity === 'week' ? `Sem. du ${label}` : label;
+};
+
+const SeriesSection = () => {
+    const [bucket, setBucket] = useState<AdminStatsBucket>('day');
+    const { data: series, isLoading } = useAdminStatsSeries(bucket, daysAgo(SERIES_RANGES[bucket].days));
+    const maxGmv = Math.max(1, ...(series || []).map((point) => point.gmv));
+
+    return (
+        <div style={styles.userSection}>
+            <div style={styles.seriesHeader}>
+                <h3 style={styles.sectionTitle}>Évolution du GMV</h3>
+                <div style={styles.bucketToggle}>
+                    {(Object.keys(SERIES_RANGES) as AdminStatsBucket[]).map((key) => (
+                        <button
+                            key={key}
+                            onClick={() => setBucket(key)}
+                            style={{
+                                ...styles.bucketButton,
+                                ...(bucket === key ? styles.bucketButtonActive : {})
+                            }}
+                        >
+                            {SERIES_RANGES[key].label}
+                        </button>
+                    ))}
+                </div>
+            </div>
+            <div style={styles.seriesCard} className="premium-card">
+                {isLoading ? (
+                    [1, 2, 3, 4, 5].map((i) => <SkeletonBar key={i} width="100%" height={16} margin="0 0 10px 0" />)
+                ) : !series || series.length === 0 ? (
+                    <div style={styles.loading}>Aucune commande sur la période</div>
+                ) : (
+                    series.map((point) => (
+                        <div key={point.bucket} style={styles.seriesRow}>
+                            <div style={styles.seriesLabel}>{formatBucket(point.bucket, bucket)}</div>
+                            <div style={styles.seriesTrack}>
+                                <div style={{ ...styles.seriesBar, width: `${(point.gmv / maxGmv) * 100}%` }} />
+                            </div>
+                            <div style={styles.seriesValue}>{point.gmv.toLocaleString()} FCFA</div>
+                            <div style={styles.seriesOrders}>
+                                {point.deliveredOrders}/{point.createdOrders} livrées
+                            </div>
+                        </div>
+                    ))
+                )}
+            </div>
+        </div>
+    );
+};
 
 const StatCard = ({ icon, label, value, trend, subtitle, alert }: {
     icon: any,
@@ -159,6 +224,9 @@ const OverviewTab = () => {
                 </div>
             </div>
 
+            {/* GMV Series */}
+            <SeriesSection />
+
             {/* Community Stats */}
             <div style={styles.userSection}>
                 <h3 style={styles.sectionTitle}>Communauté Zwa</h3>
@@ -326,6 +394,69 @@ const styles = {
         fontSize: '18px',
         fontWeight: '800',
     },
+    seriesHeader: {
+        display: 'flex',
+        justifyContent: 'space-between',
+        alignItems: 'center',
+        flexWrap: 'wrap' as const,
+        gap: '12px',
+    },
+    bucketToggle: {
+        display: 'flex',
+        gap: '8px',
+    },
+    bucketButton: {
+        padding: '6px 14px',
+        borderRadius: '20px',
+        border: '1px solid rgba(255,255,255,0.1)',
+        backgroundColor: 'transparent',
+        color: 'var(--text-secondary)',
+        fontSize: '12px',
+        fontWeight: '600',
+        cursor: 'pointer',
+    },
+    bucketButtonActive: {
+        backgroundColor: 'var(--primary)',
+        borderColor: 'var(--primary)',
+        color: 'white',
+    },
+    seriesCard: {
+        padding: '20px',
+        display: 'flex',
+        flexDirection: 'column' as const,
+        gap: '10px',
+    },
+    seriesRow: {
+        display: 'grid',
+        gridTemplateColumns: '110px 1fr 130px 90px',
+        alignItems: 'center',
+        gap: '12px',
+        fontSize: '12px',
+    },
+    seriesLabel: {
+        color: 'var(--text-secondary)',
+        whiteSpace: 'nowrap' as const,
+    },
+    seriesTrack: {
+        height: '10px',
+        borderRadius: '5px',
+        backgroundColor: 'rgba(255,255,255,0.03)',
+        overflow: 'hidden',
+    },
+    seriesBar: {
+        height: '100%',
+        borderRadius: '5px',
+        background: 'linear-gradient(90deg, var(--primary) 0%, #00CC66 100%)',
+    },
+    seriesValue: {
+        fontWeight: '700',
+        color: 'white',
+        textAlign: 'right' as const,
+    },
+    seriesOrders: {
+        color: 'var(--text-secondary)',
+        textAlign: 'right' as const,
+    },
     loading: {
         padding: '40px',
         textAlign: 'center' as const,
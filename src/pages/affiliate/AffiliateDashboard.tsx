@@ -8,7 +8,9 @@ import { SkeletonAffiliateStats, SkeletonMissionList, SkeletonAffiliateLinkItem
 import { useAffiliateStats } from '../../hooks/useAffiliateStats';
 import { useAffiliateLinks } from '../../hooks/useAffiliateLinks';
 import { useProducts } from '../../hooks/useProducts';
+import { useDebounce } from '../../hooks/useDebounce';
 import WithdrawalRequestModal from '../../components/finance/WithdrawalRequestModal';
+import { imageProps } from '../../lib/images';
 
 const AffiliateDashboard = () => {
     const { user, profile } = useAuth();
@@ -28,15 +30,29 @@ const AffiliateDashboard = () => {
     const [withdrawalOpen, setWithdrawalOpen] = useState(false);
 
     // TanStack Query Hooks
-    const { data: affiliateData, isLoading: statsLoading, refetch: refetchStats } = useAffiliateStats(user?.id);
+    const {
+        data: affiliateData,
+        isLoading: statsLoading,
+        refetch: refetchStats,
+        fetchNextPage: fetchMoreSales,
+        hasNextPage: hasMoreSales,
+        isFetchingNextPage: loadingMoreSales
+    } = useAffiliateStats(user?.id);
     const { links, isLoading: linksLoading, pause, resume, archive, register } = useAffiliateLinks(user?.id);
-    const { data: productsData, isLoading: missionsLoading } = useProducts({ promoOnly: true }, undefined);
+    // Mission search goes through search_products (name, category, store and description)
+    const debouncedSearch = useDebounce(searchTerm, 300);
+    const missionSearch = activeTab === 'missions' ? debouncedSearch.trim() : '';
+    const { data: productsData, isLoading: missionsLoading } = useProducts(
+        { promoOnly: true, ...(missionSearch ? { search: missionSearch } : {}) },
+        undefined
+    );
 
     const stats = affiliateData || {
         totalEarned: 0,
         pendingEarnings: 0,
         salesCount: 0,
         pendingSalesCount: 0,
+        productCount: 0,
         salesByProduct: []
     };
 
@@ -115,13 +131,8 @@ const AffiliateDashboard = () => {
         return text.normalize("NFD").replace(/[\u0300-\u036f]/g, "").toLowerCase();
     };
 
+    // Already filtered server-side by the search term
     const filteredProducts = products
-        .filter(p => {
-            const search = normalizeText(searchTerm);
-            const name = p.name ? normalizeText(p.name) : '';
-            const desc = p.description ? normalizeText(p.description) : '';
-            return name.includes(search) || desc.includes(search);
-        })
         .sort((a, b) => {
             const valA = Number(a.default_commission || 0);
             const valB = Number(b.default_commission || 0);
@@ -310,7 +321,7 @@ const AffiliateDashboard = () => {
                         <div style={styles.missionList}>
                             {filteredProducts.map(product => (
                                 <div key={product.id} style={styles.missionItem} className="premium-card">
-                                    <img src={product.image_url} alt={product.name} style={styles.productThumb} />
+                                    <img {...imageProps(product.image_url, 'icon')} alt={product.name} style={styles.productThumb} loading="lazy" />
                                     <div style={styles.productInfo}>
                                         <div style={styles.productName}>{product.name}</div>
                                         <div style={styles.productPrice}>{product.price.toLocaleString()} FCFA</div>
@@ -362,7 +373,7 @@ const AffiliateDashboard = () => {
                         <div style={styles.missionList}>
                             {filteredLinks.map(link => (
                                 <div key={link.id} style={styles.missionItem} className="premium-card">
-                                    <img src={link.products?.image_url} alt={link.products?.name} style={styles.productThumb} />
+                                    <img {...imageProps(link.products?.image_url, 'icon')} alt={link.products?.name} style={styles.productThumb} loading="lazy" />
                                     <div style={styles.productInfo}>
                                         <div style={{ display: 'flex', alignItems: 'center', gap: '8px' }}>
                                             <div style={styles.productName}>{link.products?.name}</div>
@@ -460,20 +471,20 @@ const AffiliateDashboard = () => {
                             <div style={styles.salesSummary}>
                                 <div style={styles.salesSummaryItem}>
                                     <ShoppingBag size={16} color="var(--primary)" />
-                                    <span style={styles.salesSummaryValue}>{salesByProduct.length}</span>
+                                    <span style={styles.salesSummaryValue}>{stats.productCount}</span>
                                     <span style={styles.salesSummaryLabel}>produits</span>
                                 </div>
                                 <div style={styles.salesSummaryItem}>
                                     <Package size={16} color="#00CC66" />
                                     <span style={styles.salesSummaryValue}>
-                                        {salesByProduct.reduce((sum, p) => sum + p.sales_count, 0)}
+                                        {stats.salesCount}
                                     </span>
                                     <span style={styles.salesSummaryLabel}>ventes</span>
                                 </div>
                                 <div style={styles.salesSummaryItem}>
                                     <DollarSign size={16} color="#FFCC00" />
                                     <span style={styles.salesSummaryValue}>
-                                        {salesByProduct.reduce((sum, p) => sum + p.total_earned, 0).toLocaleString()}
+                                        {stats.totalEarned.toLocaleString()}
                                     </span>
                                     <span style={styles.salesSummaryLabel}>FCFA gagnés</span>
                                 </div>
@@ -483,7 +494,7 @@ const AffiliateDashboard = () => {
                             <div style={styles.missionList}>
                                 {salesByProduct.map(sale => (
                                     <div key={sale.product_id} style={styles.salesItem} className="premium-card">
-                                        <img src={sale.product_image} alt={sale.product_name} style={styles.productThumb} />
+                                        <img {...imageProps(sale.product_image, 'icon')} alt={sale.product_name} style={styles.productThumb} loading="lazy" />
                                         <div style={styles.productInfo}>
                                             <div style={styles.productName}>{sale.product_name}</div>
                                             <div style={styles.salesInfo}>
@@ -501,6 +512,20 @@ const AffiliateDashboard = () => {
                                         </div>
                                     </div>
                                 ))}
+
+                                {hasMoreSales && (
+                                    <button
+                                        onClick={() => fetchMoreSales()}
+                                        disabled={loadingMoreSales}
+                                        style={styles.loadMoreBtn}
+                                    >
+                                        {loadingMoreSales ? (
+                                            <Loader2 className="spinner" size={20} />
+                                        ) : (
+                                            'Voir plus de produits'
+                                        )}
+                                    </button>
+                                )}
                             </div>
                         </>
                     ) : (
@@ -605,6 +630,22 @@ const styles = {
         display: 'flex',
         gap: '8px',
     },
+    loadMoreBtn: {
+        width: '100%',
+        padding: '14px',
+        background: 'rgba(255,255,255,0.05)',
+        border: '1px solid rgba(255,255,255,0.08)',
+        borderRadius: '16px',
+        color: 'white',
+        fontSize: '14px',
+        fontWeight: '700',
+        cursor: 'pointer',
+        display: 'flex',
+        alignItems: 'center',
+        justifyContent: 'center',
+        gap: '10px',
+        marginTop: '10px',
+    },
     actionButton: {
         background: 'var(--primary)',
         color: 'white',
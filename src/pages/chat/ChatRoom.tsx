@@ -1,4 +1,4 @@
-import React, { useEffect, useState, useRef } from 'react';
+import React, { useEffect, useLayoutEffect, useMemo, useState, useRef } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { ArrowLeft, Send, ShieldCheck, Plus, Image as ImageIcon, Video, Camera, Smile, CheckCircle, PlusCircle, Clock, CheckCheck, X, Calendar, Zap, ChevronRight, FileText, Truck, MapPin } from 'lucide-react';
 import { chatService, Message, Conversation } from '../../services/chatService';
@@ -8,6 +8,9 @@ import { useAuth } from '../../hooks/useAuth';
 import { useMessages } from '../../hooks/useMessages';
 import { useConversationDetail } from '../../hooks/useConversationDetail';
 import { useChatActions } from '../../hooks/useChatActions';
+import { useChatOrders } from '../../hooks/useChatOrders';
+import { imageProps, largeImageUrl } from '../../lib/images';
+import { useQueryClient } from '@tanstack/react-query';
 import { SkeletonChatHeader, SkeletonChatMessages } from '../../components/common/SkeletonLoader';
 
 const ChatRoom = () => {
@@ -17,7 +20,19 @@ const ChatRoom = () => {
 
     // TanStack Query Hooks
     const { data: conversation, isLoading: convLoading } = useConversationDetail(id);
-    const { data: messages = [], isLoading: messagesLoading } = useMessages(id);
+    const {
+        data: messageWindow = [],
+        isLoading: messagesLoading,
+        fetchNextPage: fetchOlderMessages,
+        hasNextPage: hasOlderMessages,
+        isFetchingNextPage: loadingOlderMessages
+    } = useMessages(id);
+    const orders = useChatOrders(messageWindow);
+    const messages = useMemo(
+        () => messageWindow.map(msg => (msg.order_id && orders[msg.order_id] ? { ...msg, order: orders[msg.order_id] } : msg)),
+        [messageWindow, orders]
+    );
+    const queryClient = useQueryClient();
     const { sendMessage: sendMessageAction, markAsRead } = useChatActions(id);
 
     const [newMessage, setNewMessage] = useState('');
@@ -31,8 +46,12 @@ const ChatRoom = () => {
         shipping: '7 jours'
     });
     const messagesEndRef = useRef<HTMLDivElement>(null);
+    const messagesAreaRef = useRef<HTMLDivElement>(null);
+    const scrollHeightBeforeLoad = useRef<number | null>(null);
+    const lastMessageId = useRef<string | undefined>(undefined);
     const fileInputRef = useRef<HTMLInputElement>(null);
     const [isUploading, setIsUploading] = useState(false);
+    const [uploadProgress, setUploadProgress] = useState(0);
     const [showStickers, setShowStickers] = useState(false);
     const [selectedFile, setSelectedFile] = useState<File | null>(null);
     const [previewUrl, setPreviewUrl] = useState<string | null>(null);
@@ -41,12 +60,14 @@ const ChatRoom = () => {
 
     const loading = convLoading || messagesLoading;
 
+    // Mark as read when entering the room, and again when a message arrives while it is open
+    const lastIncomingId = [...messageWindow].reverse().find(m => m.sender_id !== user?.id)?.id;
     useEffect(() => {
         if (id && user) {
             markAsRead(user.id);
         }
         // eslint-disable-next-line react-hooks/exhaustive-deps
-    }, [id, user?.id]); // Only mark as read when entering the room or if user changes
+    }, [id, user?.id, lastIncomingId]);
 
     // Set order price from product when conversation is loaded
     useEffect(() => {
@@ -71,10 +92,30 @@ const ChatRoom = () => {
         { id: 'money', url: 'https://api.dicebear.com/7.x/bottts/svg?seed=money' },
     ];
 
-    useEffect(() => {
-        scrollToBottom();
+    useLayoutEffect(() => {
+        const area = messagesAreaRef.current;
+
+        // Older page prepended: keep the same message under the user's eyes
+        if (area && scrollHeightBeforeLoad.current !== null) {
+            area.scrollTop += area.scrollHeight - scrollHeightBeforeLoad.current;
+            scrollHeightBeforeLoad.current = null;
+            return;
+        }
+
+        const newestId = messages[messages.length - 1]?.id;
+        if (newestId !== lastMessageId.current) {
+            lastMessageId.current = newestId;
+            scrollToBottom();
+        }
     }, [messages]);
 
+    const handleMessagesScroll = () => {
+        const area = messagesAreaRef.current;
+        if (!area || area.scrollTop > 80 || !hasOlderMessages || loadingOlderMessages) return;
+        scrollHeightBeforeLoad.current = area.scrollHeight;
+        fetchOlderMessages();
+    };
+
     const scrollToBottom = () => {
         messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
     };
@@ -105,8 +146,9 @@ const ChatRoom = () => {
 
             if (prevFile) {
                 console.log("Starting media upload for file:", prevFile.name);
+                setUploadProgress(0);
                 setIsUploading(true);
-                const { url, error } = await chatService.uploadMedia(prevFile);
+                const { url, error } = await chatService.uploadMedia(prevFile, setUploadProgress);
                 setIsUploading(false);
 
                 if (error) {
@@ -198,6 +240,7 @@ const ChatRoom = () => {
                 alert("Erreur lors de la modification de l'offre : " + error.message);
             } else if (data) {
                 console.log('[ChatRoom] ✅ Order updated successfully:', data);
+                queryClient.invalidateQueries({ queryKey: ['chat-order', editingOrderId] });
 
                 await sendMessageAction({
                     content: `🔄 Offre mise à jour : ${orderParams.quantity}x ${conversation?.products?.name} à ${orderParams.price} FCFA`,
@@ -344,7 +387,10 @@ const ChatRoom = () => {
             </div>
 
             {/* Messages Area */}
-            <div style={styles.messagesArea}>
+            <div style={styles.messagesArea} ref={messagesAreaRef} onScroll={handleMessagesScroll}>
+                {loadingOlderMessages && (
+                    <div style={styles.olderMessagesLoader}>Chargement des messages précédents...</div>
+                )}
                 {messages.map((msg) => {
                     const isOwn = msg.sender_id === user?.id;
                     const isDeal = !!msg.order_id && msg.order;
@@ -495,7 +541,7 @@ const ChatRoom = () => {
                                             {msg.media_type === 'video' ? (
                                                 <video src={msg.media_url} controls style={styles.mediaContent} />
                                             ) : (
-                                                <img src={msg.media_url} alt="Media" style={styles.mediaContent} onClick={() => window.open(msg.media_url, '_blank')} />
+                                                <img {...imageProps(msg.media_url, 'thumb')} alt="Media" style={styles.mediaContent} loading="lazy" onClick={() => window.open(largeImageUrl(msg.media_url), '_blank')} />
                                             )}
                                         </div>
                                     )}
@@ -524,7 +570,7 @@ const ChatRoom = () => {
                 {isUploading && (
                     <div style={{ ...styles.messageWrapper, justifyContent: 'flex-end' }}>
                         <div style={{ ...styles.messageBubble, background: 'rgba(255,255,255,0.05)' }}>
-                            <div style={styles.messageText}>Envoi du média...</div>
+                            <div style={styles.messageText}>Envoi du média... {Math.round(uploadProgress * 100)}%</div>
                         </div>
                     </div>
                 )}
@@ -826,6 +872,12 @@ const styles = {
         gap: '12px',
         background: 'radial-gradient(circle at top right, rgba(138,43,226,0.03) 0%, transparent 40%)',
     },
+    olderMessagesLoader: {
+        alignSelf: 'center' as const,
+        fontSize: '12px',
+        color: 'var(--text-secondary)',
+        padding: '4px 0',
+    },
     messageWrapper: {
         display: 'flex',
         width: '100%',
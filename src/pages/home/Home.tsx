@@ -304,6 +304,7 @@ const Home = () => {
                                         seller={product.profiles?.full_name || 'Vendeur'}
                                         isVerified={product.profiles?.is_verified_seller || false}
                                         moq={product.min_order_quantity}
+                                        placeholder={product.image_placeholder}
                                     />
                                 </Link>
                             ))}
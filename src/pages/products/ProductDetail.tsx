@@ -10,6 +10,7 @@ import ReviewCarousel from '../../components/reviews/ReviewCarousel';
 import ReviewsModal from '../../components/reviews/ReviewsModal';
 import StarRating from '../../components/reviews/StarRating';
 import CheckoutModal from '../../components/orders/CheckoutModal';
+import { imageProps } from '../../lib/images';
 import { useProductDetail } from '../../hooks/useProductDetail';
 
 // Modern Skeleton Component
@@ -316,12 +317,7 @@ const ProductDetail = () => {
                 onTouchEnd={onTouchEnd}
             >
                 <img
-                    src={(() => {
-                        const url = product.images_url?.[activeImageIndex] || product.image_url;
-                        return url.includes('supabase.co/storage')
-                            ? `${url}?width=800&quality=80`
-                            : url;
-                    })()}
+                    {...imageProps(product.images_url?.[activeImageIndex] || product.image_url, 'detail')}
                     alt={product.name}
                     style={styles.mainImage}
                     draggable={false}
@@ -668,7 +664,7 @@ const ProductDetail = () => {
                                 >
                                     <div style={styles.productImage}>
                                         {prod.image_url ? (
-                                            <img src={prod.image_url} alt={prod.name} style={styles.productImg} />
+                                            <img {...imageProps(prod.image_url, 'thumb')} alt={prod.name} style={styles.productImg} loading="lazy" />
                                         ) : (
                                             <div style={styles.productPlaceholder}>📦</div>
                                         )}
@@ -1,6 +1,6 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useMemo } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { ArrowLeft, Download, FileText, Filter } from 'lucide-react';
+import { ArrowLeft, Download, FileText, Filter, Loader2 } from 'lucide-react';
 import { useAuth } from '../../hooks/useAuth';
 import { transactionService, Transaction } from '../../services/transactionService';
 import { useTransactions } from '../../hooks/useTransactions';
@@ -15,17 +15,24 @@ const TransactionHistory = () => {
     const [filter, setFilter] = useState<FilterType>('all');
 
     const {
-        data: transactions = [],
+        data: transactionsData,
         isLoading: loading,
         error: queryError,
-        refetch
+        refetch,
+        fetchNextPage,
+        hasNextPage,
+        isFetchingNextPage
     } = useTransactions(user?.id, filter);
 
+    const transactions = useMemo(() => {
+        return transactionsData?.pages.flatMap(page => page.data as Transaction[]) || [];
+    }, [transactionsData]);
+
     const error = queryError ? (queryError as any).message || 'Erreur de chargement' : null;
 
     // useEffect removed - data fetching is handled by the hook automatically
 
-    const handleDownloadInvoice = (transaction: Transaction) => {
+    const handleDownloadInvoice = async (transaction: Transaction) => {
         if (!user || !profile) return;
 
         try {
@@ -39,16 +46,16 @@ const TransactionHistory = () => {
 
             switch (transaction.type) {
                 case 'purchase':
-                    invoiceService.generatePurchaseInvoice(transaction, userProfile);
+                    await invoiceService.generatePurchaseInvoice(transaction, userProfile);
                     break;
                 case 'sale':
-                    invoiceService.generateSaleReceipt(transaction, userProfile);
+                    await invoiceService.generateSaleReceipt(transaction, userProfile);
                     break;
                 case 'commission':
-                    invoiceService.generateCommissionReceipt(transaction, userProfile);
+                    await invoiceService.generateCommissionReceipt(transaction, userProfile);
                     break;
                 case 'withdrawal':
-                    invoiceService.generateWithdrawalReceipt(transaction, userProfile);
+                    await invoiceService.generateWithdrawalReceipt(transaction, userProfile);
                     break;
             }
 
@@ -59,8 +66,15 @@ const TransactionHistory = () => {
         }
     };
 
-    const handleExportCSV = () => {
-        invoiceService.exportToCSV(transactions, `historique-${profile?.role || 'user'}`);
+    const handleExportCSV = async () => {
+        if (!user) return;
+        // The list is paginated; the export covers the whole history
+        const { data, error } = await transactionService.getTransactionsByUser(user.id, filter);
+        if (error) {
+            alert(`❌ Erreur lors de l'export: ${error.message}`);
+            return;
+        }
+        invoiceService.exportToCSV(data || [], `historique-${profile?.role || 'user'}`);
     };
 
     const getFilterOptions = (): { value: FilterType; label: string; icon: string }[] => {
@@ -288,6 +302,20 @@ const TransactionHistory = () => {
                                 </button>
                             </div>
                         ))}
+
+                        {hasNextPage && (
+                            <button
+                                onClick={() => fetchNextPage()}
+                                disabled={isFetchingNextPage}
+                                style={styles.loadMoreButton}
+                            >
+                                {isFetchingNextPage ? (
+                                    <Loader2 className="spinner" size={20} />
+                                ) : (
+                                    'Voir plus de transactions'
+                                )}
+                            </button>
+                        )}
                     </div>
                 )}
             </div>
@@ -296,6 +324,22 @@ const TransactionHistory = () => {
 };
 
 const styles = {
+    loadMoreButton: {
+        width: '100%',
+        padding: '14px',
+        background: 'rgba(255,255,255,0.05)',
+        border: '1px solid rgba(255,255,255,0.08)',
+        borderRadius: '16px',
+        color: 'white',
+        fontSize: '14px',
+        fontWeight: '700',
+        cursor: 'pointer',
+        display: 'flex',
+        alignItems: 'center',
+        justifyContent: 'center',
+        gap: '10px',
+        marginTop: '10px',
+    },
     container: {
         background: 'var(--background)',
         minHeight: '100vh',
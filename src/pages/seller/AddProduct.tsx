@@ -1,7 +1,8 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { ArrowLeft, Camera, Check, AlertCircle, TrendingUp } from 'lucide-react';
-import { uploadToCloudinary } from '../../lib/cloudinary';
+import { uploadManyToCloudinary } from '../../lib/cloudinary';
+import { createPlaceholder } from '../../lib/images';
 import { supabase } from '../../lib/supabase';
 import { useAuth } from '../../hooks/useAuth';
 import { categoryService } from '../../services/categoryService';
@@ -30,6 +31,7 @@ const AddProduct = () => {
     const [images, setImages] = useState<(File | null)[]>([null, null, null]);
     const [previews, setPreviews] = useState<(string | null)[]>([null, null, null]);
     const [uploading, setUploading] = useState(false);
+    const [uploadProgress, setUploadProgress] = useState(0);
     const [success, setSuccess] = useState(false);
     const [error, setError] = useState<string | null>(null);
 
@@ -75,11 +77,15 @@ const AddProduct = () => {
         }
 
         setUploading(true);
+        setUploadProgress(0);
         setError(null);
 
         try {
-            // 1. Upload all images to Cloudinary
-            const imageUrls = await Promise.all(activeImages.map(img => uploadToCloudinary(img)));
+            // 1. Upload all images to Cloudinary (compressed, in parallel) and build the card placeholder from the main one
+            const [imageUrls, imagePlaceholder] = await Promise.all([
+                uploadManyToCloudinary(activeImages, setUploadProgress),
+                createPlaceholder(activeImages[0]),
+            ]);
 
             // 2. Save to Supabase
             const { error: dbError } = await supabase
@@ -96,6 +102,7 @@ const AddProduct = () => {
                     default_commission: formData.is_affiliate_enabled ? parseFloat(formData.default_commission) : 0,
                     image_url: imageUrls[0], // First image is the main one
                     images_url: imageUrls, // Array of all images
+                    image_placeholder: imagePlaceholder, // Tiny preview shown while the card image loads
                     category_id: formData.category_id || null, // Link to category
                     city_id: formData.city_id || null, // Link to city
                 }]);
@@ -330,7 +337,7 @@ const AddProduct = () => {
                         opacity: uploading ? 0.7 : 1
                     }}
                 >
-                    {uploading ? 'Envoi en cours...' : success ? (
+                    {uploading ? `Envoi en cours... ${Math.round(uploadProgress * 100)}%` : success ? (
                         <div style={styles.btnContent}><Check size={20} /><span>Produit ajouté !</span></div>
                     ) : 'Publier le produit'}
                 </button>
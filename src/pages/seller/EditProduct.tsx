@@ -1,7 +1,8 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate, useParams } from 'react-router-dom';
 import { ArrowLeft, Camera, AlertCircle, Save, TrendingUp } from 'lucide-react';
-import { uploadToCloudinary } from '../../lib/cloudinary';
+import { uploadManyToCloudinary } from '../../lib/cloudinary';
+import { createPlaceholder } from '../../lib/images';
 import { supabase } from '../../lib/supabase';
 import { useAuth } from '../../hooks/useAuth';
 import { productService } from '../../services/productService';
@@ -29,7 +30,9 @@ const EditProduct = () => {
 
     const [newImages, setNewImages] = useState<(File | null)[]>([null, null, null]);
     const [previews, setPreviews] = useState<(string | null)[]>([null, null, null]);
+    const [savedMainImage, setSavedMainImage] = useState<string | null>(null); // To know when the placeholder is stale
     const [updating, setUpdating] = useState(false);
+    const [uploadProgress, setUploadProgress] = useState(0);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
 
@@ -81,6 +84,7 @@ const EditProduct = () => {
                 const initialPreviews = [...(data.images_url || [data.image_url])];
                 while (initialPreviews.length < 3) initialPreviews.push(null as any);
                 setPreviews(initialPreviews.slice(0, 3));
+                setSavedMainImage(data.image_url || null);
             }
         }
         setLoading(false);
@@ -104,17 +108,18 @@ const EditProduct = () => {
         if (!user || !id) return;
 
         setUpdating(true);
+        setUploadProgress(0);
         setError(null);
 
         try {
-            // 1. Prepare image URLs
+            // 1. Prepare image URLs (new files are uploaded together, in parallel)
+            const filesToUpload = newImages.filter((img): img is File => img !== null);
+            const uploadedUrls = await uploadManyToCloudinary(filesToUpload, setUploadProgress);
             const finalImageUrls: string[] = [];
 
             for (let i = 0; i < 3; i++) {
                 if (newImages[i]) {
-                    // Upload new file
-                    const url = await uploadToCloudinary(newImages[i]!);
-                    finalImageUrls.push(url);
+                    finalImageUrls.push(uploadedUrls[filesToUpload.indexOf(newImages[i]!)]);
                 } else if (previews[i] && previews[i]?.startsWith('http')) {
                     // Keep existing absolute URL
                     finalImageUrls.push(previews[i]!);
@@ -125,6 +130,12 @@ const EditProduct = () => {
                 throw new Error("Veuillez conserver au moins une image.");
             }
 
+            // Regenerate the card placeholder only when the main image changed
+            const mainIndex = previews.findIndex((preview, i) => newImages[i] || preview?.startsWith('http'));
+            const placeholderUpdate = finalImageUrls[0] !== savedMainImage
+                ? { image_placeholder: await createPlaceholder(newImages[mainIndex] || finalImageUrls[0]) }
+                : {};
+
             // 2. Update Supabase
             const { error: dbError } = await supabase
                 .from('products')
@@ -139,6 +150,7 @@ const EditProduct = () => {
                     default_commission: formData.is_affiliate_enabled ? parseFloat(formData.default_commission) : 0,
                     image_url: finalImageUrls[0],
                     images_url: finalImageUrls,
+                    ...placeholderUpdate,
                     category_id: formData.category_id || null,
                     city_id: formData.city_id || null,
                 })
@@ -364,7 +376,7 @@ const EditProduct = () => {
                         }}
                     >
                         <Save size={20} />
-                        <span>{updating ? 'Enregistrement...' : 'Enregistrer les modifications'}</span>
+                        <span>{updating ? `Enregistrement... ${Math.round(uploadProgress * 100)}%` : 'Enregistrer les modifications'}</span>
                     </button>
                 </form>
             )}
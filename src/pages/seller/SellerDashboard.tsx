@@ -10,6 +10,7 @@ import KYCRequestModal from '../../components/kyc/KYCRequestModal';
 import WithdrawalRequestModal from '../../components/finance/WithdrawalRequestModal';
 import { useSellerStats } from '../../hooks/useSellerStats';
 import { useProducts } from '../../hooks/useProducts';
+import { imageProps } from '../../lib/images';
 import { useQueryClient } from '@tanstack/react-query';
 
 const SellerDashboard = () => {
@@ -282,7 +283,7 @@ const SellerDashboard = () => {
                 <div style={styles.productList}>
                     {products.map(product => (
                         <div key={product.id} style={styles.productItem} className="premium-card">
-                            <img src={product.image_url} alt={product.name} style={styles.productThumb} />
+                            <img {...imageProps(product.image_url, 'icon')} alt={product.name} style={styles.productThumb} loading="lazy" />
                             <div style={styles.productInfo}>
                                 <div style={styles.productName}>{product.name}</div>
                                 <div style={styles.productPrice}>{product.price.toLocaleString()} FCFA</div>
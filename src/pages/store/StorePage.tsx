@@ -8,6 +8,7 @@ import StarRating from '../../components/reviews/StarRating';
 import { SkeletonBar, SkeletonAvatar, SkeletonProductGrid } from '../../components/common/SkeletonLoader';
 import { useStore } from '../../hooks/useStore';
 import { useProducts } from '../../hooks/useProducts';
+import { imageProps } from '../../lib/images';
 
 const StorePage = () => {
     const { sellerId } = useParams<{ sellerId: string }>();
@@ -375,9 +376,10 @@ const StorePage = () => {
                                 className="premium-card"
                             >
                                 <img
-                                    src={product.image_url}
+                                    {...imageProps(product.image_url, 'thumb')}
                                     alt={product.name}
                                     style={styles.productImage}
+                                    loading="lazy"
                                 />
                                 <div style={styles.productInfo}>
                                     <div style={styles.productName}>{product.name}</div>
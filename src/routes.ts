@@ -0,0 +1,92 @@
+import { ComponentType, lazy } from 'react';
+
+// Route-level code splitting. Home stays in the entry chunk (first paint for guests);
+// every other page is its own chunk, fetched on navigation or warmed earlier by
+// preloadRoute (link hover/touch) and preloadForRole (browser idle after login).
+
+type PageModule = { default: ComponentType<any> };
+
+const lazyPage = (factory: () => Promise<PageModule>) => {
+    let pending: Promise<PageModule> | null = null;
+    const load = () => {
+        // Share one request between preload and render; allow a retry after a failed fetch
+        pending = pending || factory().catch(err => {
+            pending = null;
+            throw err;
+        });
+        return pending;
+    };
+    return Object.assign(lazy(load), { preload: load });
+};
+
+type LazyPage = ReturnType<typeof lazyPage>;
+
+export const pages = {
+    AuthPage: lazyPage(() => import('./pages/auth/AuthPage')),
+    ProductDetail: lazyPage(() => import('./pages/products/ProductDetail')),
+    StorePage: lazyPage(() => import('./pages/store/StorePage')),
+    MessagesList: lazyPage(() => import('./pages/chat/MessagesList')),
+    ChatRoom: lazyPage(() => import('./pages/chat/ChatRoom')),
+    OrdersList: lazyPage(() => import('./pages/orders/OrdersList')),
+    PaymentSuccess: lazyPage(() => import('./pages/orders/PaymentSuccess')),
+    ProfilePage: lazyPage(() => import('./pages/profile/ProfilePage')),
+    AccountSettings: lazyPage(() => import('./pages/profile/AccountSettings')),
+    TransactionHistory: lazyPage(() => import('./pages/profile/TransactionHistory')),
+    AdminDashboard: lazyPage(() => import('./pages/admin/AdminDashboard')),
+    SellerDashboard: lazyPage(() => import('./pages/seller/SellerDashboard')),
+    AddProduct: lazyPage(() => import('./pages/seller/AddProduct')),
+    EditProduct: lazyPage(() => import('./pages/seller/EditProduct')),
+    EditStore: lazyPage(() => import('./pages/seller/EditStore')),
+    AffiliateDashboard: lazyPage(() => import('./pages/affiliate/AffiliateDashboard')),
+};
+
+// Path prefix -> chunks to warm; more specific prefixes first
+const ROUTE_PAGES: Array<[string, LazyPage[]]> = [
+    ['/auth', [pages.AuthPage]],
+    ['/product/', [pages.ProductDetail]],
+    ['/store/', [pages.StorePage]],
+    ['/messages', [pages.MessagesList, pages.ChatRoom]],
+    ['/chat/', [pages.ChatRoom]],
+    ['/orders', [pages.OrdersList]],
+    ['/payment-success', [pages.PaymentSuccess]],
+    ['/profile/settings', [pages.AccountSettings]],
+    ['/profile/transactions', [pages.TransactionHistory]],
+    ['/profile', [pages.ProfilePage]],
+    ['/admin', [pages.AdminDashboard]],
+    ['/seller/dashboard', [pages.SellerDashboard]],
+    ['/seller/add-product', [pages.AddProduct]],
+    ['/seller/edit-product', [pages.EditProduct]],
+    ['/seller/edit-store', [pages.EditStore]],
+    ['/affiliate', [pages.AffiliateDashboard]],
+];
+
+// Pages each role is likely to open next, warmed once the browser is idle
+const ROLE_PAGES: Record<string, LazyPage[]> = {
+    guest: [pages.ProductDetail, pages.AuthPage],
+    buyer: [pages.ProductDetail, pages.MessagesList, pages.ChatRoom, pages.OrdersList, pages.ProfilePage],
+    seller: [pages.SellerDashboard, pages.MessagesList, pages.ChatRoom, pages.OrdersList, pages.ProfilePage],
+    affiliate: [pages.AffiliateDashboard, pages.ProductDetail, pages.MessagesList, pages.ProfilePage],
+    admin: [pages.AdminDashboard],
+};
+
+const saveData = () => !!(navigator as any).connection?.saveData;
+
+export const preloadRoute = (path: string) => {
+    if (saveData()) return;
+    const match = ROUTE_PAGES.find(([prefix]) => path.startsWith(prefix));
+    match?.[1].forEach(page => page.preload().catch(() => undefined));
+};
+
+// Returns a cleanup that cancels the pending idle callback
+export const preloadForRole = (role: string | null | undefined) => {
+    if (saveData()) return () => undefined;
+    const targets = ROLE_PAGES[role || 'guest'] || ROLE_PAGES.buyer;
+    const warm = () => targets.forEach(page => page.preload().catch(() => undefined));
+
+    if ('requestIdleCallback' in window) {
+        const handle = window.requestIdleCallback(warm, { timeout: 5000 });
+        return () => window.cancelIdleCallback(handle);
+    }
+    const timer = window.setTimeout(warm, 2000);
+    return () => window.clearTimeout(timer);
+};
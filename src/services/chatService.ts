@@ -1,5 +1,7 @@
 import { supabase } from '../lib/supabase';
 import { uploadToCloudinary } from '../lib/cloudinary';
+import { ProgressCallback } from '../lib/uploadManager';
+import { PageCursor, keysetFilter, nextCursor } from '../lib/keyset';
 
 export interface Message {
     id: string;
@@ -13,18 +15,25 @@ export interface Message {
     is_read?: boolean;
     read_at?: string;
     created_at: string;
-    order?: {
-        id: string;
-        amount: number;
-        quantity: number;
-        notes?: string;
-        status: string;
-        products: {
-            name: string;
-        };
+    order?: MessageOrder;
+}
+
+export interface MessageOrder {
+    id: string;
+    amount: number;
+    quantity: number;
+    notes?: string;
+    status: string;
+    expires_at?: string;
+    shipping_timeline?: string;
+    products: {
+        name: string;
     };
 }
 
+// Taille de la fenêtre initiale et des pages plus anciennes du chat
+export const MESSAGE_PAGE_SIZE = 30;
+
 export interface Conversation {
     id: string;
     buyer_id: string;
@@ -59,9 +68,15 @@ export interface Conversation {
         avatar_url: string | null;
         role: string;
     };
+    unread_for_buyer?: number;
+    unread_for_seller?: number;
     unread_count?: number;
 }
 
+// Non-lus du point de vue de `userId` (un compteur par participant sur la conversation)
+export const unreadCountFor = (conv: Conversation, userId: string) =>
+    (conv.buyer_id === userId ? conv.unread_for_buyer : conv.unread_for_seller) || 0;
+
 export const chatService = {
     async getConversations(userId: string) {
         // 1. Charger les conversations avec JOINs
@@ -88,26 +103,10 @@ export const chatService = {
             return { data: [], error: null };
         }
 
-        // 3. OPTIMISATION: Charger TOUS les unread counts en UNE SEULE requête
-        const conversationIds = visibleConversations.map(c => c.id);
-
-        const { data: unreadMessages } = await supabase
-            .from('messages')
-            .select('conversation_id')
-            .in('conversation_id', conversationIds)
-            .eq('is_read', false)
-            .neq('sender_id', userId);
-
-        // 4. Compter côté client (ultra rapide)
-        const unreadMap = (unreadMessages || []).reduce((acc, msg) => {
-            acc[msg.conversation_id] = (acc[msg.conversation_id] || 0) + 1;
-            return acc;
-        }, {} as Record<string, number>);
-
-        // 5. Enrichir les conversations avec unread_count
+        // 3. Compteur de non-lus maintenu par le serveur (trigger on_message_sent)
         const conversationsWithUnread = visibleConversations.map(conv => ({
             ...conv,
-            unread_count: unreadMap[conv.id] || 0
+            unread_count: unreadCountFor(conv, userId)
         }));
 
         return { data: conversationsWithUnread, error: null };
@@ -128,41 +127,49 @@ export const chatService = {
         return { data, error };
     },
 
-    async getMessages(conversationId: string) {
-        try {
-            // First attempt: with order details
-            console.log("Attempting to fetch messages with order details...");
-            const { data, error } = await supabase
-                .from('messages')
-                .select(`
-                    *,
-                    order:orders(
-                        id,
-                        amount,
-                        quantity,
-                        notes,
-                        status,
-                        products(name)
-                    )
-                `)
-                .eq('conversation_id', conversationId)
-                .order('created_at', { ascending: true });
+    // Fenêtre de messages : les `limit` plus récents, ou ceux strictement avant `before`.
+    // Renvoie la page en ordre chronologique et le curseur de la page plus ancienne.
+    // Les offres liées (order_id) ne sont plus jointes ici : voir getOrderSummaries.
+    async getMessages(conversationId: string, options: { limit?: number; before?: PageCursor | null } = {}) {
+        const limit = options.limit ?? MESSAGE_PAGE_SIZE;
 
-            if (error) {
-                console.warn("Linked query failed, trying simple query:", error.message);
-                // Fallback to simple query if the column or link is missing
-                return await supabase
-                    .from('messages')
-                    .select('*')
-                    .eq('conversation_id', conversationId)
-                    .order('created_at', { ascending: true });
-            }
+        let query = supabase
+            .from('messages')
+            .select('*')
+            .eq('conversation_id', conversationId);
 
-            return { data, error: null };
-        } catch (err) {
-            console.error("Critical error in getMessages:", err);
-            return { data: [], error: err };
+        if (options.before) {
+            query = query.or(keysetFilter('created_at', false, options.before));
         }
+
+        const { data, error } = await query
+            .order('created_at', { ascending: false })
+            .order('id', { ascending: false })
+            .limit(limit);
+
+        if (error) {
+            console.error("Error fetching messages:", error);
+            return { data: [], error, nextCursor: null };
+        }
+
+        return {
+            data: [...(data || [])].reverse() as Message[],
+            error: null,
+            nextCursor: nextCursor(data, limit, 'created_at')
+        };
+    },
+
+    // Résumés des offres affichées dans le chat, en une requête pour tous les ids demandés
+    async getOrderSummaries(orderIds: string[]) {
+        const ids = Array.from(new Set(orderIds));
+        if (ids.length === 0) return { data: [] as MessageOrder[], error: null };
+
+        const { data, error } = await supabase
+            .from('orders')
+            .select('id, amount, quantity, notes, status, expires_at, shipping_timeline, products(name)')
+            .in('id', ids);
+
+        return { data: (data || []) as unknown as MessageOrder[], error };
     },
 
     async sendMessage(conversationId: string, senderId: string, content: string, media?: { url: string, type: 'image' | 'video' }, stickerId?: string, orderId?: string) {
@@ -214,10 +221,10 @@ export const chatService = {
         }
     },
 
-    async uploadMedia(file: File) {
+    async uploadMedia(file: File, onProgress?: ProgressCallback) {
         try {
             console.log("Uploading file to Cloudinary:", file.name);
-            const url = await uploadToCloudinary(file);
+            const url = await uploadToCloudinary(file, onProgress);
             console.log("Cloudinary upload successful:", url);
             return { url, error: null };
         } catch (err) {
@@ -253,47 +260,49 @@ export const chatService = {
             .subscribe();
     },
 
+    // Changements de statut des offres affichées (paiement, expédition, livraison par l'autre partie)
+    subscribeToOrders(orderIds: string[], callback: (orderId: string) => void) {
+        return supabase
+            .channel(`chat-orders:${orderIds.join(',')}`)
+            .on('postgres_changes', { event: 'UPDATE', schema: 'public', table: 'orders', filter: `id=in.(${orderIds.join(',')})` }, payload => {
+                callback((payload.new as { id: string }).id);
+            })
+            .subscribe();
+    },
+
     // Compter messages non lus pour un utilisateur
     async getUnreadCount(userId: string): Promise<number> {
         const { data, error } = await supabase
-            .from('messages')
-            .select('id, conversation_id, conversations!inner(buyer_id, seller_id)')
-            .eq('is_read', false)
-            .neq('sender_id', userId);
+            .from('user_unread_counters')
+            .select('messages_unread')
+            .eq('user_id', userId)
+            .maybeSingle();
 
         if (error || !data) return 0;
-
-        // Filtrer uniquement les conversations où l'utilisateur est participant
-        const userMessages = data.filter((msg: any) => {
-            const conv = msg.conversations;
-            if (!conv) return false;
-            return conv.buyer_id === userId || conv.seller_id === userId;
-        });
-
-        return userMessages.length;
+        return data.messages_unread;
     },
 
     // Compter messages non lus par conversation
     async getUnreadCountByConversation(conversationId: string, userId: string): Promise<number> {
-        const { count } = await supabase
-            .from('messages')
-            .select('*', { count: 'exact', head: true })
-            .eq('conversation_id', conversationId)
-            .eq('is_read', false)
-            .neq('sender_id', userId);
+        const { data } = await supabase
+            .from('conversations')
+            .select('buyer_id, seller_id, unread_for_buyer, unread_for_seller')
+            .eq('id', conversationId)
+            .maybeSingle();
 
-        return count || 0;
+        return data ? unreadCountFor(data as Conversation, userId) : 0;
     },
 
-    // Marquer messages comme lus
+    // Marquer messages comme lus et remettre le compteur de la conversation à zéro
     async markAsRead(conversationId: string, userId: string) {
-        const { error } = await supabase
-            .from('messages')
-            .update({ is_read: true, read_at: new Date().toISOString() })
-            .eq('conversation_id', conversationId)
-            .neq('sender_id', userId)
-            .eq('is_read', false);
+        const { data, error } = await supabase.rpc('mark_conversation_read', {
+            p_conversation_id: conversationId,
+            p_user_id: userId
+        });
 
+        if (!error && data && !data.success) {
+            return { error: new Error(data.error) };
+        }
         return { error };
     },
 
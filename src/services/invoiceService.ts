@@ -1,4 +1,3 @@
-import jsPDF from 'jspdf';
 import { Transaction } from './transactionService';
 
 interface UserProfile {
@@ -19,12 +18,24 @@ function formatDate(date: Date): string {
     });
 }
 
+// jsPDF is only downloaded the first time a receipt is generated, not with the page
+let jsPDFModule: Promise<typeof import('jspdf')> | null = null;
+
+async function createDocument() {
+    jsPDFModule = jsPDFModule || import('jspdf').catch(err => {
+        jsPDFModule = null;
+        throw err;
+    });
+    const { default: jsPDF } = await jsPDFModule;
+    return new jsPDF();
+}
+
 export const invoiceService = {
     /**
      * Générer une facture d'achat
      */
-    generatePurchaseInvoice(transaction: Transaction, user: UserProfile) {
-        const doc = new jsPDF();
+    async generatePurchaseInvoice(transaction: Transaction, user: UserProfile) {
+        const doc = await createDocument();
         const date = new Date(transaction.created_at);
         const ref = `ZWA-${transaction.id.substring(0, 8).toUpperCase()}`;
 
@@ -141,8 +152,8 @@ export const invoiceService = {
     /**
      * Générer un reçu de vente
      */
-    generateSaleReceipt(transaction: Transaction, user: UserProfile) {
-        const doc = new jsPDF();
+    async generateSaleReceipt(transaction: Transaction, user: UserProfile) {
+        const doc = await createDocument();
         const date = new Date(transaction.created_at);
         const ref = `ZWA-${transaction.id.substring(0, 8).toUpperCase()}`;
 
@@ -282,8 +293,8 @@ export const invoiceService = {
     /**
      * Générer un reçu de commission
      */
-    generateCommissionReceipt(transaction: Transaction, user: UserProfile) {
-        const doc = new jsPDF();
+    async generateCommissionReceipt(transaction: Transaction, user: UserProfile) {
+        const doc = await createDocument();
         const date = new Date(transaction.created_at);
         const ref = `COM-${transaction.id.substring(0, 8).toUpperCase()}`;
 
@@ -401,8 +412,8 @@ export const invoiceService = {
     /**
      * Générer un reçu de retrait
      */
-    generateWithdrawalReceipt(transaction: Transaction, user: UserProfile) {
-        const doc = new jsPDF();
+    async generateWithdrawalReceipt(transaction: Transaction, user: UserProfile) {
+        const doc = await createDocument();
         const date = new Date(transaction.created_at);
         const ref = `RET-${transaction.id.substring(0, 8).toUpperCase()}`;
 
@@ -1,4 +1,5 @@
 import { supabase } from '../lib/supabase';
+import { ProgressCallback, UploadError, uploadFile, withRetry } from '../lib/uploadManager';
 
 export interface KYCRequest {
     id: string;
@@ -79,30 +80,50 @@ class KYCService {
     }
 
     /**
-     * Upload fichier vers Supabase Storage
+     * Upload fichier vers Supabase Storage (compressé, dédupliqué, avec reprise sur erreur réseau)
      */
-    async uploadKYCDocument(file: File, sellerId: string, type: 'id_card' | 'selfie'): Promise<{ url: string | null; error: any }> {
-        const fileExt = file.name.split('.').pop();
-        const fileName = `${sellerId}_${type}_${Date.now()}.${fileExt}`;
-        const filePath = `kyc/${fileName}`;
-
-        const { data, error } = await supabase.storage
-            .from('documents')
-            .upload(filePath, file, {
-                cacheControl: '3600',
-                upsert: false
+    async uploadKYCDocument(
+        file: File,
+        sellerId: string,
+        type: 'id_card' | 'selfie',
+        onProgress?: ProgressCallback
+    ): Promise<{ url: string | null; error: any }> {
+        const send = async (prepared: File) => {
+            const fileExt = prepared.name.split('.').pop();
+            const fileName = `${sellerId}_${type}_${Date.now()}.${fileExt}`;
+            const filePath = `kyc/${fileName}`;
+            let attempted = false;
+
+            await withRetry(async () => {
+                const { error } = await supabase.storage
+                    .from('documents')
+                    .upload(filePath, prepared, {
+                        cacheControl: '3600',
+                        upsert: false
+                    });
+                const status = Number((error as any)?.statusCode ?? (error as any)?.status);
+
+                // 409 after a lost response: the previous attempt did store the file
+                if (error && !(attempted && status === 409)) {
+                    attempted = true;
+                    throw new UploadError(error.message, !status || status >= 500 || status === 429);
+                }
             });
 
-        if (error) {
+            // Récupérer l'URL publique
+            const { data: { publicUrl } } = supabase.storage
+                .from('documents')
+                .getPublicUrl(filePath);
+            return publicUrl;
+        };
+
+        try {
+            // Pièces d'identité : déduplication limitée à la session, jamais mémorisée sur l'appareil
+            const url = await uploadFile(file, { namespace: `kyc:${sellerId}:${type}`, send, onProgress });
+            return { url, error: null };
+        } catch (error) {
             return { url: null, error };
         }
-
-        // Récupérer l'URL publique
-        const { data: { publicUrl } } = supabase.storage
-            .from('documents')
-            .getPublicUrl(filePath);
-
-        return { url: publicUrl, error: null };
     }
 
     /**
@@ -43,13 +43,13 @@ export const notificationService = {
     },
 
     async getUnreadCount(userId: string) {
-        const { count, error } = await supabase
-            .from('notifications')
-            .select('*', { count: 'exact', head: true })
+        const { data, error } = await supabase
+            .from('user_unread_counters')
+            .select('notifications_unread')
             .eq('user_id', userId)
-            .eq('is_read', false);
+            .maybeSingle();
 
-        return { count: count || 0, error };
+        return { count: data?.notifications_unread || 0, error };
     },
 
     /**
@@ -1,5 +1,5 @@
 import { supabase } from '../lib/supabase';
-import { transactionService } from './transactionService';
+import { CountMode, PageCursor, keysetFilter, nextCursor } from '../lib/keyset';
 
 export type OrderStatus = 'pending' | 'paid' | 'shipped' | 'delivered' | 'cancelled';
 
@@ -126,19 +126,26 @@ export const orderService = {
         status,
         search,
         page = 0,
-        limit = 10
+        limit = 10,
+        cursor,
+        countMode
     }: {
         userId: string,
         role: 'buyer' | 'seller' | 'affiliate',
         status?: string,
         search?: string,
         page?: number,
-        limit?: number
+        limit?: number,
+        // Passing `cursor` (null for the first page) switches to keyset pagination on (created_at, id)
+        cursor?: PageCursor | null,
+        // Offset mode counts exactly by default; keyset mode only counts when asked
+        countMode?: CountMode | null
     }) {
+        const keyset = cursor !== undefined;
         const from = page * limit;
         const to = from + limit - 1;
 
-        console.log(`[OrderService] 📑 Fetching paginated orders for ${role} ${userId}`, { status, search, page });
+        console.log(`[OrderService] 📑 Fetching paginated orders for ${role} ${userId}`, { status, search, page, cursor });
 
         let query = supabase
             .from('orders')
@@ -148,7 +155,7 @@ export const orderService = {
                 buyer:profiles!orders_buyer_id_fkey(full_name, avatar_url),
                 seller:profiles!orders_seller_id_fkey(full_name, store_name, avatar_url),
                 reviews(id)
-            `, { count: 'exact' });
+            `, { count: (keyset ? countMode : countMode ?? 'exact') || undefined });
 
         // Filter by role
         if (role === 'seller') {
@@ -170,52 +177,47 @@ export const orderService = {
         // Search (if provided) - This is tricky in Supabase for joined tables, 
         // but we can at least filter by order ID or product name if we use a flat structure or specific queries.
         // For now, let's focus on the basics and add search if possible.
-        if (search) {
-            query = query.or(`id.ilike.%${search}%, notes.ilike.%${search}%`);
+        const searchFilter = search ? `id.ilike.%${search}%, notes.ilike.%${search}%` : null;
+        const afterCursor = cursor ? keysetFilter('created_at', false, cursor) : null;
+        if (searchFilter && afterCursor) {
+            query = query.or(`and(or(${searchFilter}),or(${afterCursor}))`);
+        } else if (searchFilter || afterCursor) {
+            query = query.or((searchFilter || afterCursor)!);
         }
 
-        const { data, error, count } = await query
+        query = query
             .order('created_at', { ascending: false })
-            .range(from, to);
+            .order('id', { ascending: false });
 
-        return { data, error, count };
+        const { data, error, count } = keyset
+            ? await query.limit(limit)
+            : await query.range(from, to);
+
+        return { data, error, count, nextCursor: nextCursor(data, limit, 'created_at') };
     },
 
     async getOrderCounts(userId: string, role: string) {
-        let query = supabase
-            .from('orders')
-            .select('status, amount', { count: 'exact' });
-
-        if (role === 'seller') {
-            query = query.eq('seller_id', userId);
-        } else if (role === 'affiliate') {
-            query = query.eq('affiliate_id', userId);
-        } else {
-            query = query.eq('buyer_id', userId);
-        }
+        // Trigger-maintained counters: one row per (user, role) instead of every order
+        const counterRole = role === 'seller' || role === 'affiliate' ? role : 'buyer';
+        const { data, error } = await supabase
+            .from('order_counters')
+            .select('all_count, pending_count, paid_count, shipped_count, delivered_count, cancelled_count, total_revenue')
+            .eq('user_id', userId)
+            .eq('role', counterRole)
+            .maybeSingle();
 
-        const { data, error } = await query;
         if (error) return { data: null, error };
 
         const counts = {
-            all: data.length,
-            pending: 0,
-            paid: 0,
-            shipped: 0,
-            delivered: 0,
-            cancelled: 0,
-            totalRevenue: 0
+            all: data?.all_count || 0,
+            pending: data?.pending_count || 0,
+            paid: data?.paid_count || 0,
+            shipped: data?.shipped_count || 0,
+            delivered: data?.delivered_count || 0,
+            cancelled: data?.cancelled_count || 0,
+            totalRevenue: Number(data?.total_revenue || 0)
         };
 
-        data.forEach(order => {
-            if (counts[order.status as keyof typeof counts] !== undefined) {
-                (counts[order.status as keyof typeof counts] as number)++;
-            }
-            if (order.status === 'delivered' || order.status === 'paid' || order.status === 'shipped') {
-                counts.totalRevenue += Number(order.amount);
-            }
-        });
-
         return { data: counts, error: null };
     },
 
@@ -296,177 +298,82 @@ export const orderService = {
     },
 
     async deliverOrder(orderId: string, otp: string) {
-        console.log('[OrderService] 📦 Seller confirming delivery for order:', orderId, 'with OTP:', otp);
-
-        // 1. Fetch the order to verify OTP
-        const { data: order, error: fetchError } = await supabase
-            .from('orders')
-            .select('*')
-            .eq('id', orderId)
-            .single();
-
-        if (fetchError || !order) {
-            console.error('[OrderService] ❌ Order not found:', fetchError);
-            return { error: fetchError || new Error('Order not found') };
-        }
-
-        if (order.delivery_otp_hash !== otp.trim()) {
-            console.error('[OrderService] ❌ Invalid OTP. Expected:', order.delivery_otp_hash, 'Got:', otp.trim());
-            return { error: new Error('Code OTP invalide') };
-        }
+        console.log('[OrderService] 📦 Seller confirming delivery for order:', orderId);
 
-        console.log('[OrderService] ✅ OTP verified. Updating order to delivered...');
-
-        // 2. Update order status
-        const { error: updateError } = await supabase
-            .from('orders')
-            .update({ status: 'delivered' })
-            .eq('id', orderId);
+        // OTP check, status change, wallet credits and ledger rows in one atomic RPC
+        const { data: result, error } = await supabase
+            .rpc('settle_order_delivery', {
+                p_order_id: orderId,
+                p_otp: otp.trim()
+            });
 
-        if (updateError) {
-            console.error('[OrderService] ❌ Failed to update order:', updateError);
-            return { error: updateError };
+        if (error) {
+            console.error('[OrderService] ❌ Delivery settlement failed:', error);
+            return { error };
         }
 
-        console.log('[OrderService] 💰 Updating wallet balances...');
-
-        // 3. Update seller and affiliate wallet balances
-        const { data: sellerProfile, error: sellerErr } = await supabase
-            .from('profiles')
-            .select('wallet_balance')
-            .eq('id', order.seller_id)
-            .single();
-
-        if (sellerErr) {
-            console.error('[OrderService] ❌ Failed to fetch seller profile:', sellerErr);
-            return { error: sellerErr };
+        if (!result?.success) {
+            console.error('[OrderService] ❌ Delivery refused:', result?.error);
+            const message = result?.error === 'Invalid OTP' ? 'Code OTP invalide' :
+                result?.error === 'Order not found' ? 'Order not found' :
+                    result?.error === 'Order not shipped' ? "La commande n'a pas encore été expédiée" :
+                        result?.error || 'Livraison impossible';
+            return { error: new Error(message) };
         }
 
-        const commission = Number(order.commission_amount || 0);
-        const netAmount = Number(order.amount) - commission;
-        const newSellerBalance = Number(sellerProfile.wallet_balance) + netAmount;
-
-        console.log('[OrderService] 💸 Seller payout:', {
-            amount: order.amount,
-            commission,
-            netAmount,
-            newBalance: newSellerBalance
+        console.log('[OrderService] ✅ Delivery settled:', {
+            alreadyDelivered: !!result.already_delivered,
+            sellerBalance: result.seller_balance,
+            affiliateBalance: result.affiliate_balance
         });
 
-        // Update seller
-        const { error: walletError } = await supabase
-            .from('profiles')
-            .update({ wallet_balance: newSellerBalance })
-            .eq('id', order.seller_id);
+        return {
+            data: {
+                success: true,
+                order: result.order,
+                sellerBalance: result.seller_balance,
+                affiliateBalance: result.affiliate_balance,
+                buyerBalance: result.buyer_balance
+            },
+            error: null
+        };
+    },
 
-        if (walletError) {
-            console.error('[OrderService] ❌ Failed to update seller wallet:', walletError);
-            return { error: walletError };
-        }
+    async deliverOrders(deliveries: { orderId: string; otp: string }[]) {
+        console.log('[OrderService] 📦 Seller confirming', deliveries.length, 'deliveries at once');
 
-        // Update affiliate if present
-        if (order.affiliate_id && commission > 0) {
-            console.log('[OrderService] 🎁 Affiliate detected. Updating commission...', {
-                affiliateId: order.affiliate_id,
-                commission
+        // One transaction for the whole batch: one wallet update per account, one ledger insert
+        const { data: result, error } = await supabase
+            .rpc('settle_order_deliveries', {
+                p_deliveries: deliveries.map(d => ({ order_id: d.orderId, otp: d.otp.trim() }))
             });
 
-            const { data: affiliateProfile } = await supabase
-                .from('profiles')
-                .select('wallet_balance')
-                .eq('id', order.affiliate_id)
-                .single();
-
-            if (affiliateProfile) {
-                const newAffiliateBalance = Number(affiliateProfile.wallet_balance) + commission;
-                await supabase
-                    .from('profiles')
-                    .update({ wallet_balance: newAffiliateBalance })
-                    .eq('id', order.affiliate_id);
-
-                console.log('[OrderService] ✅ Affiliate commission paid:', {
-                    newBalance: newAffiliateBalance
-                });
-            }
-        }
-
-        console.log('[OrderService] ✅ Delivery confirmed successfully!');
-
-        // 🆕 Create transactions for all parties involved
-        console.log('[OrderService] 📝 Creating transactions...');
-
-        // Fetch product details for transactions
-        const { data: product } = await supabase
-            .from('products')
-            .select('name, image_url, default_commission')
-            .eq('id', order.product_id)
-            .single();
-
-        const productName = product?.name || 'Produit';
-        const productImage = product?.image_url || '';
-        const quantity = order.quantity || 1;
-        const unitPrice = Number(order.amount) / quantity;
-
-        // 1. Create PURCHASE transaction for buyer
-        const { data: buyerProfile } = await supabase
-            .from('profiles')
-            .select('wallet_balance')
-            .eq('id', order.buyer_id)
-            .single();
-
-        if (buyerProfile) {
-            await transactionService.createPurchaseTransaction({
-                userId: order.buyer_id,
-                orderId: order.id,
-                amount: Number(order.amount),
-                balanceAfter: Number(buyerProfile.wallet_balance),
-                productName,
-                productImage,
-                quantity,
-                unitPrice
-            });
-            console.log('[OrderService] ✅ Purchase transaction created for buyer');
+        if (error) {
+            console.error('[OrderService] ❌ Bulk delivery settlement failed:', error);
+            return { data: null, error };
         }
 
-        // 2. Create SALE transaction for seller
-        await transactionService.createSaleTransaction({
-            sellerId: order.seller_id,
-            orderId: order.id,
-            amount: netAmount,
-            balanceAfter: newSellerBalance,
-            productName,
-            productImage,
-            quantity,
-            unitPrice,
-            commissionAmount: commission > 0 ? commission : undefined
+        const results: { orderId: string; success: boolean; alreadyDelivered: boolean; error?: string }[] =
+            (result?.results || []).map((r: any) => ({
+                orderId: r.order_id,
+                success: r.success,
+                alreadyDelivered: !!r.already_delivered,
+                error: r.error === 'Invalid OTP' ? 'Code OTP invalide' : r.error
+            }));
+
+        console.log('[OrderService] ✅ Bulk delivery settled:', {
+            settled: result?.settled,
+            failed: results.filter(r => !r.success).length
         });
-        console.log('[OrderService] ✅ Sale transaction created for seller');
-
-        // 3. Create COMMISSION transaction for affiliate (if applicable)
-        if (order.affiliate_id && commission > 0) {
-            const { data: affiliateProfile } = await supabase
-                .from('profiles')
-                .select('wallet_balance')
-                .eq('id', order.affiliate_id)
-                .single();
 
-            if (affiliateProfile) {
-                const commissionRate = product?.default_commission || 0;
-                await transactionService.createCommissionTransaction({
-                    affiliateId: order.affiliate_id,
-                    orderId: order.id,
-                    amount: commission,
-                    balanceAfter: Number(affiliateProfile.wallet_balance),
-                    productName,
-                    commissionRate,
-                    totalSale: Number(order.amount)
-                });
-                console.log('[OrderService] ✅ Commission transaction created for affiliate');
-            }
-        }
-
-        console.log('[OrderService] ✅ All transactions created successfully!');
-        return { data: { success: true }, error: null };
+        return {
+            data: {
+                settled: result?.settled || 0,
+                results,
+                balances: (result?.balances || {}) as Record<string, number>
+            },
+            error: null
+        };
     },
 
     async simulatePayment(orderId: string) {
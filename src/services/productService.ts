@@ -1,4 +1,5 @@
 import { supabase } from '../lib/supabase';
+import { CountMode, PageCursor, keysetFilter, nextCursor } from '../lib/keyset';
 
 export interface Product {
     id: string;
@@ -13,11 +14,14 @@ export interface Product {
     is_affiliate_enabled: boolean;
     image_url: string; // Keep as main/first image for compatibility
     images_url?: string[]; // Additional or all images
+    image_placeholder?: string | null; // Tiny LQIP data URL of the main image
     category_id?: string | null; // Link to categories table
     city_id?: string | null; // Link to cities table
     average_rating?: number; // Product's own rating
     total_reviews?: number; // Product's own review count
     created_at: string;
+    seller_is_verified?: boolean; // Denormalized from profiles for indexed filtering
+    listing_city_id?: string | null; // Product city, falling back to the seller's
     profiles?: {
         full_name: string;
         is_verified_seller: boolean;
@@ -37,6 +41,23 @@ export interface Product {
     };
 }
 
+export type ProductSort = 'relevance' | 'price_asc' | 'price_desc' | 'newest';
+
+// Sort column per listing order; id breaks ties so keyset cursors are stable
+const SORT_KEYS: Record<ProductSort, { column: string; ascending: boolean }> = {
+    relevance: { column: 'created_at', ascending: false },
+    newest: { column: 'created_at', ascending: false },
+    price_asc: { column: 'price', ascending: true },
+    price_desc: { column: 'price', ascending: false },
+};
+
+export interface PageOptions {
+    // Passing `cursor` (null for the first page) switches from offset to keyset pagination
+    cursor?: PageCursor | null;
+    // Offset mode counts exactly by default; keyset mode only counts when asked
+    countMode?: CountMode | null;
+}
+
 export const productService = {
     async getProducts(limit: number = 50) {
         const { data, error } = await supabase
@@ -59,26 +80,35 @@ export const productService = {
             moqOne?: boolean;
             promoOnly?: boolean;
             sellerId?: string;
+            cityId?: string;
         },
-        sortBy?: 'relevance' | 'price_asc' | 'price_desc' | 'newest'
+        sortBy?: ProductSort,
+        options: PageOptions = {}
     ) {
+        // Text search goes through the ranked full-text/trigram RPC
+        if (filters?.search?.trim()) {
+            return this.searchProducts(filters.search, page, limit, filters, sortBy, options.cursor);
+        }
+
+        const keyset = options.cursor !== undefined;
+        const count = (keyset ? options.countMode : options.countMode ?? 'exact') || undefined;
         const from = page * limit;
         const to = from + limit - 1;
 
         let query = supabase
             .from('products')
-            .select('*, profiles(full_name, is_verified_seller, avatar_url, store_name, total_sales_count, average_rating), categories(id, name, icon)', { count: 'exact' });
-
-        if (filters?.search) {
-            query = query.ilike('name', `%${filters.search}%`);
-        }
+            .select('*, profiles(full_name, is_verified_seller, avatar_url, store_name, total_sales_count, average_rating), categories(id, name, icon)', { count });
 
         if (filters?.categories && filters.categories.length > 0) {
             query = query.in('category_id', filters.categories);
         }
 
         if (filters?.verifiedOnly) {
-            query = query.filter('profiles.is_verified_seller', 'eq', true);
+            query = query.eq('seller_is_verified', true);
+        }
+
+        if (filters?.cityId) {
+            query = query.eq('listing_city_id', filters.cityId);
         }
 
         if (filters?.moqOne) {
@@ -93,25 +123,20 @@ export const productService = {
             query = query.eq('seller_id', filters.sellerId);
         }
 
-        // Apply server-side sorting
-        switch (sortBy) {
-            case 'price_asc':
-                query = query.order('price', { ascending: true });
-                break;
-            case 'price_desc':
-                query = query.order('price', { ascending: false });
-                break;
-            case 'newest':
-                query = query.order('created_at', { ascending: false });
-                break;
-            default: // relevance
-                query = query.order('created_at', { ascending: false });
-                break;
+        // Apply server-side sorting (and resume after the cursor in keyset mode)
+        const sortKey = SORT_KEYS[sortBy || 'relevance'];
+        if (options.cursor) {
+            query = query.or(keysetFilter(sortKey.column, sortKey.ascending, options.cursor));
         }
+        query = query
+            .order(sortKey.column, { ascending: sortKey.ascending })
+            .order('id', { ascending: sortKey.ascending });
 
-        const { data, error, count } = await query.range(from, to);
+        const { data, error, count: total } = keyset
+            ? await query.limit(limit)
+            : await query.range(from, to);
 
-        return { data: data as Product[] | null, error, count };
+        return { data: data as Product[] | null, error, count: total, nextCursor: nextCursor(data, limit, sortKey.column) };
     },
 
     async getSimilarProducts(categoryId: string, currentProductId: string, limit: number = 8) {
@@ -177,8 +202,8 @@ export const productService = {
     },
 
     /**
-     * OPTIMIZED: Get paginated products with separate queries to reduce JOINs
-     * This is 60-70% faster than getPaginatedProducts()
+     * OPTIMIZED: One request per page from the product_cards view (compact card fields with
+     * seller and category embedded, see 20260211_product_cards_view.sql)
      */
     async getPaginatedProductsOptimized(
         page: number = 0,
@@ -190,26 +215,38 @@ export const productService = {
             moqOne?: boolean;
             promoOnly?: boolean;
             sellerId?: string;
+            cityId?: string;
         },
-        sortBy?: 'relevance' | 'price_asc' | 'price_desc' | 'newest'
+        sortBy?: ProductSort,
+        options: PageOptions = {}
     ) {
+        // Text search goes through the ranked full-text/trigram RPC
+        if (filters?.search?.trim()) {
+            return this.searchProducts(filters.search, page, limit, filters, sortBy, options.cursor);
+        }
+
+        const keyset = options.cursor !== undefined;
+        const count = (keyset ? options.countMode : options.countMode ?? 'exact') || undefined;
         const from = page * limit;
         const to = from + limit - 1;
 
-        // Step 1: Build query for products only (no joins)
         let query = supabase
-            .from('products')
-            .select('id, seller_id, name, description, price, original_price, min_order_quantity, stock_quantity, default_commission, is_affiliate_enabled, image_url, images_url, category_id, city_id, average_rating, total_reviews, created_at', { count: 'exact' });
-
-        // Apply filters
-        if (filters?.search) {
-            query = query.ilike('name', `%${filters.search}%`);
-        }
+            .from('product_cards')
+            .select('*', { count });
 
+        // Apply filters (all server-side)
         if (filters?.categories && filters.categories.length > 0) {
             query = query.in('category_id', filters.categories);
         }
 
+        if (filters?.verifiedOnly) {
+            query = query.eq('seller_is_verified', true);
+        }
+
+        if (filters?.cityId) {
+            query = query.eq('listing_city_id', filters.cityId);
+        }
+
         if (filters?.moqOne) {
             query = query.eq('min_order_quantity', 1);
         }
@@ -222,73 +259,60 @@ export const productService = {
             query = query.eq('seller_id', filters.sellerId);
         }
 
-        // Apply server-side sorting
-        switch (sortBy) {
-            case 'price_asc':
-                query = query.order('price', { ascending: true });
-                break;
-            case 'price_desc':
-                query = query.order('price', { ascending: false });
-                break;
-            case 'newest':
-                query = query.order('created_at', { ascending: false });
-                break;
-            default: // relevance
-                query = query.order('created_at', { ascending: false });
-                break;
+        // Apply server-side sorting (and resume after the cursor in keyset mode)
+        const sortKey = SORT_KEYS[sortBy || 'relevance'];
+        if (options.cursor) {
+            query = query.or(keysetFilter(sortKey.column, sortKey.ascending, options.cursor));
         }
+        query = query
+            .order(sortKey.column, { ascending: sortKey.ascending })
+            .order('id', { ascending: sortKey.ascending });
 
-        // Fetch products
-        const { data: products, error, count } = await query.range(from, to);
+        const { data, error, count: total } = keyset
+            ? await query.limit(limit)
+            : await query.range(from, to);
 
-        if (error || !products || products.length === 0) {
-            return { data: products as Product[] | null, error, count };
-        }
+        return { data: data as Product[] | null, error, count: total, nextCursor: nextCursor(data, limit, sortKey.column) };
+    },
 
-        // Step 2: Get unique seller IDs and category IDs
-        const sellerIds = [...new Set(products.map(p => p.seller_id).filter(Boolean))];
-        const categoryIds = [...new Set(products.map(p => p.category_id).filter(Boolean))];
-
-        // Step 3: Fetch profiles and categories in parallel
-        const [profilesResult, categoriesResult] = await Promise.all([
-            sellerIds.length > 0
-                ? supabase
-                    .from('profiles')
-                    .select('id, full_name, is_verified_seller, avatar_url, store_name, total_sales_count, average_rating')
-                    .in('id', sellerIds)
-                : Promise.resolve({ data: [], error: null }),
-            categoryIds.length > 0
-                ? supabase
-                    .from('categories')
-                    .select('id, name, icon')
-                    .in('id', categoryIds)
-                : Promise.resolve({ data: [], error: null })
-        ]);
-
-        // Step 4: Create lookup maps for O(1) access
-        const profilesMap = new Map(
-            (profilesResult.data || []).map(p => [p.id, p])
-        );
-        const categoriesMap = new Map(
-            (categoriesResult.data || []).map(c => [c.id, c])
-        );
-
-        // Step 5: Enrich products with profile and category data
-        const enrichedProducts = products.map(product => ({
-            ...product,
-            profiles: product.seller_id ? profilesMap.get(product.seller_id) : undefined,
-            categories: product.category_id ? categoriesMap.get(product.category_id) : undefined
-        }));
-
-        // Apply verifiedOnly filter client-side (since we can't do it in the initial query)
-        const filteredProducts = filters?.verifiedOnly
-            ? enrichedProducts.filter(p => p.profiles?.is_verified_seller === true)
-            : enrichedProducts;
+    async searchProducts(
+        search: string,
+        page: number = 0,
+        limit: number = 20,
+        filters?: {
+            categories?: string[];
+            verifiedOnly?: boolean;
+            moqOne?: boolean;
+            promoOnly?: boolean;
+            sellerId?: string;
+            cityId?: string;
+        },
+        sortBy: ProductSort = 'relevance',
+        cursor?: PageCursor | null
+    ) {
+        // Ranked search over name, category, store and description (see 20260207_product_search.sql)
+        const { data, error } = await supabase.rpc('search_products', {
+            p_query: search.trim(),
+            p_categories: filters?.categories?.length ? filters.categories : null,
+            p_verified_only: !!filters?.verifiedOnly,
+            p_moq_one: !!filters?.moqOne,
+            p_promo_only: !!filters?.promoOnly,
+            p_seller_id: filters?.sellerId || null,
+            p_city_id: filters?.cityId || null,
+            p_sort: sortBy,
+            p_limit: limit,
+            p_offset: cursor === undefined ? page * limit : 0,
+            p_after_value: cursor ? String(cursor.value) : null,
+            p_after_id: cursor ? cursor.id : null
+        });
+
+        const cursorColumn = sortBy === 'relevance' ? 'search_rank' : SORT_KEYS[sortBy].column;
 
         return {
-            data: filteredProducts as Product[] | null,
-            error: null,
-            count: filters?.verifiedOnly ? filteredProducts.length : count
+            data: data as Product[] | null,
+            error,
+            count: null as number | null,
+            nextCursor: nextCursor(data, limit, cursorColumn)
         };
     }
 };
@@ -1,4 +1,5 @@
 import { supabase } from '../lib/supabase';
+import { CountMode, PageCursor, keysetFilter, nextCursor } from '../lib/keyset';
 
 export interface Transaction {
     id: string;
@@ -29,28 +30,44 @@ export interface Transaction {
 
 export const transactionService = {
     /**
-     * Récupérer toutes les transactions d'un utilisateur avec filtre optionnel
+     * Récupérer les transactions d'un utilisateur avec filtre optionnel.
+     * Sans `options.limit` : tout l'historique. Avec : une page par curseur (created_at, id).
      */
     async getTransactionsByUser(
         userId: string,
-        filter: 'all' | 'purchase' | 'sale' | 'commission' | 'withdrawal' = 'all'
+        filter: 'all' | 'purchase' | 'sale' | 'commission' | 'withdrawal' = 'all',
+        options: { limit?: number; cursor?: PageCursor | null; countMode?: CountMode | null } = {}
     ) {
-        console.log('[TransactionService] 📊 Fetching transactions for user:', userId, 'Filter:', filter);
+        console.log('[TransactionService] 📊 Fetching transactions for user:', userId, 'Filter:', filter, 'Cursor:', options.cursor);
 
         let query = supabase
             .from('transactions')
-            .select('*')
-            .eq('user_id', userId)
-            .order('created_at', { ascending: false });
+            .select('*', { count: options.countMode || undefined })
+            .eq('user_id', userId);
 
         if (filter !== 'all') {
             query = query.eq('type', filter);
         }
 
-        const { data, error } = await query;
+        if (options.cursor) {
+            query = query.or(keysetFilter('created_at', false, options.cursor));
+        }
+
+        query = query
+            .order('created_at', { ascending: false })
+            .order('id', { ascending: false });
+
+        const { data, error, count } = options.limit
+            ? await query.limit(options.limit)
+            : await query;
 
         console.log('[TransactionService] 📊 Transactions fetched:', { count: data?.length, error });
-        return { data, error };
+        return {
+            data,
+            error,
+            count,
+            nextCursor: options.limit ? nextCursor(data, options.limit, 'created_at') : null
+        };
     },
 
     /**
@@ -0,0 +1,57 @@
+import { supabase } from '../lib/supabase';
+import { Conversation } from './chatService';
+
+export interface UnreadCounters {
+    messages_unread: number;
+    notifications_unread: number;
+}
+
+export const EMPTY_UNREAD_COUNTERS: UnreadCounters = { messages_unread: 0, notifications_unread: 0 };
+
+// Badges (Messages, cloche) lus depuis user_unread_counters, maintenu par les triggers
+export const unreadService = {
+    async getCounters(userId: string) {
+        const { data, error } = await supabase
+            .from('user_unread_counters')
+            .select('messages_unread, notifications_unread')
+            .eq('user_id', userId)
+            .maybeSingle();
+
+        return { data: (data as UnreadCounters | null) || EMPTY_UNREAD_COUNTERS, error };
+    },
+
+    /**
+     * Un seul canal temps réel par utilisateur : totaux des badges et compteurs/aperçus
+     * des conversations dont il est acheteur ou vendeur
+     */
+    subscribe(
+        userId: string,
+        handlers: {
+            onCounters: (counters: UnreadCounters) => void;
+            onConversation: (conversation: Conversation) => void;
+        }
+    ) {
+        const onConversation = (payload: { new: unknown }) => handlers.onConversation(payload.new as Conversation);
+
+        return supabase
+            .channel(`unread:${userId}`)
+            .on(
+                'postgres_changes',
+                { event: '*', schema: 'public', table: 'user_unread_counters', filter: `user_id=eq.${userId}` },
+                (payload) => {
+                    if (payload.eventType !== 'DELETE') handlers.onCounters(payload.new as UnreadCounters);
+                }
+            )
+            .on(
+                'postgres_changes',
+                { event: 'UPDATE', schema: 'public', table: 'conversations', filter: `buyer_id=eq.${userId}` },
+                onConversation
+            )
+            .on(
+                'postgres_changes',
+                { event: 'UPDATE', schema: 'public', table: 'conversations', filter: `seller_id=eq.${userId}` },
+                onConversation
+            )
+            .subscribe();
+    }
+};
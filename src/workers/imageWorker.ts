@@ -0,0 +1,49 @@
+import { contentHash, isCompressible, needsDownscale, MAX_UPLOAD_DIMENSION, UPLOAD_QUALITY } from '../lib/images';
+
+// Upload preparation off the main thread: content hash (for deduplication) and
+// resize/re-encode of photos, so decoding a 12 MP image never freezes the form.
+
+export interface PrepareRequest {
+    id: number;
+    file: File;
+}
+
+export interface PrepareResponse {
+    id: number;
+    hash?: string | null;
+    blob?: Blob | null; // null = upload the original file
+    error?: string;
+}
+
+const compress = async (file: File) => {
+    if (!isCompressible(file)) return null;
+
+    const bitmap = await createImageBitmap(file, { imageOrientation: 'from-image' });
+    if (!needsDownscale(file.size, bitmap.width, bitmap.height)) {
+        bitmap.close();
+        return null;
+    }
+
+    const scale = Math.min(1, MAX_UPLOAD_DIMENSION / Math.max(bitmap.width, bitmap.height));
+    const canvas = new OffscreenCanvas(
+        Math.max(1, Math.round(bitmap.width * scale)),
+        Math.max(1, Math.round(bitmap.height * scale))
+    );
+    canvas.getContext('2d')?.drawImage(bitmap, 0, 0, canvas.width, canvas.height);
+    bitmap.close();
+
+    const blob = await canvas.convertToBlob({ type: 'image/webp', quality: UPLOAD_QUALITY });
+    return blob.size < file.size ? blob : null;
+};
+
+self.onmessage = async (event: MessageEvent<PrepareRequest>) => {
+    const { id, file } = event.data;
+    try {
+        // Hash the original, so the same photo picked twice maps to the same upload
+        const hash = await contentHash(file);
+        const blob = await compress(file).catch(() => null);
+        self.postMessage({ id, hash, blob } as PrepareResponse);
+    } catch (err) {
+        self.postMessage({ id, error: String(err) } as PrepareResponse);
+    }
+};
@@ -0,0 +1,136 @@
+-- Migration : Règlement atomique d'une livraison
+-- Description : Remplace les ~12 appels successifs de orderService.deliverOrder par une seule
+-- transaction : vérification de l'OTP, passage en 'delivered', crédit des wallets par incrément
+-- (vendeur et affilié) et écriture des transactions achat / vente / commission.
+-- Le verrou sur la commande empêche deux confirmations concurrentes de créditer deux fois.
+
+CREATE OR REPLACE FUNCTION public.settle_order_delivery(
+    p_order_id UUID,
+    p_otp TEXT
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_order RECORD;
+    v_updated_order RECORD;
+    v_product RECORD;
+    v_commission DECIMAL(10, 2);
+    v_net_amount DECIMAL(10, 2);
+    v_quantity INTEGER;
+    v_unit_price DECIMAL(10, 2);
+    v_product_name TEXT;
+    v_seller_balance DECIMAL(10, 2);
+    v_affiliate_balance DECIMAL(10, 2);
+    v_buyer_balance DECIMAL(10, 2);
+BEGIN
+    -- 1. Récupération de la commande avec verrouillage pour éviter les accès concurrents
+    SELECT * INTO v_order
+    FROM public.orders
+    WHERE id = p_order_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('success', false, 'error', 'Order not found');
+    END IF;
+
+    -- Seul le vendeur (ou un admin / le service_role) peut confirmer la livraison.
+    -- Une requête sans uid (anon) n'est pas privilégiée : seul le service_role l'est.
+    IF auth.role() IS DISTINCT FROM 'service_role'
+       AND auth.uid() IS DISTINCT FROM v_order.seller_id
+       AND NOT EXISTS (SELECT 1 FROM public.profiles WHERE id = auth.uid() AND role = 'admin') THEN
+        RETURN jsonb_build_object('success', false, 'error', 'Not allowed');
+    END IF;
+
+    -- 2. Si la commande est DÉJÀ livrée, on ne crédite pas une seconde fois
+    IF v_order.status = 'delivered' THEN
+        SELECT wallet_balance INTO v_seller_balance FROM public.profiles WHERE id = v_order.seller_id;
+        SELECT wallet_balance INTO v_affiliate_balance FROM public.profiles WHERE id = v_order.affiliate_id;
+        RETURN jsonb_build_object(
+            'success', true,
+            'already_delivered', true,
+            'order', row_to_json(v_order),
+            'seller_balance', v_seller_balance,
+            'affiliate_balance', v_affiliate_balance
+        );
+    END IF;
+
+    IF v_order.status <> 'shipped' THEN
+        RETURN jsonb_build_object('success', false, 'error', 'Order not shipped');
+    END IF;
+
+    -- 3. Vérification de l'OTP
+    IF v_order.delivery_otp_hash IS DISTINCT FROM trim(p_otp) THEN
+        RETURN jsonb_build_object('success', false, 'error', 'Invalid OTP');
+    END IF;
+
+    -- 4. Passage en 'delivered' (déclenche total_sales_count et les notifications)
+    UPDATE public.orders
+    SET status = 'delivered'
+    WHERE id = p_order_id
+    RETURNING * INTO v_updated_order;
+
+    v_commission := COALESCE(v_order.commission_amount, 0);
+    v_net_amount := v_order.amount - v_commission;
+    v_quantity := COALESCE(v_order.quantity, 1);
+    v_unit_price := v_order.amount / v_quantity;
+
+    SELECT name, image_url, default_commission INTO v_product
+    FROM public.products
+    WHERE id = v_order.product_id;
+    v_product_name := COALESCE(v_product.name, 'Produit');
+
+    -- 5. Crédit des wallets par incrément (pas de lecture puis écriture côté client)
+    UPDATE public.profiles
+    SET wallet_balance = COALESCE(wallet_balance, 0) + v_net_amount
+    WHERE id = v_order.seller_id
+    RETURNING wallet_balance INTO v_seller_balance;
+
+    IF v_order.affiliate_id IS NOT NULL AND v_commission > 0 THEN
+        UPDATE public.profiles
+        SET wallet_balance = COALESCE(wallet_balance, 0) + v_commission
+        WHERE id = v_order.affiliate_id
+        RETURNING wallet_balance INTO v_affiliate_balance;
+    END IF;
+
+    SELECT wallet_balance INTO v_buyer_balance FROM public.profiles WHERE id = v_order.buyer_id;
+
+    -- 6. Transactions achat / vente / commission
+    INSERT INTO public.transactions (
+        user_id, type, amount, balance_after, order_id,
+        product_name, product_image, quantity, unit_price, commission_rate, description
+    )
+    SELECT * FROM (VALUES
+        (v_order.buyer_id, 'purchase', -v_order.amount, COALESCE(v_buyer_balance, 0), v_order.id,
+         v_product_name, v_product.image_url, v_quantity, v_unit_price, NULL::DECIMAL,
+         'Achat de ' || v_quantity || 'x ' || v_product_name),
+        (v_order.seller_id, 'sale', v_net_amount, v_seller_balance, v_order.id,
+         v_product_name, v_product.image_url, v_quantity, v_unit_price, NULL::DECIMAL,
+         'Vente de ' || v_quantity || 'x ' || v_product_name
+            || CASE WHEN v_commission > 0 THEN ' (Commission: -' || v_commission || ' FCFA)' ELSE '' END)
+    ) AS ledger(user_id, type, amount, balance_after, order_id,
+                product_name, product_image, quantity, unit_price, commission_rate, description)
+    WHERE ledger.user_id IS NOT NULL;
+
+    IF v_affiliate_balance IS NOT NULL THEN
+        INSERT INTO public.transactions (
+            user_id, type, amount, balance_after, order_id, product_name, commission_rate, description
+        ) VALUES (
+            v_order.affiliate_id, 'commission', v_commission, v_affiliate_balance, v_order.id,
+            v_product_name, COALESCE(v_product.default_commission, 0),
+            'Commission ' || COALESCE(v_product.default_commission, 0) || '% sur vente de ' || v_order.amount || ' FCFA'
+        );
+    END IF;
+
+    RETURN jsonb_build_object(
+        'success', true,
+        'order', row_to_json(v_updated_order),
+        'seller_balance', v_seller_balance,
+        'affiliate_balance', v_affiliate_balance,
+        'buyer_balance', v_buyer_balance
+    );
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Permission d'exécution
+REVOKE EXECUTE ON FUNCTION public.settle_order_delivery(UUID, TEXT) FROM PUBLIC, anon;
+GRANT EXECUTE ON FUNCTION public.settle_order_delivery TO authenticated;
+GRANT EXECUTE ON FUNCTION public.settle_order_delivery TO service_role;
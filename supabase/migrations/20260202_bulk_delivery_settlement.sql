@@ -0,0 +1,159 @@
+-- Migration : Règlement groupé de livraisons
+-- Description : Confirme en une seule transaction une liste de paires (order_id, otp).
+-- Les commandes sont validées ensemble, chaque wallet (vendeur / affilié) n'est mis à jour
+-- qu'une fois avec la somme de ses crédits, et les transactions sont insérées en un seul INSERT.
+-- Même règles que settle_order_delivery ; le résultat est détaillé commande par commande.
+--
+-- Exemple : SELECT public.settle_order_deliveries('[{"order_id": "...", "otp": "123456"}]');
+
+CREATE OR REPLACE FUNCTION public.settle_order_deliveries(
+    p_deliveries JSONB
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_is_admin BOOLEAN;
+    v_results JSONB;
+    v_settled UUID[];
+    v_balances JSONB;
+BEGIN
+    -- Privilégiés : le service_role et les admins (une requête anon, sans uid, ne l'est pas)
+    v_is_admin := auth.role() IS NOT DISTINCT FROM 'service_role'
+        OR EXISTS (SELECT 1 FROM public.profiles WHERE id = auth.uid() AND role = 'admin');
+
+    -- 1. Verrouillage des commandes concernées, dans un ordre stable pour éviter les interblocages
+    PERFORM 1
+    FROM public.orders
+    WHERE id IN (SELECT (d->>'order_id')::UUID FROM jsonb_array_elements(p_deliveries) AS d)
+    ORDER BY id
+    FOR UPDATE;
+
+    -- 2. Verdict par commande (une commande demandée deux fois n'est réglée qu'une fois)
+    WITH requested AS (
+        SELECT (d->>'order_id')::UUID AS order_id, trim(d->>'otp') AS otp, position
+        FROM jsonb_array_elements(p_deliveries) WITH ORDINALITY AS r(d, position)
+    ),
+    verdicts AS (
+        SELECT
+            r.position,
+            r.order_id,
+            CASE
+                WHEN o.id IS NULL THEN 'Order not found'
+                WHEN r.position <> MIN(r.position) OVER (PARTITION BY r.order_id) THEN 'Duplicate order'
+                WHEN NOT v_is_admin AND o.seller_id IS DISTINCT FROM auth.uid() THEN 'Not allowed'
+                WHEN o.status = 'delivered' THEN 'already_delivered'
+                WHEN o.status <> 'shipped' THEN 'Order not shipped'
+                WHEN o.delivery_otp_hash IS DISTINCT FROM r.otp THEN 'Invalid OTP'
+            END AS problem
+        FROM requested r
+        LEFT JOIN public.orders o ON o.id = r.order_id
+    )
+    SELECT
+        jsonb_agg(
+            CASE
+                WHEN problem IS NULL THEN jsonb_build_object('order_id', order_id, 'success', true)
+                WHEN problem = 'already_delivered' THEN
+                    jsonb_build_object('order_id', order_id, 'success', true, 'already_delivered', true)
+                ELSE jsonb_build_object('order_id', order_id, 'success', false, 'error', problem)
+            END
+            ORDER BY position
+        ),
+        array_agg(order_id ORDER BY position) FILTER (WHERE problem IS NULL)
+    INTO v_results, v_settled
+    FROM verdicts;
+
+    IF v_settled IS NULL THEN
+        RETURN jsonb_build_object('success', true, 'settled', 0, 'results', COALESCE(v_results, '[]'::JSONB),
+                                  'balances', '{}'::JSONB);
+    END IF;
+
+    -- 3. Passage en 'delivered' (déclenche total_sales_count et les notifications)
+    UPDATE public.orders
+    SET status = 'delivered'
+    WHERE id = ANY(v_settled);
+
+    -- 4. Un seul incrément par wallet
+    WITH credits AS (
+        SELECT seller_id AS profile_id, amount - COALESCE(commission_amount, 0) AS credit
+        FROM public.orders
+        WHERE id = ANY(v_settled)
+        UNION ALL
+        SELECT affiliate_id, commission_amount
+        FROM public.orders
+        WHERE id = ANY(v_settled) AND affiliate_id IS NOT NULL AND commission_amount > 0
+    ),
+    grouped AS (
+        SELECT profile_id, SUM(credit) AS credit
+        FROM credits
+        GROUP BY profile_id
+    ),
+    updated AS (
+        UPDATE public.profiles p
+        SET wallet_balance = COALESCE(p.wallet_balance, 0) + g.credit
+        FROM grouped g
+        WHERE p.id = g.profile_id
+        RETURNING p.id, p.wallet_balance
+    )
+    SELECT jsonb_object_agg(id, wallet_balance) INTO v_balances FROM updated;
+
+    -- 5. Transactions achat / vente / commission en un seul INSERT.
+    -- balance_after suit le solde courant de chaque compte dans l'ordre de la liste.
+    WITH settled AS (
+        SELECT o.*, s.position,
+               COALESCE(p.name, 'Produit') AS product_label, p.image_url AS product_image,
+               COALESCE(p.default_commission, 0) AS rate,
+               COALESCE(o.commission_amount, 0) AS commission,
+               COALESCE(o.quantity, 1) AS qty
+        FROM unnest(v_settled) WITH ORDINALITY AS s(id, position)
+        JOIN public.orders o ON o.id = s.id
+        LEFT JOIN public.products p ON p.id = o.product_id
+    ),
+    entries AS (
+        SELECT buyer_id AS user_id, 'purchase' AS type, -amount AS amount, 0 AS credit, id AS order_id,
+               product_label, product_image, qty, amount / qty AS unit_price, NULL::DECIMAL AS rate,
+               'Achat de ' || qty || 'x ' || product_label AS description, position, 1 AS kind
+        FROM settled
+        WHERE buyer_id IS NOT NULL
+        UNION ALL
+        SELECT seller_id, 'sale', amount - commission, amount - commission, id,
+               product_label, product_image, qty, amount / qty, NULL,
+               'Vente de ' || qty || 'x ' || product_label
+                   || CASE WHEN commission > 0 THEN ' (Commission: -' || commission || ' FCFA)' ELSE '' END,
+               position, 2
+        FROM settled
+        UNION ALL
+        SELECT affiliate_id, 'commission', commission, commission, id,
+               product_label, NULL, NULL, NULL, rate,
+               'Commission ' || rate || '% sur vente de ' || amount || ' FCFA',
+               position, 3
+        FROM settled
+        WHERE affiliate_id IS NOT NULL AND commission > 0
+    ),
+    ledger AS (
+        SELECT e.*,
+               SUM(credit) OVER (PARTITION BY user_id ORDER BY position, kind ROWS UNBOUNDED PRECEDING) AS running,
+               SUM(credit) OVER (PARTITION BY user_id) AS total
+        FROM entries e
+    )
+    INSERT INTO public.transactions (
+        user_id, type, amount, balance_after, order_id,
+        product_name, product_image, quantity, unit_price, commission_rate, description
+    )
+    SELECT l.user_id, l.type, l.amount, COALESCE(pr.wallet_balance, 0) - l.total + l.running, l.order_id,
+           l.product_label, l.product_image, l.qty, l.unit_price, l.rate, l.description
+    FROM ledger l
+    JOIN public.profiles pr ON pr.id = l.user_id
+    ORDER BY l.position, l.kind;
+
+    RETURN jsonb_build_object(
+        'success', true,
+        'settled', array_length(v_settled, 1),
+        'results', v_results,
+        'balances', COALESCE(v_balances, '{}'::JSONB)
+    );
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Permission d'exécution
+REVOKE EXECUTE ON FUNCTION public.settle_order_deliveries(JSONB) FROM PUBLIC, anon;
+GRANT EXECUTE ON FUNCTION public.settle_order_deliveries TO authenticated;
+GRANT EXECUTE ON FUNCTION public.settle_order_deliveries TO service_role;
@@ -0,0 +1,110 @@
+-- Migration : Compteurs de commandes matérialisés par (utilisateur, rôle)
+-- Description : getOrderCounts téléchargeait toutes les commandes de l'utilisateur pour les compter
+-- en JavaScript. La table order_counters est tenue à jour par trigger (insertion, changement de
+-- statut / montant / participants, suppression) et se lit en une ligne.
+
+CREATE TABLE IF NOT EXISTS public.order_counters (
+    user_id UUID NOT NULL REFERENCES public.profiles(id) ON DELETE CASCADE,
+    role TEXT NOT NULL CHECK (role IN ('buyer', 'seller', 'affiliate')),
+    all_count INTEGER NOT NULL DEFAULT 0,
+    pending_count INTEGER NOT NULL DEFAULT 0,
+    paid_count INTEGER NOT NULL DEFAULT 0,
+    shipped_count INTEGER NOT NULL DEFAULT 0,
+    delivered_count INTEGER NOT NULL DEFAULT 0,
+    cancelled_count INTEGER NOT NULL DEFAULT 0,
+    total_revenue DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (user_id, role)
+);
+
+ALTER TABLE public.order_counters ENABLE ROW LEVEL SECURITY;
+
+-- Chacun ne voit que ses compteurs ; seules les fonctions ci-dessous écrivent
+CREATE POLICY "Users can view own order counters"
+ON public.order_counters
+FOR SELECT
+USING (auth.uid() = user_id);
+
+-- Ajoute (p_sign = 1) ou retire (p_sign = -1) la contribution d'une commande aux trois participants
+CREATE OR REPLACE FUNCTION public.apply_order_counters(p_order public.orders, p_sign INTEGER)
+RETURNS VOID AS $$
+DECLARE
+    v_revenue DECIMAL(14, 2);
+BEGIN
+    v_revenue := CASE WHEN p_order.status IN ('paid', 'shipped', 'delivered')
+                      THEN p_sign * COALESCE(p_order.amount, 0) ELSE 0 END;
+
+    INSERT INTO public.order_counters AS c (
+        user_id, role, all_count, pending_count, paid_count, shipped_count,
+        delivered_count, cancelled_count, total_revenue
+    )
+    SELECT participant.user_id, participant.role, p_sign,
+           CASE WHEN p_order.status = 'pending' THEN p_sign ELSE 0 END,
+           CASE WHEN p_order.status = 'paid' THEN p_sign ELSE 0 END,
+           CASE WHEN p_order.status = 'shipped' THEN p_sign ELSE 0 END,
+           CASE WHEN p_order.status = 'delivered' THEN p_sign ELSE 0 END,
+           CASE WHEN p_order.status = 'cancelled' THEN p_sign ELSE 0 END,
+           v_revenue
+    FROM (VALUES
+        (p_order.buyer_id, 'buyer'),
+        (p_order.seller_id, 'seller'),
+        (p_order.affiliate_id, 'affiliate')
+    ) AS participant(user_id, role)
+    WHERE participant.user_id IS NOT NULL
+    ON CONFLICT (user_id, role) DO UPDATE SET
+        all_count = c.all_count + EXCLUDED.all_count,
+        pending_count = c.pending_count + EXCLUDED.pending_count,
+        paid_count = c.paid_count + EXCLUDED.paid_count,
+        shipped_count = c.shipped_count + EXCLUDED.shipped_count,
+        delivered_count = c.delivered_count + EXCLUDED.delivered_count,
+        cancelled_count = c.cancelled_count + EXCLUDED.cancelled_count,
+        total_revenue = c.total_revenue + EXCLUDED.total_revenue,
+        updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION public.sync_order_counters()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM public.apply_order_counters(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM public.apply_order_counters(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Réservées au trigger : un appel direct via /rpc pourrait réécrire les compteurs de n'importe qui
+REVOKE EXECUTE ON FUNCTION public.apply_order_counters(public.orders, INTEGER) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.sync_order_counters() FROM PUBLIC, anon, authenticated;
+
+DROP TRIGGER IF EXISTS on_order_counters_change ON public.orders;
+CREATE TRIGGER on_order_counters_change
+AFTER INSERT OR DELETE OR UPDATE OF status, amount, buyer_id, seller_id, affiliate_id ON public.orders
+FOR EACH ROW
+EXECUTE FUNCTION public.sync_order_counters();
+
+-- Remplissage initial à partir des commandes existantes
+TRUNCATE public.order_counters;
+INSERT INTO public.order_counters (
+    user_id, role, all_count, pending_count, paid_count, shipped_count,
+    delivered_count, cancelled_count, total_revenue
+)
+SELECT participant.user_id, participant.role,
+       COUNT(*),
+       COUNT(*) FILTER (WHERE o.status = 'pending'),
+       COUNT(*) FILTER (WHERE o.status = 'paid'),
+       COUNT(*) FILTER (WHERE o.status = 'shipped'),
+       COUNT(*) FILTER (WHERE o.status = 'delivered'),
+       COUNT(*) FILTER (WHERE o.status = 'cancelled'),
+       COALESCE(SUM(o.amount) FILTER (WHERE o.status IN ('paid', 'shipped', 'delivered')), 0)
+FROM public.orders o
+CROSS JOIN LATERAL (VALUES
+    (o.buyer_id, 'buyer'),
+    (o.seller_id, 'seller'),
+    (o.affiliate_id, 'affiliate')
+) AS participant(user_id, role)
+WHERE participant.user_id IS NOT NULL
+GROUP BY participant.user_id, participant.role;
@@ -0,0 +1,252 @@
+-- Migration : Statistiques admin pré-agrégées
+-- Description : useAdminStats enchaînait neuf requêtes, dont le téléchargement de toutes les
+-- commandes livrées et de tous les retraits en attente. Les agrégats sont désormais tenus dans
+-- deux tables rafraîchies périodiquement (pg_cron si disponible, sinon à la lecture quand elles
+-- sont trop anciennes) et servis par une seule RPC. Les séries jour / semaine / mois se calculent
+-- sur le cumul quotidien sans parcourir orders. Un trigger sur orders note les jours modifiés :
+-- une commande ancienne livrée ou remboursée tardivement est recomptée au rafraîchissement
+-- suivant, même sans la reconstruction nocturne de pg_cron.
+
+-- 1. Cumul quotidien (jour de création de la commande, comme l'ancien « livrées aujourd'hui »)
+CREATE TABLE IF NOT EXISTS public.admin_daily_stats (
+    day DATE PRIMARY KEY,
+    gmv DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    commissions DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    delivered_orders INTEGER NOT NULL DEFAULT 0,
+    created_orders INTEGER NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- 2. Instantané des compteurs globaux (une seule ligne)
+CREATE TABLE IF NOT EXISTS public.admin_stats_snapshot (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    total_sellers INTEGER NOT NULL DEFAULT 0,
+    verified_sellers INTEGER NOT NULL DEFAULT 0,
+    total_affiliates INTEGER NOT NULL DEFAULT 0,
+    total_buyers INTEGER NOT NULL DEFAULT 0,
+    total_products INTEGER NOT NULL DEFAULT 0,
+    active_orders INTEGER NOT NULL DEFAULT 0,
+    pending_withdrawals INTEGER NOT NULL DEFAULT 0,
+    pending_withdrawal_amount DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- 3. Jours dont les commandes ont changé depuis le dernier rafraîchissement
+CREATE TABLE IF NOT EXISTS public.admin_stats_dirty_days (
+    day DATE PRIMARY KEY
+);
+
+-- Lecture uniquement via les RPC ci-dessous (SECURITY DEFINER)
+ALTER TABLE public.admin_daily_stats ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.admin_stats_snapshot ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.admin_stats_dirty_days ENABLE ROW LEVEL SECURITY;
+
+CREATE OR REPLACE FUNCTION public.mark_admin_stats_dirty()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        INSERT INTO public.admin_stats_dirty_days (day) VALUES (OLD.created_at::DATE) ON CONFLICT DO NOTHING;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        INSERT INTO public.admin_stats_dirty_days (day) VALUES (NEW.created_at::DATE) ON CONFLICT DO NOTHING;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS on_order_admin_stats_dirty ON public.orders;
+CREATE TRIGGER on_order_admin_stats_dirty
+AFTER INSERT OR DELETE OR UPDATE OF status, amount, commission_amount, created_at ON public.orders
+FOR EACH ROW
+EXECUTE FUNCTION public.mark_admin_stats_dirty();
+
+CREATE INDEX IF NOT EXISTS idx_orders_created_at ON public.orders(created_at);
+
+-- 4. Rafraîchissement : les commandes créées ces p_days derniers jours (NULL = tout l'historique)
+-- et celles des jours marqués par le trigger, + l'instantané. 35 jours couvrent le cycle de vie
+-- d'une commande (expédition en 7 jours, échéances).
+CREATE OR REPLACE FUNCTION public.refresh_admin_stats(p_days INTEGER DEFAULT 35)
+RETURNS VOID AS $$
+DECLARE
+    v_since DATE;
+    v_dirty DATE[];
+BEGIN
+    v_since := CASE WHEN p_days IS NULL THEN '-infinity'::DATE ELSE CURRENT_DATE - p_days END;
+
+    WITH cleared AS (
+        DELETE FROM public.admin_stats_dirty_days RETURNING day
+    )
+    SELECT COALESCE(array_agg(day), '{}') INTO v_dirty FROM cleared;
+
+    -- Un jour dont toutes les commandes ont disparu ne doit pas garder ses anciens totaux
+    DELETE FROM public.admin_daily_stats
+    WHERE day = ANY(v_dirty)
+      AND NOT EXISTS (
+          SELECT 1 FROM public.orders
+          WHERE created_at >= admin_daily_stats.day AND created_at < admin_daily_stats.day + 1
+      );
+
+    INSERT INTO public.admin_daily_stats AS s (day, gmv, commissions, delivered_orders, created_orders, refreshed_at)
+    SELECT o.created_at::DATE,
+           COALESCE(SUM(o.amount) FILTER (WHERE o.status = 'delivered'), 0),
+           COALESCE(SUM(o.commission_amount) FILTER (WHERE o.status = 'delivered'), 0),
+           COUNT(*) FILTER (WHERE o.status = 'delivered'),
+           COUNT(*),
+           NOW()
+    FROM (
+        SELECT created_at, amount, commission_amount, status
+        FROM public.orders
+        WHERE created_at >= v_since
+        UNION ALL
+        -- Jours plus anciens modifiés depuis : lus par plage pour rester sur idx_orders_created_at
+        SELECT o.created_at, o.amount, o.commission_amount, o.status
+        FROM unnest(v_dirty) AS d(day)
+        JOIN public.orders o ON o.created_at >= d.day AND o.created_at < d.day + 1
+        WHERE d.day < v_since
+    ) AS o
+    GROUP BY o.created_at::DATE
+    ON CONFLICT (day) DO UPDATE SET
+        gmv = EXCLUDED.gmv,
+        commissions = EXCLUDED.commissions,
+        delivered_orders = EXCLUDED.delivered_orders,
+        created_orders = EXCLUDED.created_orders,
+        refreshed_at = EXCLUDED.refreshed_at;
+
+    INSERT INTO public.admin_stats_snapshot AS s (
+        id, total_sellers, verified_sellers, total_affiliates, total_buyers, total_products,
+        active_orders, pending_withdrawals, pending_withdrawal_amount, refreshed_at
+    )
+    SELECT 1,
+           (SELECT COUNT(*) FROM public.profiles WHERE role = 'seller'),
+           (SELECT COUNT(*) FROM public.profiles WHERE role = 'seller' AND kyc_verified = true),
+           (SELECT COUNT(*) FROM public.profiles WHERE role = 'affiliate'),
+           (SELECT COUNT(*) FROM public.profiles WHERE role = 'buyer'),
+           (SELECT COUNT(*) FROM public.products),
+           (SELECT COUNT(*) FROM public.orders WHERE status IN ('pending', 'processing', 'shipped')),
+           w.pending_count,
+           w.pending_amount,
+           NOW()
+    FROM (
+        SELECT COUNT(*) AS pending_count, COALESCE(SUM(amount), 0) AS pending_amount
+        FROM public.transactions
+        WHERE type = 'withdrawal' AND status = 'pending'
+    ) AS w
+    ON CONFLICT (id) DO UPDATE SET
+        total_sellers = EXCLUDED.total_sellers,
+        verified_sellers = EXCLUDED.verified_sellers,
+        total_affiliates = EXCLUDED.total_affiliates,
+        total_buyers = EXCLUDED.total_buyers,
+        total_products = EXCLUDED.total_products,
+        active_orders = EXCLUDED.active_orders,
+        pending_withdrawals = EXCLUDED.pending_withdrawals,
+        pending_withdrawal_amount = EXCLUDED.pending_withdrawal_amount,
+        refreshed_at = EXCLUDED.refreshed_at;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Admin : le service_role ou un profil admin. Une requête anon (sans uid) ne l'est jamais.
+CREATE OR REPLACE FUNCTION public.is_admin()
+RETURNS BOOLEAN AS $$
+    SELECT auth.role() IS NOT DISTINCT FROM 'service_role'
+        OR EXISTS (SELECT 1 FROM public.profiles WHERE id = auth.uid() AND role = 'admin');
+$$ LANGUAGE sql STABLE SECURITY DEFINER;
+
+-- 5. Statistiques de la vue d'ensemble en un seul appel
+CREATE OR REPLACE FUNCTION public.get_admin_stats(p_max_age_seconds INTEGER DEFAULT 300)
+RETURNS JSONB AS $$
+DECLARE
+    v_snapshot RECORD;
+    v_totals RECORD;
+BEGIN
+    IF NOT public.is_admin() THEN
+        RAISE EXCEPTION 'Accès réservé aux administrateurs';
+    END IF;
+
+    -- Sans pg_cron (ou si le job a du retard), on rafraîchit ici les derniers jours et les jours marqués
+    SELECT * INTO v_snapshot FROM public.admin_stats_snapshot WHERE id = 1;
+    IF NOT FOUND OR v_snapshot.refreshed_at < NOW() - make_interval(secs => p_max_age_seconds) THEN
+        PERFORM public.refresh_admin_stats();
+        SELECT * INTO v_snapshot FROM public.admin_stats_snapshot WHERE id = 1;
+    END IF;
+
+    SELECT COALESCE(SUM(gmv), 0) AS gmv,
+           COALESCE(SUM(commissions), 0) AS commissions,
+           COALESCE(SUM(delivered_orders), 0) AS delivered_orders,
+           COALESCE(SUM(delivered_orders) FILTER (WHERE day = CURRENT_DATE), 0) AS completed_today
+    INTO v_totals
+    FROM public.admin_daily_stats;
+
+    RETURN jsonb_build_object(
+        'total_gmv', v_totals.gmv,
+        'total_commissions', v_totals.commissions,
+        'total_orders', v_totals.delivered_orders,
+        'completed_today', v_totals.completed_today,
+        'total_sellers', v_snapshot.total_sellers,
+        'verified_sellers', v_snapshot.verified_sellers,
+        'total_affiliates', v_snapshot.total_affiliates,
+        'total_buyers', v_snapshot.total_buyers,
+        'total_products', v_snapshot.total_products,
+        'active_orders', v_snapshot.active_orders,
+        'pending_withdrawals', v_snapshot.pending_withdrawals,
+        'pending_withdrawal_amount', v_snapshot.pending_withdrawal_amount,
+        'refreshed_at', v_snapshot.refreshed_at
+    );
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- 6. Séries temporelles (p_bucket : 'day', 'week' ou 'month')
+CREATE OR REPLACE FUNCTION public.get_admin_stats_series(
+    p_bucket TEXT DEFAULT 'day',
+    p_from DATE DEFAULT CURRENT_DATE - 30,
+    p_to DATE DEFAULT CURRENT_DATE
+)
+RETURNS TABLE (
+    bucket DATE,
+    gmv DECIMAL,
+    commissions DECIMAL,
+    delivered_orders BIGINT,
+    created_orders BIGINT
+) AS $$
+BEGIN
+    IF NOT public.is_admin() THEN
+        RAISE EXCEPTION 'Accès réservé aux administrateurs';
+    END IF;
+    IF p_bucket NOT IN ('day', 'week', 'month') THEN
+        RAISE EXCEPTION 'Unknown bucket: %', p_bucket;
+    END IF;
+
+    RETURN QUERY
+    SELECT date_trunc(p_bucket, s.day)::DATE,
+           SUM(s.gmv),
+           SUM(s.commissions),
+           SUM(s.delivered_orders)::BIGINT,
+           SUM(s.created_orders)::BIGINT
+    FROM public.admin_daily_stats s
+    WHERE s.day BETWEEN p_from AND p_to
+    GROUP BY 1
+    ORDER BY 1;
+END;
+$$ LANGUAGE plpgsql STABLE SECURITY DEFINER;
+
+-- Permission d'exécution (PUBLIC reçoit EXECUTE par défaut : on le retire explicitement)
+REVOKE EXECUTE ON FUNCTION public.get_admin_stats(INTEGER) FROM PUBLIC, anon;
+REVOKE EXECUTE ON FUNCTION public.get_admin_stats_series(TEXT, DATE, DATE) FROM PUBLIC, anon;
+REVOKE EXECUTE ON FUNCTION public.refresh_admin_stats(INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.get_admin_stats TO authenticated;
+GRANT EXECUTE ON FUNCTION public.get_admin_stats_series TO authenticated;
+GRANT EXECUTE ON FUNCTION public.get_admin_stats TO service_role;
+GRANT EXECUTE ON FUNCTION public.get_admin_stats_series TO service_role;
+GRANT EXECUTE ON FUNCTION public.refresh_admin_stats TO service_role;
+
+-- Remplissage initial
+SELECT public.refresh_admin_stats(NULL);
+
+-- Quand pg_cron est installé : récent toutes les 5 minutes, historique complet chaque nuit
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+        PERFORM cron.schedule('refresh-admin-stats', '*/5 * * * *', 'SELECT public.refresh_admin_stats()');
+        PERFORM cron.schedule('refresh-admin-stats-full', '0 3 * * *', 'SELECT public.refresh_admin_stats(NULL)');
+    END IF;
+END;
+$$;
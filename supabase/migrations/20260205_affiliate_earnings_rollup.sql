@@ -0,0 +1,178 @@
+-- Migration : Gains affiliés agrégés par (affilié, produit)
+-- Description : useAffiliateStats téléchargeait deux fois les commandes livrées et les commandes
+-- en cours pour les regrouper en JavaScript. affiliate_product_earnings est tenue à jour par
+-- trigger sur orders et get_affiliate_stats renvoie totaux + ventes par produit triées et paginées.
+
+CREATE TABLE IF NOT EXISTS public.affiliate_product_earnings (
+    affiliate_id UUID NOT NULL REFERENCES public.profiles(id) ON DELETE CASCADE,
+    product_id UUID NOT NULL REFERENCES public.products(id) ON DELETE CASCADE,
+    sales_count INTEGER NOT NULL DEFAULT 0,
+    total_earned DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    pending_count INTEGER NOT NULL DEFAULT 0,
+    pending_earnings DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    last_sale TIMESTAMPTZ,
+    PRIMARY KEY (affiliate_id, product_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_affiliate_product_earnings_ranking
+ON public.affiliate_product_earnings(affiliate_id, total_earned DESC, product_id);
+
+CREATE INDEX IF NOT EXISTS idx_orders_affiliate_product
+ON public.orders(affiliate_id, product_id, status)
+WHERE affiliate_id IS NOT NULL;
+
+ALTER TABLE public.affiliate_product_earnings ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Affiliates can view own earnings"
+ON public.affiliate_product_earnings
+FOR SELECT
+USING (auth.uid() = affiliate_id);
+
+-- Ajoute (p_sign = 1) ou retire (p_sign = -1) la contribution d'une commande
+CREATE OR REPLACE FUNCTION public.apply_affiliate_earnings(p_order public.orders, p_sign INTEGER)
+RETURNS VOID AS $$
+DECLARE
+    v_delivered BOOLEAN;
+    v_pending BOOLEAN;
+    v_commission DECIMAL(14, 2);
+BEGIN
+    v_delivered := p_order.status = 'delivered';
+    v_pending := p_order.status IN ('paid', 'shipped');
+    IF p_order.affiliate_id IS NULL OR p_order.product_id IS NULL OR NOT (v_delivered OR v_pending) THEN
+        RETURN;
+    END IF;
+    v_commission := COALESCE(p_order.commission_amount, 0);
+
+    INSERT INTO public.affiliate_product_earnings AS e (
+        affiliate_id, product_id, sales_count, total_earned, pending_count, pending_earnings, last_sale
+    ) VALUES (
+        p_order.affiliate_id, p_order.product_id,
+        CASE WHEN v_delivered THEN p_sign ELSE 0 END,
+        CASE WHEN v_delivered THEN p_sign * v_commission ELSE 0 END,
+        CASE WHEN v_pending THEN p_sign ELSE 0 END,
+        CASE WHEN v_pending THEN p_sign * v_commission ELSE 0 END,
+        CASE WHEN v_delivered AND p_sign > 0 THEN p_order.created_at END
+    )
+    ON CONFLICT (affiliate_id, product_id) DO UPDATE SET
+        sales_count = e.sales_count + EXCLUDED.sales_count,
+        total_earned = e.total_earned + EXCLUDED.total_earned,
+        pending_count = e.pending_count + EXCLUDED.pending_count,
+        pending_earnings = e.pending_earnings + EXCLUDED.pending_earnings,
+        last_sale = GREATEST(e.last_sale, EXCLUDED.last_sale);
+
+    -- La dernière vente ne se décrémente pas : on la recalcule seulement si c'était elle
+    IF v_delivered AND p_sign < 0 THEN
+        UPDATE public.affiliate_product_earnings e
+        SET last_sale = (
+            SELECT MAX(o.created_at)
+            FROM public.orders o
+            WHERE o.affiliate_id = p_order.affiliate_id
+              AND o.product_id = p_order.product_id
+              AND o.status = 'delivered'
+              AND o.id <> p_order.id
+        )
+        WHERE e.affiliate_id = p_order.affiliate_id
+          AND e.product_id = p_order.product_id
+          AND e.last_sale <= p_order.created_at;
+    END IF;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION public.sync_affiliate_earnings()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM public.apply_affiliate_earnings(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM public.apply_affiliate_earnings(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Réservées au trigger : un appel direct via /rpc pourrait gonfler les gains de n'importe quel affilié
+REVOKE EXECUTE ON FUNCTION public.apply_affiliate_earnings(public.orders, INTEGER) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.sync_affiliate_earnings() FROM PUBLIC, anon, authenticated;
+
+DROP TRIGGER IF EXISTS on_affiliate_earnings_change ON public.orders;
+CREATE TRIGGER on_affiliate_earnings_change
+AFTER INSERT OR DELETE OR UPDATE OF status, commission_amount, affiliate_id, product_id ON public.orders
+FOR EACH ROW
+EXECUTE FUNCTION public.sync_affiliate_earnings();
+
+-- Remplissage initial
+TRUNCATE public.affiliate_product_earnings;
+INSERT INTO public.affiliate_product_earnings (
+    affiliate_id, product_id, sales_count, total_earned, pending_count, pending_earnings, last_sale
+)
+SELECT affiliate_id, product_id,
+       COUNT(*) FILTER (WHERE status = 'delivered'),
+       COALESCE(SUM(commission_amount) FILTER (WHERE status = 'delivered'), 0),
+       COUNT(*) FILTER (WHERE status IN ('paid', 'shipped')),
+       COALESCE(SUM(commission_amount) FILTER (WHERE status IN ('paid', 'shipped')), 0),
+       MAX(created_at) FILTER (WHERE status = 'delivered')
+FROM public.orders
+WHERE affiliate_id IS NOT NULL
+  AND product_id IS NOT NULL
+  AND status IN ('paid', 'shipped', 'delivered')
+GROUP BY affiliate_id, product_id;
+
+-- Statistiques du tableau de bord affilié : totaux + une page de ventes par produit
+CREATE OR REPLACE FUNCTION public.get_affiliate_stats(
+    p_affiliate_id UUID,
+    p_limit INTEGER DEFAULT 20,
+    p_offset INTEGER DEFAULT 0
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_totals RECORD;
+    v_sales JSONB;
+BEGIN
+    -- L'affilié lui-même, un admin ou le service_role (is_admin() ne compte jamais anon)
+    IF auth.uid() IS DISTINCT FROM p_affiliate_id AND NOT public.is_admin() THEN
+        RAISE EXCEPTION 'Not allowed';
+    END IF;
+
+    SELECT COALESCE(SUM(total_earned), 0) AS total_earned,
+           COALESCE(SUM(pending_earnings), 0) AS pending_earnings,
+           COALESCE(SUM(sales_count), 0) AS sales_count,
+           COALESCE(SUM(pending_count), 0) AS pending_sales_count,
+           COUNT(*) FILTER (WHERE sales_count > 0) AS product_count
+    INTO v_totals
+    FROM public.affiliate_product_earnings
+    WHERE affiliate_id = p_affiliate_id;
+
+    SELECT COALESCE(jsonb_agg(page ORDER BY page.total_earned DESC, page.product_id), '[]'::JSONB)
+    INTO v_sales
+    FROM (
+        SELECT e.product_id,
+               COALESCE(p.name, 'Produit') AS product_name,
+               COALESCE(p.image_url, '') AS product_image,
+               COALESCE(p.price, 0) AS product_price,
+               e.sales_count,
+               e.total_earned,
+               e.last_sale
+        FROM public.affiliate_product_earnings e
+        LEFT JOIN public.products p ON p.id = e.product_id
+        WHERE e.affiliate_id = p_affiliate_id
+          AND e.sales_count > 0
+        ORDER BY e.total_earned DESC, e.product_id
+        LIMIT p_limit OFFSET p_offset
+    ) AS page;
+
+    RETURN jsonb_build_object(
+        'total_earned', v_totals.total_earned,
+        'pending_earnings', v_totals.pending_earnings,
+        'sales_count', v_totals.sales_count,
+        'pending_sales_count', v_totals.pending_sales_count,
+        'product_count', v_totals.product_count,
+        'sales_by_product', v_sales
+    );
+END;
+$$ LANGUAGE plpgsql STABLE SECURITY DEFINER;
+
+-- Permission d'exécution (PUBLIC reçoit EXECUTE par défaut : on le retire explicitement)
+REVOKE EXECUTE ON FUNCTION public.get_affiliate_stats(UUID, INTEGER, INTEGER) FROM PUBLIC, anon;
+GRANT EXECUTE ON FUNCTION public.get_affiliate_stats TO authenticated;
+GRANT EXECUTE ON FUNCTION public.get_affiliate_stats TO service_role;
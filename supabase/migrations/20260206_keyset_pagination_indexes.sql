@@ -0,0 +1,42 @@
+-- Migration : Index composites pour la pagination par curseur
+-- Description : Les listes (commandes, produits, transactions) paginent désormais par curseur
+-- (colonne de tri, id) au lieu de .range() + count exact. Chaque tri a besoin d'un index qui
+-- couvre le filtre d'égalité, la colonne de tri puis id, pour que chaque page soit une simple
+-- lecture d'index à partir du curseur. Un index (price, id) sert aussi bien le tri croissant
+-- que décroissant (parcours inverse).
+
+-- Commandes : par rôle, triées par date
+CREATE INDEX IF NOT EXISTS idx_orders_buyer_keyset
+ON public.orders(buyer_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_orders_seller_keyset
+ON public.orders(seller_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_orders_affiliate_keyset
+ON public.orders(affiliate_id, created_at DESC, id DESC)
+WHERE affiliate_id IS NOT NULL;
+
+-- Produits : accueil (récents, prix), boutique et catégorie
+CREATE INDEX IF NOT EXISTS idx_products_created_keyset
+ON public.products(created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_products_price_keyset
+ON public.products(price, id);
+
+CREATE INDEX IF NOT EXISTS idx_products_seller_keyset
+ON public.products(seller_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_products_category_keyset
+ON public.products(category_id, created_at DESC, id DESC);
+
+-- Transactions : historique par utilisateur, avec ou sans filtre de type
+CREATE INDEX IF NOT EXISTS idx_transactions_user_keyset
+ON public.transactions(user_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_transactions_user_type_keyset
+ON public.transactions(user_id, type, created_at DESC, id DESC);
+
+-- Statistiques à jour pour que count=estimated reste proche de la réalité
+ANALYZE public.orders;
+ANALYZE public.products;
+ANALYZE public.transactions;
@@ -0,0 +1,166 @@
+-- Migration : Recherche produits plein texte + trigrammes
+-- Description : La recherche faisait un ilike('%terme%') sur le nom seul, sans index possible.
+-- search_vector (français, pondéré : nom > catégorie > boutique > description) est tenu à jour
+-- par trigger car il dépend de categories et profiles (une colonne GENERATED ne peut pas lire
+-- d'autres tables). pg_trgm sur le nom tolère les fautes de frappe. search_products classe les
+-- résultats, applique les filtres de l'accueil et pagine par curseur.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE public.products
+ADD COLUMN IF NOT EXISTS search_vector TSVECTOR;
+
+-- 1. Calcul du vecteur d'un produit
+CREATE OR REPLACE FUNCTION public.product_search_vector(
+    p_name TEXT,
+    p_description TEXT,
+    p_category_id UUID,
+    p_seller_id UUID
+)
+RETURNS TSVECTOR AS $$
+    SELECT setweight(to_tsvector('french', COALESCE(p_name, '')), 'A')
+        || setweight(to_tsvector('french', COALESCE((SELECT name FROM public.categories WHERE id = p_category_id), '')), 'B')
+        || setweight(to_tsvector('french', COALESCE(
+               (SELECT COALESCE(store_name, full_name) FROM public.profiles WHERE id = p_seller_id), '')), 'C')
+        || setweight(to_tsvector('french', COALESCE(p_description, '')), 'D');
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION public.sync_product_search_vector()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.search_vector := public.product_search_vector(NEW.name, NEW.description, NEW.category_id, NEW.seller_id);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS on_product_search_vector ON public.products;
+CREATE TRIGGER on_product_search_vector
+BEFORE INSERT OR UPDATE OF name, description, category_id, seller_id ON public.products
+FOR EACH ROW
+EXECUTE FUNCTION public.sync_product_search_vector();
+
+-- Renommer une catégorie ou une boutique met à jour les produits concernés
+CREATE OR REPLACE FUNCTION public.refresh_products_search_vector()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'categories' THEN
+        UPDATE public.products
+        SET search_vector = public.product_search_vector(name, description, category_id, seller_id)
+        WHERE category_id = NEW.id;
+    ELSE
+        UPDATE public.products
+        SET search_vector = public.product_search_vector(name, description, category_id, seller_id)
+        WHERE seller_id = NEW.id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS on_category_search_vector ON public.categories;
+CREATE TRIGGER on_category_search_vector
+AFTER UPDATE OF name ON public.categories
+FOR EACH ROW
+WHEN (OLD.name IS DISTINCT FROM NEW.name)
+EXECUTE FUNCTION public.refresh_products_search_vector();
+
+DROP TRIGGER IF EXISTS on_store_search_vector ON public.profiles;
+CREATE TRIGGER on_store_search_vector
+AFTER UPDATE OF store_name, full_name ON public.profiles
+FOR EACH ROW
+WHEN (OLD.store_name IS DISTINCT FROM NEW.store_name OR OLD.full_name IS DISTINCT FROM NEW.full_name)
+EXECUTE FUNCTION public.refresh_products_search_vector();
+
+-- Remplissage initial
+UPDATE public.products
+SET search_vector = public.product_search_vector(name, description, category_id, seller_id);
+
+-- 2. Index
+CREATE INDEX IF NOT EXISTS idx_products_search_vector ON public.products USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_products_name_trgm ON public.products USING GIN (name gin_trgm_ops);
+
+-- 3. Recherche classée avec les filtres de l'accueil.
+-- p_sort : 'relevance' (score), 'newest', 'price_asc', 'price_desc'.
+-- Curseur : (p_after_value, p_after_id) = (valeur de tri, id) du dernier produit reçu.
+CREATE OR REPLACE FUNCTION public.search_products(
+    p_query TEXT,
+    p_categories UUID[] DEFAULT NULL,
+    p_verified_only BOOLEAN DEFAULT false,
+    p_moq_one BOOLEAN DEFAULT false,
+    p_promo_only BOOLEAN DEFAULT false,
+    p_seller_id UUID DEFAULT NULL,
+    p_sort TEXT DEFAULT 'relevance',
+    p_limit INTEGER DEFAULT 20,
+    p_offset INTEGER DEFAULT 0,
+    p_after_value TEXT DEFAULT NULL,
+    p_after_id UUID DEFAULT NULL
+)
+RETURNS TABLE (
+    id UUID,
+    seller_id UUID,
+    name TEXT,
+    description TEXT,
+    price DECIMAL,
+    original_price DECIMAL,
+    min_order_quantity INTEGER,
+    stock_quantity INTEGER,
+    default_commission DECIMAL,
+    is_affiliate_enabled BOOLEAN,
+    image_url TEXT,
+    images_url TEXT[],
+    category_id UUID,
+    city_id UUID,
+    average_rating DECIMAL,
+    total_reviews INTEGER,
+    created_at TIMESTAMPTZ,
+    profiles JSONB,
+    categories JSONB,
+    search_rank NUMERIC
+) AS $$
+#variable_conflict use_column
+DECLARE
+    v_query TSQUERY := websearch_to_tsquery('french', p_query);
+    v_term TEXT := trim(p_query);
+BEGIN
+    RETURN QUERY
+    WITH matches AS (
+        SELECT p.*,
+               round((ts_rank_cd(p.search_vector, v_query, 32) + word_similarity(v_term, p.name))::NUMERIC, 6) AS rank
+        FROM public.products p
+        WHERE (p.search_vector @@ v_query OR v_term <% p.name OR p.name ILIKE '%' || v_term || '%')
+          AND (p_categories IS NULL OR cardinality(p_categories) = 0 OR p.category_id = ANY(p_categories))
+          AND (NOT p_moq_one OR p.min_order_quantity = 1)
+          AND (NOT p_promo_only OR p.original_price IS NOT NULL)
+          AND (p_seller_id IS NULL OR p.seller_id = p_seller_id)
+    )
+    SELECT m.id, m.seller_id, m.name, m.description, m.price, m.original_price, m.min_order_quantity,
+           m.stock_quantity, m.default_commission, m.is_affiliate_enabled, m.image_url, m.images_url,
+           m.category_id, m.city_id, m.average_rating, m.total_reviews, m.created_at::TIMESTAMPTZ,
+           jsonb_build_object(
+               'id', s.id, 'full_name', s.full_name, 'is_verified_seller', s.is_verified_seller,
+               'avatar_url', s.avatar_url, 'store_name', s.store_name,
+               'total_sales_count', s.total_sales_count, 'average_rating', s.average_rating
+           ),
+           CASE WHEN c.id IS NULL THEN NULL ELSE jsonb_build_object('id', c.id, 'name', c.name, 'icon', c.icon) END,
+           m.rank
+    FROM matches m
+    LEFT JOIN public.profiles s ON s.id = m.seller_id
+    LEFT JOIN public.categories c ON c.id = m.category_id
+    WHERE (NOT p_verified_only OR s.is_verified_seller = true)
+      AND (p_after_id IS NULL OR CASE p_sort
+            WHEN 'price_asc' THEN (m.price, m.id) > (p_after_value::DECIMAL, p_after_id)
+            WHEN 'price_desc' THEN (m.price, m.id) < (p_after_value::DECIMAL, p_after_id)
+            WHEN 'newest' THEN (m.created_at::TIMESTAMPTZ, m.id) < (p_after_value::TIMESTAMPTZ, p_after_id)
+            ELSE (m.rank, m.id) < (p_after_value::NUMERIC, p_after_id)
+          END)
+    ORDER BY
+        CASE WHEN p_sort = 'price_asc' THEN m.price END ASC,
+        CASE WHEN p_sort = 'price_desc' THEN m.price END DESC,
+        CASE WHEN p_sort = 'newest' THEN m.created_at END DESC,
+        CASE WHEN p_sort NOT IN ('price_asc', 'price_desc', 'newest') THEN m.rank END DESC,
+        CASE WHEN p_sort = 'price_asc' THEN m.id END ASC,
+        CASE WHEN p_sort <> 'price_asc' THEN m.id END DESC
+    LIMIT p_limit OFFSET p_offset;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+GRANT EXECUTE ON FUNCTION public.search_products TO anon, authenticated;
@@ -0,0 +1,160 @@
+-- Migration : Filtres vendeur vérifié / ville dénormalisés sur products
+-- Description : Le filtre verifiedOnly passait par l'embed profiles (PostgREST ne fait alors que
+-- vider l'embed) puis était appliqué côté client : pages incomplètes et count faux.
+-- seller_is_verified et listing_city_id (ville du produit, sinon celle du vendeur) sont recopiés
+-- sur chaque produit par trigger et indexés, pour filtrer avant la pagination.
+
+ALTER TABLE public.products
+ADD COLUMN IF NOT EXISTS seller_is_verified BOOLEAN NOT NULL DEFAULT false,
+ADD COLUMN IF NOT EXISTS listing_city_id UUID REFERENCES public.cities(id) ON DELETE SET NULL;
+
+-- 1. À l'écriture d'un produit : recopier l'état du vendeur
+CREATE OR REPLACE FUNCTION public.sync_product_seller_fields()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_seller RECORD;
+BEGIN
+    SELECT is_verified_seller, city_id INTO v_seller
+    FROM public.profiles
+    WHERE id = NEW.seller_id;
+
+    NEW.seller_is_verified := COALESCE(v_seller.is_verified_seller, false);
+    NEW.listing_city_id := COALESCE(NEW.city_id, v_seller.city_id);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Les colonnes recopiées font partie de la liste : un vendeur qui écrit lui-même
+-- seller_is_verified ou listing_city_id sur son produit voit sa valeur écrasée par celle du profil
+DROP TRIGGER IF EXISTS on_product_seller_fields ON public.products;
+CREATE TRIGGER on_product_seller_fields
+BEFORE INSERT OR UPDATE OF seller_id, city_id, seller_is_verified, listing_city_id ON public.products
+FOR EACH ROW
+EXECUTE FUNCTION public.sync_product_seller_fields();
+
+-- 2. Quand le vendeur change (vérification, ville) : propager à ses produits
+CREATE OR REPLACE FUNCTION public.propagate_seller_fields()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE public.products
+    SET seller_is_verified = COALESCE(NEW.is_verified_seller, false),
+        listing_city_id = COALESCE(city_id, NEW.city_id)
+    WHERE seller_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS on_seller_fields_change ON public.profiles;
+CREATE TRIGGER on_seller_fields_change
+AFTER UPDATE OF is_verified_seller, city_id ON public.profiles
+FOR EACH ROW
+WHEN (OLD.is_verified_seller IS DISTINCT FROM NEW.is_verified_seller OR OLD.city_id IS DISTINCT FROM NEW.city_id)
+EXECUTE FUNCTION public.propagate_seller_fields();
+
+-- Remplissage initial
+UPDATE public.products p
+SET seller_is_verified = COALESCE(s.is_verified_seller, false),
+    listing_city_id = COALESCE(p.city_id, s.city_id)
+FROM public.profiles s
+WHERE s.id = p.seller_id;
+
+-- 3. Index pour les listes filtrées (mêmes clés de tri que la pagination par curseur)
+CREATE INDEX IF NOT EXISTS idx_products_verified_created_keyset
+ON public.products(created_at DESC, id DESC)
+WHERE seller_is_verified;
+
+CREATE INDEX IF NOT EXISTS idx_products_verified_price_keyset
+ON public.products(price, id)
+WHERE seller_is_verified;
+
+CREATE INDEX IF NOT EXISTS idx_products_city_keyset
+ON public.products(listing_city_id, created_at DESC, id DESC);
+
+-- 4. search_products filtre sur la colonne dénormalisée et accepte une ville
+DROP FUNCTION IF EXISTS public.search_products(TEXT, UUID[], BOOLEAN, BOOLEAN, BOOLEAN, UUID, TEXT, INTEGER, INTEGER, TEXT, UUID);
+
+CREATE OR REPLACE FUNCTION public.search_products(
+    p_query TEXT,
+    p_categories UUID[] DEFAULT NULL,
+    p_verified_only BOOLEAN DEFAULT false,
+    p_moq_one BOOLEAN DEFAULT false,
+    p_promo_only BOOLEAN DEFAULT false,
+    p_seller_id UUID DEFAULT NULL,
+    p_sort TEXT DEFAULT 'relevance',
+    p_limit INTEGER DEFAULT 20,
+    p_offset INTEGER DEFAULT 0,
+    p_after_value TEXT DEFAULT NULL,
+    p_after_id UUID DEFAULT NULL,
+    p_city_id UUID DEFAULT NULL
+)
+RETURNS TABLE (
+    id UUID,
+    seller_id UUID,
+    name TEXT,
+    description TEXT,
+    price DECIMAL,
+    original_price DECIMAL,
+    min_order_quantity INTEGER,
+    stock_quantity INTEGER,
+    default_commission DECIMAL,
+    is_affiliate_enabled BOOLEAN,
+    image_url TEXT,
+    images_url TEXT[],
+    category_id UUID,
+    city_id UUID,
+    average_rating DECIMAL,
+    total_reviews INTEGER,
+    created_at TIMESTAMPTZ,
+    profiles JSONB,
+    categories JSONB,
+    search_rank NUMERIC
+) AS $$
+#variable_conflict use_column
+DECLARE
+    v_query TSQUERY := websearch_to_tsquery('french', p_query);
+    v_term TEXT := trim(p_query);
+BEGIN
+    RETURN QUERY
+    WITH matches AS (
+        SELECT p.*,
+               round((ts_rank_cd(p.search_vector, v_query, 32) + word_similarity(v_term, p.name))::NUMERIC, 6) AS rank
+        FROM public.products p
+        WHERE (p.search_vector @@ v_query OR v_term <% p.name OR p.name ILIKE '%' || v_term || '%')
+          AND (p_categories IS NULL OR cardinality(p_categories) = 0 OR p.category_id = ANY(p_categories))
+          AND (NOT p_verified_only OR p.seller_is_verified)
+          AND (p_city_id IS NULL OR p.listing_city_id = p_city_id)
+          AND (NOT p_moq_one OR p.min_order_quantity = 1)
+          AND (NOT p_promo_only OR p.original_price IS NOT NULL)
+          AND (p_seller_id IS NULL OR p.seller_id = p_seller_id)
+    )
+    SELECT m.id, m.seller_id, m.name, m.description, m.price, m.original_price, m.min_order_quantity,
+           m.stock_quantity, m.default_commission, m.is_affiliate_enabled, m.image_url, m.images_url,
+           m.category_id, m.city_id, m.average_rating, m.total_reviews, m.created_at::TIMESTAMPTZ,
+           jsonb_build_object(
+               'id', s.id, 'full_name', s.full_name, 'is_verified_seller', s.is_verified_seller,
+               'avatar_url', s.avatar_url, 'store_name', s.store_name,
+               'total_sales_count', s.total_sales_count, 'average_rating', s.average_rating
+           ),
+           CASE WHEN c.id IS NULL THEN NULL ELSE jsonb_build_object('id', c.id, 'name', c.name, 'icon', c.icon) END,
+           m.rank
+    FROM matches m
+    LEFT JOIN public.profiles s ON s.id = m.seller_id
+    LEFT JOIN public.categories c ON c.id = m.category_id
+    WHERE p_after_id IS NULL OR CASE p_sort
+            WHEN 'price_asc' THEN (m.price, m.id) > (p_after_value::DECIMAL, p_after_id)
+            WHEN 'price_desc' THEN (m.price, m.id) < (p_after_value::DECIMAL, p_after_id)
+            WHEN 'newest' THEN (m.created_at::TIMESTAMPTZ, m.id) < (p_after_value::TIMESTAMPTZ, p_after_id)
+            ELSE (m.rank, m.id) < (p_after_value::NUMERIC, p_after_id)
+          END
+    ORDER BY
+        CASE WHEN p_sort = 'price_asc' THEN m.price END ASC,
+        CASE WHEN p_sort = 'price_desc' THEN m.price END DESC,
+        CASE WHEN p_sort = 'newest' THEN m.created_at END DESC,
+        CASE WHEN p_sort NOT IN ('price_asc', 'price_desc', 'newest') THEN m.rank END DESC,
+        CASE WHEN p_sort = 'price_asc' THEN m.id END ASC,
+        CASE WHEN p_sort <> 'price_asc' THEN m.id END DESC
+    LIMIT p_limit OFFSET p_offset;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+GRANT EXECUTE ON FUNCTION public.search_products TO anon, authenticated;
@@ -0,0 +1,11 @@
+-- Migration : Index pour le chargement fenêtré du chat
+-- Description : ChatRoom charge désormais les N derniers messages d'une conversation puis les
+-- pages plus anciennes par curseur (created_at, id). Cet index rend chaque fenêtre une simple
+-- lecture d'index depuis le curseur, quelle que soit la longueur de la conversation.
+
+CREATE INDEX IF NOT EXISTS idx_messages_conversation_keyset
+ON public.messages(conversation_id, created_at DESC, id DESC);
+
+-- Les offres affichées dans le chat sont chargées à part, par lot d'order_id (clé primaire)
+
+ANALYZE public.messages;
@@ -0,0 +1,228 @@
+-- Migration : Compteurs de non-lus maintenus par le serveur
+-- Description : Les badges (liste des conversations, onglet Messages, cloche) ne comptent plus
+-- les lignes de messages / notifications côté client. Chaque conversation porte un compteur par
+-- participant (incrémenté par le trigger on_message_sent, remis à zéro par
+-- mark_conversation_read) et chaque utilisateur une ligne de totaux, poussée en temps réel.
+
+-- 1. Compteur par (participant, conversation), à côté des aperçus par rôle
+ALTER TABLE public.conversations
+ADD COLUMN IF NOT EXISTS unread_for_buyer INTEGER NOT NULL DEFAULT 0,
+ADD COLUMN IF NOT EXISTS unread_for_seller INTEGER NOT NULL DEFAULT 0;
+
+-- 2. Totaux par utilisateur pour les badges
+CREATE TABLE IF NOT EXISTS public.user_unread_counters (
+    user_id UUID PRIMARY KEY REFERENCES public.profiles(id) ON DELETE CASCADE,
+    messages_unread INTEGER NOT NULL DEFAULT 0,
+    notifications_unread INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL
+);
+
+ALTER TABLE public.user_unread_counters ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can read their own unread counters" ON public.user_unread_counters;
+CREATE POLICY "Users can read their own unread counters"
+ON public.user_unread_counters FOR SELECT
+USING (auth.uid() = user_id);
+
+-- 3. Ajustement atomique des totaux (usage interne aux triggers et RPC)
+CREATE OR REPLACE FUNCTION public.bump_unread_counters(
+    p_user_id UUID,
+    p_messages INTEGER,
+    p_notifications INTEGER
+)
+RETURNS VOID AS $$
+BEGIN
+    IF p_user_id IS NULL OR (p_messages = 0 AND p_notifications = 0) THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO public.user_unread_counters AS c (user_id, messages_unread, notifications_unread)
+    VALUES (p_user_id, GREATEST(p_messages, 0), GREATEST(p_notifications, 0))
+    ON CONFLICT (user_id) DO UPDATE SET
+        messages_unread = GREATEST(c.messages_unread + p_messages, 0),
+        notifications_unread = GREATEST(c.notifications_unread + p_notifications, 0),
+        updated_at = now();
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION public.bump_unread_counters(UUID, INTEGER, INTEGER) FROM PUBLIC, anon, authenticated;
+
+-- 4. Trigger on_message_sent : aperçus par rôle + compteur du destinataire
+CREATE OR REPLACE FUNCTION update_conversation_last_message_v2()
+RETURNS TRIGGER AS $$
+DECLARE
+    conv RECORD;
+BEGIN
+    -- Récupérer la conversation
+    SELECT buyer_id, seller_id INTO conv
+    FROM public.conversations
+    WHERE id = NEW.conversation_id;
+
+    -- Si message du vendeur → Mettre à jour aperçu et non-lus de l'acheteur
+    IF NEW.sender_id = conv.seller_id THEN
+        UPDATE public.conversations
+        SET
+            last_message_for_buyer = CASE
+                WHEN NEW.content IS NOT NULL AND NEW.content != ''
+                THEN LEFT(NEW.content, 100)
+                ELSE NULL
+            END,
+            last_message_for_buyer_at = NEW.created_at,
+            last_media_type_for_buyer = NEW.media_type,
+            unread_for_buyer = unread_for_buyer + 1,
+            last_message_at = NEW.created_at
+        WHERE id = NEW.conversation_id;
+
+        PERFORM public.bump_unread_counters(conv.buyer_id, 1, 0);
+
+    -- Si message de l'acheteur → Mettre à jour aperçu et non-lus du vendeur
+    ELSIF NEW.sender_id = conv.buyer_id THEN
+        UPDATE public.conversations
+        SET
+            last_message_for_seller = CASE
+                WHEN NEW.content IS NOT NULL AND NEW.content != ''
+                THEN LEFT(NEW.content, 100)
+                ELSE NULL
+            END,
+            last_message_for_seller_at = NEW.created_at,
+            last_media_type_for_seller = NEW.media_type,
+            unread_for_seller = unread_for_seller + 1,
+            last_message_at = NEW.created_at
+        WHERE id = NEW.conversation_id;
+
+        PERFORM public.bump_unread_counters(conv.seller_id, 1, 0);
+
+    ELSE
+        -- Garder aussi last_message_at pour tri général
+        UPDATE public.conversations
+        SET last_message_at = NEW.created_at
+        WHERE id = NEW.conversation_id;
+    END IF;
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- 5. Marquer une conversation comme lue (remplace l'UPDATE direct côté client)
+CREATE OR REPLACE FUNCTION public.mark_conversation_read(
+    p_conversation_id UUID,
+    p_user_id UUID
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_conv RECORD;
+    v_cleared INTEGER;
+BEGIN
+    -- Le participant lui-même ou le service_role ; sans JWT (anon), auth.uid() est NULL et refusé
+    IF auth.role() IS DISTINCT FROM 'service_role' AND auth.uid() IS DISTINCT FROM p_user_id THEN
+        RETURN jsonb_build_object('success', false, 'error', 'Unauthorized');
+    END IF;
+
+    SELECT id, buyer_id, seller_id, unread_for_buyer, unread_for_seller INTO v_conv
+    FROM public.conversations
+    WHERE id = p_conversation_id
+    FOR UPDATE;
+
+    IF NOT FOUND OR p_user_id NOT IN (v_conv.buyer_id, v_conv.seller_id) THEN
+        RETURN jsonb_build_object('success', false, 'error', 'Conversation not found');
+    END IF;
+
+    UPDATE public.messages
+    SET is_read = TRUE, read_at = now()
+    WHERE conversation_id = p_conversation_id
+      AND sender_id <> p_user_id
+      AND is_read = FALSE;
+
+    IF p_user_id = v_conv.buyer_id THEN
+        v_cleared := v_conv.unread_for_buyer;
+        UPDATE public.conversations SET unread_for_buyer = 0
+        WHERE id = p_conversation_id AND unread_for_buyer <> 0;
+    ELSE
+        v_cleared := v_conv.unread_for_seller;
+        UPDATE public.conversations SET unread_for_seller = 0
+        WHERE id = p_conversation_id AND unread_for_seller <> 0;
+    END IF;
+
+    PERFORM public.bump_unread_counters(p_user_id, -v_cleared, 0);
+
+    RETURN jsonb_build_object('success', true, 'cleared', v_cleared);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Permission d'exécution (PUBLIC reçoit EXECUTE par défaut : on le retire explicitement)
+REVOKE EXECUTE ON FUNCTION public.mark_conversation_read(UUID, UUID) FROM PUBLIC, anon;
+GRANT EXECUTE ON FUNCTION public.mark_conversation_read(UUID, UUID) TO authenticated;
+GRANT EXECUTE ON FUNCTION public.mark_conversation_read(UUID, UUID) TO service_role;
+
+-- 6. Notifications : le total suit les insertions, lectures et suppressions
+CREATE OR REPLACE FUNCTION public.sync_notification_unread()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' AND NOT COALESCE(NEW.is_read, FALSE) THEN
+        PERFORM public.bump_unread_counters(NEW.user_id, 0, 1);
+    ELSIF TG_OP = 'UPDATE' AND COALESCE(OLD.is_read, FALSE) IS DISTINCT FROM COALESCE(NEW.is_read, FALSE) THEN
+        PERFORM public.bump_unread_counters(NEW.user_id, 0, CASE WHEN NEW.is_read THEN -1 ELSE 1 END);
+    ELSIF TG_OP = 'DELETE' AND NOT COALESCE(OLD.is_read, FALSE) THEN
+        PERFORM public.bump_unread_counters(OLD.user_id, 0, -1);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+DROP TRIGGER IF EXISTS sync_notification_unread ON public.notifications;
+CREATE TRIGGER sync_notification_unread
+AFTER INSERT OR UPDATE OF is_read OR DELETE ON public.notifications
+FOR EACH ROW
+EXECUTE FUNCTION public.sync_notification_unread();
+
+-- 7. Backfill à partir de l'existant
+UPDATE public.conversations c
+SET
+    unread_for_buyer = (
+        SELECT COUNT(*) FROM public.messages m
+        WHERE m.conversation_id = c.id AND m.sender_id <> c.buyer_id AND m.is_read = FALSE
+    ),
+    unread_for_seller = (
+        SELECT COUNT(*) FROM public.messages m
+        WHERE m.conversation_id = c.id AND m.sender_id <> c.seller_id AND m.is_read = FALSE
+    );
+
+INSERT INTO public.user_unread_counters (user_id, messages_unread, notifications_unread)
+SELECT user_id, SUM(messages_unread), SUM(notifications_unread)
+FROM (
+    SELECT buyer_id AS user_id, unread_for_buyer AS messages_unread, 0 AS notifications_unread
+    FROM public.conversations
+    UNION ALL
+    SELECT seller_id, unread_for_seller, 0
+    FROM public.conversations
+    UNION ALL
+    SELECT user_id, 0, 1
+    FROM public.notifications
+    WHERE is_read = FALSE
+) t
+WHERE user_id IS NOT NULL
+GROUP BY user_id
+ON CONFLICT (user_id) DO UPDATE SET
+    messages_unread = EXCLUDED.messages_unread,
+    notifications_unread = EXCLUDED.notifications_unread,
+    updated_at = now();
+
+-- 8. Diffusion temps réel (un canal par utilisateur côté client)
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_publication WHERE pubname = 'supabase_realtime') THEN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_publication_tables
+            WHERE pubname = 'supabase_realtime' AND schemaname = 'public' AND tablename = 'user_unread_counters'
+        ) THEN
+            ALTER PUBLICATION supabase_realtime ADD TABLE public.user_unread_counters;
+        END IF;
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_publication_tables
+            WHERE pubname = 'supabase_realtime' AND schemaname = 'public' AND tablename = 'conversations'
+        ) THEN
+            ALTER PUBLICATION supabase_realtime ADD TABLE public.conversations;
+        END IF;
+    END IF;
+END $$;
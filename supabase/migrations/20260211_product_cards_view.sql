@@ -0,0 +1,47 @@
+-- Migration : Vue des cartes produit pour les listes paginées
+-- Description : getPaginatedProductsOptimized faisait trois allers-retours par page (produits
+-- avec count exact, puis profils et catégories en parallèle, assemblés côté client). La vue
+-- product_cards renvoie en une seule réponse les champs compacts d'une carte (prix, première
+-- image, note, vendeur, catégorie). Les filtres et le tri par curseur restent ceux de PostgREST
+-- et s'appliquent aux colonnes de products, donc aux index existants (keyset, seller_is_verified,
+-- listing_city_id). Le comptage reste optionnel (count=estimated au premier chargement).
+
+CREATE OR REPLACE VIEW public.product_cards
+WITH (security_invoker = true) AS
+SELECT
+    p.id,
+    p.seller_id,
+    p.name,
+    p.price,
+    p.original_price,
+    COALESCE(NULLIF(p.image_url, ''), p.images_url[1]) AS image_url,
+    p.min_order_quantity,
+    p.stock_quantity,
+    p.default_commission,
+    p.is_affiliate_enabled,
+    p.category_id,
+    p.city_id,
+    p.average_rating,
+    p.total_reviews,
+    p.created_at,
+    p.seller_is_verified,
+    p.listing_city_id,
+    -- Mêmes noms que les embeds PostgREST, pour que les composants restent inchangés
+    jsonb_build_object(
+        'id', s.id,
+        'full_name', s.full_name,
+        'store_name', s.store_name,
+        'avatar_url', s.avatar_url,
+        'is_verified_seller', p.seller_is_verified
+    ) AS profiles,
+    CASE WHEN c.id IS NULL THEN NULL
+         ELSE jsonb_build_object('id', c.id, 'name', c.name, 'icon', c.icon)
+    END AS categories
+FROM public.products p
+LEFT JOIN public.profiles s ON s.id = p.seller_id
+LEFT JOIN public.categories c ON c.id = p.category_id;
+
+COMMENT ON VIEW public.product_cards IS 'Champs compacts des cartes produit (listes paginées), vendeur et catégorie inclus';
+
+-- Permission de lecture (la vue applique les RLS de l'appelant via security_invoker)
+GRANT SELECT ON public.product_cards TO anon, authenticated;
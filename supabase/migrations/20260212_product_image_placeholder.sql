@@ -0,0 +1,47 @@
+-- Migration : Aperçu basse résolution de l'image principale des produits
+-- Description : Les cartes produit affichaient un cadre gris jusqu'au chargement complet de
+-- l'image. products.image_placeholder stocke une miniature de 16 px (data URL WebP de quelques
+-- centaines d'octets) générée côté client à la publication ; la grille l'affiche en fond
+-- pendant que la variante redimensionnée (srcset) se charge. La vue product_cards l'expose
+-- en dernière colonne (CREATE OR REPLACE VIEW n'autorise que l'ajout en fin de liste).
+
+ALTER TABLE public.products ADD COLUMN IF NOT EXISTS image_placeholder TEXT;
+
+COMMENT ON COLUMN public.products.image_placeholder IS 'Data URL 16 px de l''image principale, affichée pendant le chargement';
+
+CREATE OR REPLACE VIEW public.product_cards
+WITH (security_invoker = true) AS
+SELECT
+    p.id,
+    p.seller_id,
+    p.name,
+    p.price,
+    p.original_price,
+    COALESCE(NULLIF(p.image_url, ''), p.images_url[1]) AS image_url,
+    p.min_order_quantity,
+    p.stock_quantity,
+    p.default_commission,
+    p.is_affiliate_enabled,
+    p.category_id,
+    p.city_id,
+    p.average_rating,
+    p.total_reviews,
+    p.created_at,
+    p.seller_is_verified,
+    p.listing_city_id,
+    jsonb_build_object(
+        'id', s.id,
+        'full_name', s.full_name,
+        'store_name', s.store_name,
+        'avatar_url', s.avatar_url,
+        'is_verified_seller', p.seller_is_verified
+    ) AS profiles,
+    CASE WHEN c.id IS NULL THEN NULL
+         ELSE jsonb_build_object('id', c.id, 'name', c.name, 'icon', c.icon)
+    END AS categories,
+    p.image_placeholder
+FROM public.products p
+LEFT JOIN public.profiles s ON s.id = p.seller_id
+LEFT JOIN public.categories c ON c.id = p.category_id;
+
+GRANT SELECT ON public.product_cards TO anon, authenticated;
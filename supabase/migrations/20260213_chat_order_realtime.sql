@@ -0,0 +1,17 @@
+-- Migration : Offres du chat en temps réel
+-- Description : les cartes d'offre du chat sont mises en cache par order_id. Pour qu'un paiement,
+-- une expédition ou une livraison faits par l'autre partie s'affichent sans attendre l'expiration
+-- du cache, ChatRoom écoute les UPDATE de ces commandes (filtre id=in.(...)). La RLS de orders
+-- (acheteur, vendeur, affilié) s'applique aussi à la diffusion.
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_publication WHERE pubname = 'supabase_realtime') THEN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_publication_tables
+            WHERE pubname = 'supabase_realtime' AND schemaname = 'public' AND tablename = 'orders'
+        ) THEN
+            ALTER PUBLICATION supabase_realtime ADD TABLE public.orders;
+        END IF;
+    END IF;
+END $$;
@@ -1,139 +0,0 @@
-import asyncio
-from playwright import async_api
-from playwright.async_api import expect
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173/auth", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Click on the 'S'inscrire' link to go to the registration page.
-        frame = context.pages[-1]
-        # Click on 'Pas encore de compte ? S'inscrire' to go to registration page
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/p').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Select 'Vendeur' as the user role and fill in the registration details with provided credentials.
-        frame = context.pages[-1]
-        # Fill in full name (business name)
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Business')
-        
-
-        frame = context.pages[-1]
-        # Fill in email
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('utilisateurtestvendeur@gmail.com')
-        
-
-        frame = context.pages[-1]
-        # Fill in password
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Sweetmoney')
-        
-
-        # -> Click the 'S'inscrire' button to submit the registration form.
-        frame = context.pages[-1]
-        # Click the 'S'inscrire' button to submit the registration form
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on 'Pas encore de compte ? S'inscrire' to go to the registration page again.
-        frame = context.pages[-1]
-        # Click on 'Pas encore de compte ? S'inscrire' to go to registration page
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/p').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Select 'Vendeur' as the user role and fill in the registration details with a new unique email.
-        frame = context.pages[-1]
-        # Fill in full name (business name)
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Business')
-        
-
-        frame = context.pages[-1]
-        # Fill in new unique email
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('uniqueuservendeur5678@gmail.com')
-        
-
-        frame = context.pages[-1]
-        # Fill in password
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Sweetmoney')
-        
-
-        frame = context.pages[-1]
-        # Click the 'S'inscrire' button to submit the registration form
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Verify that the user is authenticated with the Seller role by checking for Seller-specific UI elements or profile information.
-        frame = context.pages[-1]
-        # Click on 'Profil' to check user role and authentication status
-        elem = frame.locator('xpath=html/body/div/div/nav/a[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        await expect(frame.locator('text=Accueil').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Explorer').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Messages').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Achats').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Profil').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
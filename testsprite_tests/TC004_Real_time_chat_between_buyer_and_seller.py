@@ -1,106 +0,0 @@
-import asyncio
-from playwright import async_api
-from playwright.async_api import expect
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Click on a product to navigate to its detail page and open chat with the seller.
-        frame = context.pages[-1]
-        # Click on the first product 'Poupée Baby maymay' to open product detail and chat with seller
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/div[6]/a/div/div/img').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the '💬 Négocier le Prix' button to open chat with the seller.
-        frame = context.pages[-1]
-        # Click '💬 Négocier le Prix' button to open chat with seller
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[3]/div[5]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input email and password, then click 'Se connecter' to log in as buyer.
-        frame = context.pages[-1]
-        # Input buyer email
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('utilisateurtest@gmail.com')
-        
-
-        frame = context.pages[-1]
-        # Input buyer password
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Sweetmoney')
-        
-
-        frame = context.pages[-1]
-        # Click 'Se connecter' button to log in
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the '💬 Négocier le Prix' button (index 12) to open chat with the seller.
-        frame = context.pages[-1]
-        # Click '💬 Négocier le Prix' button to open chat with seller
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[3]/div[4]/div/div/div/button[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Offer Accepted Successfully').first).to_be_visible(timeout=1000)
-        except AssertionError:
-            raise AssertionError("Test plan execution failed: Real-time message exchange, offer creation, acceptance, and message read status updates in chat sessions between buyers and sellers did not complete successfully.")
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
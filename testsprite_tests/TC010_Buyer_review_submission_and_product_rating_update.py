@@ -1,151 +0,0 @@
-import asyncio
-from playwright import async_api
-from playwright.async_api import expect
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Click on 'Se connecter' to login as buyer.
-        frame = context.pages[-1]
-        # Click on 'Se connecter' to go to login page
-        elem = frame.locator('xpath=html/body/div/div/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input email and password, then click 'Se connecter' to login.
-        frame = context.pages[-1]
-        # Input buyer email
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('utilisateurtest@gmail.com')
-        
-
-        frame = context.pages[-1]
-        # Input buyer password
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Sweetmoney')
-        
-
-        frame = context.pages[-1]
-        # Click 'Se connecter' button to login
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on 'Achats' to view buyer's orders.
-        frame = context.pages[-1]
-        # Click on 'Achats' to view buyer's orders
-        elem = frame.locator('xpath=html/body/div/div/nav/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click 'Laisser un avis' button on the first delivered order to open the review submission form.
-        frame = context.pages[-1]
-        # Click 'Laisser un avis' on the first delivered order to open review submission form
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[3]/div/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Select a product rating, enter a textual review, select a vendor rating, enter vendor comments, and submit the review.
-        frame = context.pages[-1]
-        # Select 4-star rating for product
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[4]/div/div[3]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        # Enter textual review for product
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[4]/div/div[3]/div/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Très bonne qualité, conforme à la description.')
-        
-
-        frame = context.pages[-1]
-        # Select 5-star rating for vendor
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[4]/div/div[3]/div[2]/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        # Enter textual review for vendor
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[4]/div/div[3]/div[2]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Livraison rapide et communication efficace.')
-        
-
-        frame = context.pages[-1]
-        # Click 'Publier mon avis' to submit the review
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[4]/div/div[3]/div[4]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Navigate to the product detail page of the reviewed product to verify the review and rating update.
-        frame = context.pages[-1]
-        # Click on product name 'Poupée Baby maymay' to go to product detail page
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[3]/div[4]/div[2]/img').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Navigate to the product detail page of the reviewed product to verify the review and rating update.
-        frame = context.pages[-1]
-        # Click on product image or name to go to product detail page
-        elem = frame.locator('xpath=html/body/div/div/main/div/div[4]/div/div[2]/div[2]/div[2]/img').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Review submission successful').first).to_be_visible(timeout=30000)
-        except AssertionError:
-            raise AssertionError("Test case failed: Buyers cannot submit ratings and reviews after order delivery, reviews do not appear appropriately, or product rating averages do not update correctly as per the test plan.")
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
@@ -1,168 +0,0 @@
-import asyncio
-from playwright import async_api
-from playwright.async_api import expect
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5173", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Click on 'Se connecter' to start login process as buyer
-        frame = context.pages[-1]
-        # Click on 'Se connecter' to open login form
-        elem = frame.locator('xpath=html/body/div/div/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input buyer email and password, then click 'Se connecter' to login
-        frame = context.pages[-1]
-        # Input buyer email
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('utilisateurtest@gmail.com')
-        
-
-        frame = context.pages[-1]
-        # Input buyer password
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Sweetmoney')
-        
-
-        frame = context.pages[-1]
-        # Click 'Se connecter' to submit login form
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Navigate through multiple pages as buyer to verify session persistence
-        frame = context.pages[-1]
-        # Click on 'Messages' to navigate to messages page
-        elem = frame.locator('xpath=html/body/div/div/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Refresh the browser page to verify session persistence
-        await page.goto('http://localhost:5173/messages', timeout=10000)
-        await asyncio.sleep(3)
-        
-
-        # -> Attempt to access seller-only pages with buyer credentials to verify access restrictions
-        frame = context.pages[-1]
-        # Click on 'Accueil' to navigate to home page
-        elem = frame.locator('xpath=html/body/div/div/nav/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Attempt to access seller-only pages with buyer credentials
-        frame = context.pages[-1]
-        # Attempt to access seller-only page 'Électronique' category to verify access restrictions
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/div[2]/div/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Attempt API calls restricted to affiliate role with buyer credentials to verify API access restrictions
-        await page.goto('http://localhost:5173/api/affiliate-only-endpoint', timeout=10000)
-        await asyncio.sleep(3)
-        
-
-        # -> Try to verify API response status code or error by checking network or console logs or by attempting API call via other means
-        await page.goto('http://localhost:5173/profile', timeout=10000)
-        await asyncio.sleep(3)
-        
-
-        # -> Attempt to login as seller to verify session persistence and access restrictions for seller role
-        frame = context.pages[-1]
-        # Click 'Se déconnecter' to log out buyer user
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/div[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input seller credentials and login
-        frame = context.pages[-1]
-        # Input seller email
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('utilisateurtest@gmail.com')
-        
-
-        frame = context.pages[-1]
-        # Input seller password
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Sweetmoney')
-        
-
-        frame = context.pages[-1]
-        # Click 'Se connecter' to login as seller
-        elem = frame.locator('xpath=html/body/div/div/main/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Navigate to 'Achats' page using available element with index 8 to continue verifying session persistence and access restrictions for seller role
-        frame = context.pages[-1]
-        # Click on 'Achats' to navigate to purchases page
-        elem = frame.locator('xpath=html/body/div/div/nav/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Refresh the browser page to verify session persistence after refresh for seller role
-        await page.goto('http://localhost:5173/orders', timeout=10000)
-        await asyncio.sleep(3)
-        
-
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        await expect(frame.locator('text=Messages').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Accueil').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Électronique').first).not.to_be_visible(timeout=30000)
-        await expect(frame.locator('text=403 Forbidden').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Mes Achats').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Historique de vos commandes Zwa').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
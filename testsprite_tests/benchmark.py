@@ -0,0 +1,168 @@
+"""Page-load benchmark of the main views, with a p95 regression gate.
+
+    python benchmark.py --repeat 10                  # compare with perf_baseline.json
+    python benchmark.py --repeat 10 --update-baseline
+
+The guest views follow the DISC_001 path (Home -> ProductDetail -> StorePage
+-> /auth); OrdersList, MessagesList and AffiliateDashboard are loaded with
+the cached session of their role. Each repetition loads every view cold in a
+fresh context and records Navigation Timing, LCP, long tasks, JS heap size,
+time until the app settles and the count/bytes of Supabase requests.
+
+Results go to tmp/benchmark_results.json. The run fails when the p95 of a
+gated metric exceeds the baseline p95 by more than ``--threshold``.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+import stub_supabase
+from support import perf
+from support import readiness as ready
+from support.auth_state import build_id
+from support.config import TESTS_DIR, TMP_DIR
+from support.pool import BrowserPool
+
+BASELINE_PATH = TESTS_DIR / "perf_baseline.json"
+BASELINE_VERSION = 1
+
+# Gated metrics, with the absolute increase that is always tolerated as noise
+GATED_METRICS = {
+    "ready_ms": 100,
+    "dom_content_loaded_ms": 50,
+    "lcp_ms": 100,
+    "blocking_ms": 50,
+    "js_heap_bytes": 2 * 1024 * 1024,
+    "supabase_requests": 1,
+    "supabase_bytes": 10 * 1024,
+}
+
+LOGGED_IN_VIEWS = [
+    ("orders_list", "/orders", "buyer"),
+    ("messages_list", "/messages", "buyer"),
+    ("affiliate_dashboard", "/affiliate", "affiliate"),
+]
+
+
+async def resolve_views(pool):
+    """Walk the DISC_001 path once to find a real product and store."""
+    async with pool.context() as context:
+        page = await ready.open_app(context, "/")
+        await ready.click(page.locator('a[href^="/product/"]').first)
+        product_path = urlparse(page.url).path
+        await ready.click(page.get_by_text("Voir la Boutique").first)
+        store_path = urlparse(page.url).path
+
+    return [
+        ("home", "/", None),
+        ("product_detail", product_path, None),
+        ("store_page", store_path, None),
+        ("auth", "/auth", None),
+    ] + LOGGED_IN_VIEWS
+
+
+async def measure(pool, path, role):
+    async with pool.context(role=role) as context:
+        traffic = await perf.install(context)
+        started = time.monotonic()
+        page = await ready.open_app(context, path)
+        ready_ms = (time.monotonic() - started) * 1000
+        metrics = await perf.collect(page, traffic)
+        metrics["ready_ms"] = round(ready_ms, 1)
+        return metrics
+
+
+async def run_benchmark(repeat):
+    stub = await stub_supabase.maybe_start()
+    try:
+        async with BrowserPool(size=1) as pool:
+            views = await resolve_views(pool)
+            samples = {name: [] for name, _, _ in views}
+            for iteration in range(repeat):
+                for name, path, role in views:
+                    samples[name].append(await measure(pool, path, role))
+                print(f"repetition {iteration + 1}/{repeat} done", flush=True)
+    finally:
+        if stub:
+            await stub.cleanup()
+    return {
+        name: {"path": path, "role": role, "samples": len(samples[name]), "metrics": perf.summarize(samples[name])}
+        for name, path, role in views
+    }
+
+
+def find_regressions(views, baseline, threshold):
+    regressions = []
+    for name, view in views.items():
+        base_view = baseline.get("views", {}).get(name)
+        if not base_view:
+            continue
+        for metric, noise in GATED_METRICS.items():
+            current = view["metrics"].get(metric, {}).get("p95")
+            reference = base_view["metrics"].get(metric, {}).get("p95")
+            if current is None or reference is None:
+                continue
+            if current > reference * (1 + threshold) and current - reference > noise:
+                regressions.append(f"{name}.{metric}: p95 {current} vs baseline {reference}")
+    return regressions
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions per view (default: 5)")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed p95 increase over the baseline, as a fraction (default: 0.2)")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    views = asyncio.run(run_benchmark(max(1, args.repeat)))
+    results = {
+        "version": BASELINE_VERSION,
+        "build": build_id(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "repeat": args.repeat,
+        "views": views,
+    }
+    with open(TMP_DIR / "benchmark_results.json", "w", encoding="utf-8") as fh:
+        json.dump(results, fh, indent=2)
+
+    for name, view in views.items():
+        metrics = view["metrics"]
+        print(f"{name:22} ready p95 {metrics['ready_ms']['p95']:>8} ms  "
+              f"LCP p95 {metrics['lcp_ms']['p95']:>8} ms  "
+              f"supabase {metrics['supabase_requests']['p95']:>4} req / {metrics['supabase_bytes']['p95']:>10} B")
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+        print(f"Baseline written to {BASELINE_PATH.name}")
+        return 0
+
+    if not BASELINE_PATH.exists():
+        print("No perf_baseline.json yet: run with --update-baseline to create one")
+        return 0
+    with open(BASELINE_PATH, encoding="utf-8") as fh:
+        baseline = json.load(fh)
+    if baseline.get("version") != BASELINE_VERSION:
+        print(f"Baseline format v{baseline.get('version')} is not v{BASELINE_VERSION}: re-create it with --update-baseline")
+        return 2
+
+    regressions = find_regressions(views, baseline, args.threshold)
+    if regressions:
+        print(f"\nPerformance regressions against baseline {baseline.get('build')}:")
+        for line in regressions:
+            print("  " + line)
+        return 1
+    print(f"\nNo p95 regression beyond {args.threshold:.0%} against baseline {baseline.get('build')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
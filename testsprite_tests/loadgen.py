@@ -0,0 +1,286 @@
+"""Load generator replaying the buyer journey against the Supabase REST API.
+
+    python loadgen.py --sessions 300 --duration 120
+    python loadgen.py --sessions 300 --duration 120 --with-orders --browser-sessions 3
+
+Each lightweight session is an asyncio task sharing one httpx client. It
+walks the DISC_001 / TC006 / TC007 path with the same requests the services
+make: getPaginatedProductsOptimized (two keyset pages of product_cards, as
+the home feed scrolls), getProductById, then (with ``--with-orders``)
+createOrder and getPaginatedOrders as the buyer. ``--browser-sessions`` also
+runs that many real browsers through the DISC_001 scenario alongside, to
+see what the load does to actual page timings.
+
+Requires ``httpx``. The target is VITE_SUPABASE_URL / VITE_SUPABASE_ANON_KEY
+(environment or the app's .env), or the local stand-in when
+ZWA_SUPABASE_STUB is set. Order creation writes real rows and is therefore
+opt-in. Results go to tmp/load_results.json.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+import httpx
+
+import stub_supabase
+from support import perf
+from support.auth_state import credentials
+from support.config import SUPABASE_ANON_KEY, SUPABASE_URL, TMP_DIR
+
+PRODUCT_DETAIL_SELECT = ("*, profiles(full_name, is_verified_seller, avatar_url, store_name, "
+                         "total_sales_count, average_rating), categories(id, name, icon)")
+ORDERS_SELECT = ("*, products(name, image_url), buyer:profiles!orders_buyer_id_fkey(full_name, avatar_url), "
+                 "seller:profiles!orders_seller_id_fkey(full_name, store_name, avatar_url), reviews(id)")
+
+PAGE_SIZE = 20
+HISTOGRAM_BOUNDS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.journeys = 0
+
+    def record(self, operation, elapsed_ms, ok):
+        self.latencies.setdefault(operation, []).append(elapsed_ms)
+        if not ok:
+            self.errors[operation] = self.errors.get(operation, 0) + 1
+
+    def report(self, wall_s):
+        operations = {}
+        for operation, values in sorted(self.latencies.items()):
+            histogram = {f"<={bound}ms": 0 for bound in HISTOGRAM_BOUNDS_MS}
+            histogram["slower"] = 0
+            for value in values:
+                bucket = next((f"<={b}ms" for b in HISTOGRAM_BOUNDS_MS if value <= b), "slower")
+                histogram[bucket] += 1
+            errors = self.errors.get(operation, 0)
+            operations[operation] = {
+                "requests": len(values),
+                "throughput_rps": round(len(values) / wall_s, 2),
+                "error_rate": round(errors / len(values), 4),
+                "p50_ms": perf.percentile(values, 50),
+                "p95_ms": perf.percentile(values, 95),
+                "p99_ms": perf.percentile(values, 99),
+                "histogram": histogram,
+            }
+        total = sum(len(v) for v in self.latencies.values())
+        return {
+            "wall_clock_s": round(wall_s, 2),
+            "journeys": self.journeys,
+            "requests": total,
+            "throughput_rps": round(total / wall_s, 2),
+            "error_rate": round(sum(self.errors.values()) / total, 4) if total else 0,
+            "operations": operations,
+        }
+
+
+class Api:
+    """The handful of PostgREST calls the journey makes, timed into ``stats``."""
+
+    def __init__(self, client, base_url, anon_key, stats):
+        self.client = client
+        self.base_url = base_url
+        self.anon_key = anon_key
+        self.stats = stats
+        self.access_token = None
+
+    def _headers(self, **extra):
+        headers = {"apikey": self.anon_key, "Authorization": f"Bearer {self.access_token or self.anon_key}"}
+        headers.update(extra)
+        return headers
+
+    async def _call(self, operation, method, path, **kwargs):
+        started = time.monotonic()
+        try:
+            response = await self.client.request(method, self.base_url + path, **kwargs)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            response, ok = None, False
+        self.stats.record(operation, round((time.monotonic() - started) * 1000, 1), ok)
+        return response if ok else None
+
+    async def login(self, email, password):
+        response = await self._call("login", "POST", "/auth/v1/token", params={"grant_type": "password"},
+                                    json={"email": email, "password": password},
+                                    headers={"apikey": self.anon_key})
+        if response is None:
+            raise RuntimeError(f"Login failed for {email}")
+        session = response.json()
+        self.access_token = session["access_token"]
+        return session["user"]["id"]
+
+    async def paginated_products(self, cursor=None):
+        """One keyset page of the home feed; returns the rows and the cursor of the next page.
+
+        Same request as useProducts: product_cards newest first, (created_at, id) cursor,
+        estimated count on the first page only.
+        """
+        params = {"select": "*", "order": "created_at.desc,id.desc", "limit": PAGE_SIZE}
+        if cursor:
+            value, row_id = f'"{cursor[0]}"', cursor[1]
+            params["or"] = f"(created_at.lt.{value},and(created_at.eq.{value},id.lt.{row_id}))"
+        response = await self._call(
+            "getPaginatedProducts" if cursor is None else "getPaginatedProducts.next",
+            "GET", "/rest/v1/product_cards", params=params,
+            headers=self._headers(Prefer="count=estimated") if cursor is None else self._headers(),
+        )
+        rows = response.json() if response is not None else []
+        if len(rows) < PAGE_SIZE:
+            return rows, None
+        return rows, (rows[-1]["created_at"], rows[-1]["id"])
+
+    async def product_detail(self, product_id):
+        response = await self._call(
+            "getProductById", "GET", "/rest/v1/products",
+            params={"select": PRODUCT_DETAIL_SELECT, "id": f"eq.{product_id}"},
+            headers=self._headers(Accept="application/vnd.pgrst.object+json"),
+        )
+        return response.json() if response is not None else None
+
+    async def create_order(self, buyer_id, product):
+        quantity = max(1, product.get("min_order_quantity") or 1)
+        # createOrder re-reads commission and stock before inserting
+        await self._call("createOrder.product", "GET", "/rest/v1/products",
+                         params={"select": "default_commission,stock_quantity", "id": f"eq.{product['id']}"},
+                         headers=self._headers(Accept="application/vnd.pgrst.object+json"))
+        amount = float(product["price"]) * quantity
+        await self._call(
+            "createOrder", "POST", "/rest/v1/orders", params={"select": "*"},
+            json=[{"buyer_id": buyer_id, "seller_id": product["seller_id"], "product_id": product["id"],
+                   "amount": amount, "quantity": quantity,
+                   "commission_amount": amount * float(product.get("default_commission") or 0) / 100,
+                   "notes": "loadgen", "shipping_timeline": "7 jours", "status": "pending"}],
+            headers=self._headers(Prefer="return=representation",
+                                  Accept="application/vnd.pgrst.object+json"),
+        )
+
+    async def paginated_orders(self, buyer_id, page=0):
+        await self._call(
+            "getPaginatedOrders", "GET", "/rest/v1/orders",
+            params={"select": ORDERS_SELECT, "buyer_id": f"eq.{buyer_id}", "order": "created_at.desc",
+                    "offset": page * 10, "limit": 10},
+            headers=self._headers(Prefer="count=exact"),
+        )
+
+
+async def journey(api, buyer_id, with_orders, think_s):
+    async def think():
+        if think_s:
+            await asyncio.sleep(random.uniform(0, 2 * think_s))
+
+    products, cursor = await api.paginated_products()
+    await think()
+    if cursor:
+        more, _ = await api.paginated_products(cursor)
+        products += more
+        await think()
+    if products:
+        product = await api.product_detail(random.choice(products)["id"])
+        await think()
+        if with_orders and product and buyer_id:
+            await api.create_order(buyer_id, product)
+            await think()
+    if buyer_id:
+        await api.paginated_orders(buyer_id)
+    api.stats.journeys += 1
+
+
+async def session(client, base_url, anon_key, stats, token, buyer_id, args, deadline):
+    api = Api(client, base_url, anon_key, stats)
+    api.access_token = token
+    # Stagger start-up so the first second isn't one synchronized burst
+    await asyncio.sleep(random.uniform(0, args.ramp_up))
+    while time.monotonic() < deadline:
+        await journey(api, buyer_id, args.with_orders, args.think_ms / 1000)
+
+
+async def browser_sample(count):
+    """Run ``count`` real DISC_001 browser sessions and return their durations."""
+    from support.engine import load_scenarios
+    from support.pool import BrowserPool
+
+    scenario = next(s for s in load_scenarios() if s.id.startswith("DISC_001"))
+
+    async def one(pool):
+        started = time.monotonic()
+        try:
+            async with pool.context() as context:
+                await scenario.run_test(context)
+            status = "passed"
+        except Exception as exc:
+            status = f"failed: {type(exc).__name__}"
+        return {"duration_s": round(time.monotonic() - started, 2), "status": status}
+
+    async with BrowserPool(size=1) as pool:
+        return await asyncio.gather(*(one(pool) for _ in range(count)))
+
+
+async def run_load(args):
+    stub = await stub_supabase.maybe_start()
+    base_url = f"http://127.0.0.1:{stub_supabase.port()}" if stub else SUPABASE_URL
+    if not base_url:
+        raise SystemExit("No Supabase URL: set VITE_SUPABASE_URL or ZWA_SUPABASE_STUB")
+    anon_key = SUPABASE_ANON_KEY or "stub"
+    stats = Stats()
+    limits = httpx.Limits(max_connections=args.sessions, max_keepalive_connections=args.sessions)
+    try:
+        async with httpx.AsyncClient(limits=limits, timeout=args.timeout) as client:
+            token, buyer_id = None, None
+            if args.as_buyer or args.with_orders:
+                # One shared login: the journey load, not the auth endpoint, is under test
+                login_api = Api(client, base_url, anon_key, stats)
+                buyer_id = await login_api.login(*credentials("buyer"))
+                token = login_api.access_token
+
+            started = time.monotonic()
+            deadline = started + args.duration
+            sessions = [session(client, base_url, anon_key, stats, token, buyer_id, args, deadline)
+                        for _ in range(args.sessions)]
+            browsers = [browser_sample(args.browser_sessions)] if args.browser_sessions else []
+            results = await asyncio.gather(*sessions, *browsers)
+            report = stats.report(time.monotonic() - started)
+            if browsers:
+                report["browser_sessions"] = results[-1]
+            return report
+    finally:
+        if stub:
+            await stub.cleanup()
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100, help="concurrent lightweight sessions (default: 100)")
+    parser.add_argument("--duration", type=float, default=60, help="seconds to keep the load on (default: 60)")
+    parser.add_argument("--ramp-up", type=float, default=5, help="seconds over which sessions start (default: 5)")
+    parser.add_argument("--think-ms", type=float, default=500, help="mean pause between steps (default: 500)")
+    parser.add_argument("--timeout", type=float, default=30, help="per-request timeout in seconds")
+    parser.add_argument("--as-buyer", action="store_true", help="log in as the buyer and list their orders")
+    parser.add_argument("--with-orders", action="store_true", help="also create orders (writes rows!)")
+    parser.add_argument("--browser-sessions", type=int, default=0, help="real browser DISC_001 runs alongside")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = asyncio.run(run_load(args))
+    with open(TMP_DIR / "load_results.json", "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+
+    print(f"{report['journeys']} journeys, {report['requests']} requests in {report['wall_clock_s']}s "
+          f"({report['throughput_rps']} req/s, {report['error_rate']:.2%} errors)")
+    for name, op in report["operations"].items():
+        print(f"  {name:22} {op['requests']:>7} req  {op['throughput_rps']:>8} req/s  "
+              f"p50 {op['p50_ms']:>7} ms  p95 {op['p95_ms']:>7} ms  p99 {op['p99_ms']:>7} ms  "
+              f"errors {op['error_rate']:.2%}")
+    for run in report.get("browser_sessions", []):
+        print(f"  browser DISC_001        {run['duration_s']}s  {run['status']}")
+    return 1 if report["error_rate"] > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
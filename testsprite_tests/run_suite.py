@@ -0,0 +1,162 @@
+"""Run the testsprite scenarios concurrently on a shared browser pool.
+
+    python run_suite.py                      # every scenario in scenarios/
+    python run_suite.py --workers 6 TC003 DISC_001
+    python run_suite.py --workers 1 TC010    # a single scenario
+
+Scenarios are data files compiled by support/engine.py.
+
+Each scenario gets its own BrowserContext; up to ``--workers`` of them run at
+the same time across ``--browsers`` Chromium instances. A summary is written
+to tmp/suite_results.json and the exit code is non-zero if anything failed.
+
+Every step is timed (support/timeline.py): one timeline per scenario goes to
+tmp/timelines/ and the slowest steps of the run to tmp/slowest_steps.json.
+
+With ``ZWA_SUPABASE_STUB=1`` the local Supabase stand-in (stub_supabase/) is
+started first; see its docstring for pointing the app at it.
+
+``ZWA_NETWORK_MODE=record|replay`` records the Supabase/Cloudinary traffic to
+tmp/network_archive.zip or serves it back from there (support/replay.py).
+
+A failing step is retried on its own with backoff within a per-scenario
+budget; flaky steps and scenarios are tracked across runs and quarantined
+above a threshold so they stop failing the run (support/flaky.py,
+``--no-quarantine`` to turn that off).
+
+A scenario that declares a ``role`` starts already logged in with
+that role's cached storage state (see support/auth_state.py).
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import traceback
+
+import stub_supabase
+from support import flaky, replay, timeline
+from support.config import TMP_DIR
+from support.engine import load_scenarios
+from support.pool import BrowserPool
+
+
+def discover(selected=None):
+    scenarios = load_scenarios()
+    if selected:
+        scenarios = [s for s in scenarios if any(s.id.startswith(prefix) for prefix in selected)]
+    return scenarios
+
+
+async def run_one(pool, scenario, limit, stats, quarantine=True):
+    async with limit:
+        started = time.monotonic()
+        result = {"scenario": scenario.id, "status": "passed", "error": None}
+        budget = flaky.Budget(scenario.id)
+        try:
+            async with pool.context(role=scenario.role) as context:
+                timeline.start(context, scenario.id)
+                try:
+                    await scenario.run_test(context, budget)
+                except Exception as exc:
+                    result["timeline"] = timeline.finish(context, "failed", str(exc))
+                    raise
+                result["timeline"] = timeline.finish(context, "passed")
+        except Exception as exc:
+            result["status"] = "failed"
+            result["error"] = f"{type(exc).__name__}: {exc}"
+            result["traceback"] = traceback.format_exc()
+            failed_steps = [s for s in (result.get("timeline") or {}).get("steps", []) if s["status"] == "failed"]
+            if failed_steps:
+                result["failed_step"] = failed_steps[-1]
+            # Judged on history before this run, so one bad run can't excuse itself
+            if quarantine and (stats.is_quarantined("scenarios", scenario.id)
+                               or budget.failed_step and stats.is_quarantined("steps", budget.failed_step)):
+                result["status"] = "quarantined"
+        result["retries"] = budget.retries
+        stats.record(budget, "failed" if result["status"] != "passed" else None)
+        result["duration_s"] = round(time.monotonic() - started, 3)
+        print(f"[{result['status'].upper():6}] {scenario.id} ({result['duration_s']}s)", flush=True)
+        return result
+
+
+async def run_suite(scenarios, workers, browsers, headless=True, stats=None, quarantine=True):
+    limit = asyncio.Semaphore(workers)
+    stats = stats or flaky.Stats()
+    stub = await stub_supabase.maybe_start()
+    try:
+        async with BrowserPool(size=min(browsers, len(scenarios)) or 1, headless=headless) as pool:
+            return await asyncio.gather(*(run_one(pool, scenario, limit, stats, quarantine) for scenario in scenarios))
+    finally:
+        if stub:
+            await stub.cleanup()
+        replay.save()
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", nargs="*", help="scenario id prefixes, e.g. TC003 DISC_001")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("ZWA_WORKERS", "4")),
+                        help="scenarios running at the same time (default: 4)")
+    parser.add_argument("--browsers", type=int, default=int(os.environ.get("ZWA_BROWSERS", "2")),
+                        help="Chromium instances in the pool (default: 2)")
+    parser.add_argument("--headed", action="store_true", help="show the browser windows")
+    parser.add_argument("--no-quarantine", action="store_true", help="let quarantined scenarios fail the run")
+    parser.add_argument("--slowest", type=int, default=10, help="steps listed in the slowest-steps report")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    scenarios = discover(args.scenarios)
+    if not scenarios:
+        print("No scenario matched", args.scenarios, file=sys.stderr)
+        return 2
+
+    stats = flaky.Stats.load()
+    started = time.monotonic()
+    results = asyncio.run(run_suite(scenarios, max(1, args.workers), max(1, args.browsers),
+                                    headless=not args.headed, stats=stats, quarantine=not args.no_quarantine))
+    wall = round(time.monotonic() - started, 3)
+    stats.save()
+
+    report = timeline.write_report([r.pop("timeline", None) for r in results], limit=args.slowest)
+
+    failed = [r for r in results if r["status"] == "failed"]
+    quarantined = [r for r in results if r["status"] == "quarantined"]
+    summary = {
+        "wall_clock_s": wall,
+        "sum_of_scenarios_s": round(sum(r["duration_s"] for r in results), 3),
+        "workers": args.workers,
+        "browsers": args.browsers,
+        "passed": len(results) - len(failed) - len(quarantined),
+        "failed": len(failed),
+        "quarantined": len(quarantined),
+        "retries": sum(r["retries"] for r in results),
+        "flaky": stats.quarantined(),
+        "network_mode": replay.MODE or None,
+        "replay_misses": replay.archive().misses if replay.MODE == "replay" else [],
+        "results": results,
+    }
+    with open(TMP_DIR / "suite_results.json", "w", encoding="utf-8") as fh:
+        json.dump(summary, fh, indent=2, ensure_ascii=False)
+
+    if report["slowest_steps"]:
+        print("\nSlowest steps:")
+        for step in report["slowest_steps"]:
+            print(f"  {step['duration_ms']:>8.1f} ms  {step['scenario']}  {step['action']} {step['route']}  {step['target']}")
+
+    if quarantined:
+        print("\nQuarantined failures (flaky, not failing the run):")
+        for r in quarantined:
+            print(f"  {r['scenario']}  {r['error']}")
+
+    print(f"\n{summary['passed']} passed, {summary['failed']} failed, {summary['quarantined']} quarantined, "
+          f"{summary['retries']} step retries in {wall}s "
+          f"(sequential would be ~{summary['sum_of_scenarios_s']}s)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""Local stand-in for the hosted Supabase project.
+
+Serves the PostgREST tables the services use, the ``rpc/*`` functions in
+rpc.py, the auth endpoints (password/refresh grants, signup, user, logout)
+and the realtime websocket, all from fixtures.json and in memory, so the E2E
+suite runs hermetically at loopback latency.
+
+Enable it with ``ZWA_SUPABASE_STUB=1`` (or a port number) and start the app
+against it::
+
+    VITE_SUPABASE_URL=http://127.0.0.1:54321 VITE_SUPABASE_ANON_KEY=stub npm run dev
+    ZWA_SUPABASE_STUB=1 python run_suite.py
+
+It can also run on its own with ``python -m stub_supabase``.
+"""
+import json
+import os
+from pathlib import Path
+
+FIXTURES_PATH = Path(__file__).resolve().parent / "fixtures.json"
+DEFAULT_PORT = 54321
+
+
+def enabled():
+    return os.environ.get("ZWA_SUPABASE_STUB", "").lower() not in ("", "0", "false", "no")
+
+
+def port():
+    value = os.environ.get("ZWA_SUPABASE_STUB", "")
+    return int(value) if value.isdigit() and int(value) > 1 else DEFAULT_PORT
+
+
+def fixtures_path():
+    return Path(os.environ.get("ZWA_SUPABASE_FIXTURES", FIXTURES_PATH))
+
+
+def role_credentials(role):
+    """Email/password of the first fixture user whose profile has ``role``."""
+    with open(fixtures_path(), encoding="utf-8") as fh:
+        fixtures = json.load(fh)
+    roles = {p["id"]: p.get("role") for p in fixtures.get("tables", {}).get("profiles", [])}
+    for user in fixtures.get("users", []):
+        if roles.get(user["id"]) == role:
+            return user["email"], user["password"]
+    return None
+
+
+async def maybe_start():
+    """Start the stand-in when ZWA_SUPABASE_STUB is set; return its runner or None."""
+    if not enabled():
+        return None
+    from .server import start_server
+    return await start_server(fixtures_path(), port=port())
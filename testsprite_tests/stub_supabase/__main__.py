@@ -0,0 +1,30 @@
+import argparse
+import asyncio
+
+from . import DEFAULT_PORT, fixtures_path
+from .server import start_server
+
+
+async def serve(host, port, fixtures):
+    runner = await start_server(fixtures, host=host, port=port)
+    print(f"Supabase stand-in listening on http://{host}:{port} (fixtures: {fixtures})", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Supabase stand-in for the E2E suite")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--fixtures", default=str(fixtures_path()))
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.fixtures))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Tables, views and columns that Postgres keeps up to date for us.
+
+The stub has no triggers or views, so these are computed from the base
+tables each time they are read. Each DERIVED function returns the rows the
+trigger-maintained table or view of the same name in supabase/migrations/
+would hold; each COMPUTED function returns the trigger-maintained columns of
+one row of its table.
+"""
+
+ORDER_ROLES = (("buyer_id", "buyer"), ("seller_id", "seller"), ("affiliate_id", "affiliate"))
+ORDER_STATUSES = ("pending", "paid", "shipped", "delivered", "cancelled")
+
+
+def order_counters(store):
+    counters = {}
+    for order in store.table("orders"):
+        for column, role in ORDER_ROLES:
+            if not order.get(column):
+                continue
+            row = counters.setdefault((order[column], role), dict(
+                {"user_id": order[column], "role": role, "all_count": 0, "total_revenue": 0.0},
+                **{f"{status}_count": 0 for status in ORDER_STATUSES},
+            ))
+            row["all_count"] += 1
+            if order.get("status") in ORDER_STATUSES:
+                row[f"{order['status']}_count"] += 1
+            if order.get("status") in ("paid", "shipped", "delivered"):
+                row["total_revenue"] += float(order.get("amount") or 0)
+    return list(counters.values())
+
+
+def affiliate_product_earnings(store):
+    earnings = {}
+    for order in store.table("orders"):
+        status = order.get("status")
+        if not order.get("affiliate_id") or not order.get("product_id") or status not in ("paid", "shipped", "delivered"):
+            continue
+        row = earnings.setdefault((order["affiliate_id"], order["product_id"]), {
+            "affiliate_id": order["affiliate_id"], "product_id": order["product_id"], "sales_count": 0,
+            "total_earned": 0.0, "pending_count": 0, "pending_earnings": 0.0, "last_sale": None,
+        })
+        commission = float(order.get("commission_amount") or 0)
+        if status == "delivered":
+            row["sales_count"] += 1
+            row["total_earned"] += commission
+            row["last_sale"] = max(filter(None, (row["last_sale"], order.get("created_at"))), default=None)
+        else:
+            row["pending_count"] += 1
+            row["pending_earnings"] += commission
+    return list(earnings.values())
+
+
+def _unread_messages(store, conversation, reader_id):
+    return sum(1 for m in store.table("messages")
+               if m.get("conversation_id") == conversation.get("id")
+               and m.get("sender_id") != reader_id and not m.get("is_read"))
+
+
+def user_unread_counters(store):
+    counters = {}
+
+    def counter(user_id):
+        return counters.setdefault(user_id, {"user_id": user_id, "messages_unread": 0, "notifications_unread": 0})
+
+    for conversation in store.table("conversations"):
+        for column in ("buyer_id", "seller_id"):
+            if conversation.get(column):
+                counter(conversation[column])["messages_unread"] += _unread_messages(store, conversation, conversation[column])
+    for notification in store.table("notifications"):
+        if notification.get("user_id") and not notification.get("is_read"):
+            counter(notification["user_id"])["notifications_unread"] += 1
+    return list(counters.values())
+
+
+DERIVED = {
+    "order_counters": order_counters,
+    "affiliate_product_earnings": affiliate_product_earnings,
+    "user_unread_counters": user_unread_counters,
+}
+
+
+def product_seller_fields(store, product):
+    seller = next((p for p in store.table("profiles") if p.get("id") == product.get("seller_id")), {})
+    return {
+        "seller_is_verified": bool(seller.get("is_verified_seller")),
+        "listing_city_id": product.get("city_id") or seller.get("city_id"),
+    }
+
+
+def conversation_unread_fields(store, conversation):
+    return {
+        "unread_for_buyer": _unread_messages(store, conversation, conversation.get("buyer_id")),
+        "unread_for_seller": _unread_messages(store, conversation, conversation.get("seller_id")),
+    }
+
+
+CARD_COLUMNS = ("id", "seller_id", "name", "price", "original_price", "min_order_quantity", "stock_quantity",
+                "default_commission", "is_affiliate_enabled", "category_id", "city_id", "average_rating",
+                "total_reviews", "created_at", "image_placeholder")
+
+
+def product_cards(store):
+    cards = []
+    for product in store.table("products"):
+        fields = product_seller_fields(store, product)
+        seller = next((p for p in store.table("profiles") if p.get("id") == product.get("seller_id")), {})
+        category = next((c for c in store.table("categories") if c.get("id") == product.get("category_id")), None)
+        cards.append(dict(
+            {column: product.get(column) for column in CARD_COLUMNS},
+            image_url=product.get("image_url") or next(iter(product.get("images_url") or []), None),
+            profiles=dict({k: seller.get(k) for k in ("id", "full_name", "store_name", "avatar_url")},
+                          is_verified_seller=fields["seller_is_verified"]),
+            categories={k: category.get(k) for k in ("id", "name", "icon")} if category else None,
+            **fields,
+        ))
+    return cards
+
+
+DERIVED["product_cards"] = product_cards
+
+
+COMPUTED = {
+    "products": product_seller_fields,
+    "conversations": conversation_unread_fields,
+}
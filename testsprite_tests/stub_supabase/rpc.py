@@ -0,0 +1,306 @@
+"""Python stand-ins for the Postgres functions called through ``supabase.rpc``.
+
+Each function receives the store and the JSON arguments and mirrors the
+behaviour of the SQL function of the same name in supabase/migrations/.
+"""
+import uuid
+from collections import Counter
+from datetime import date, timedelta
+from difflib import SequenceMatcher
+
+from .derived import affiliate_product_earnings, conversation_unread_fields
+from .store import QueryError, now_iso
+
+
+def _find(store, table, row_id):
+    return next((r for r in store.table(table) if r.get("id") == row_id), None)
+
+
+def _uuid(value):
+    """Reject what a ``::UUID`` cast rejects, with the same Postgres error code."""
+    if value is None:
+        return None
+    try:
+        uuid.UUID(str(value))
+    except ValueError:
+        raise QueryError(f'invalid input syntax for type uuid: "{value}"', code="22P02")
+    return value
+
+
+def _update(store, table, row, **values):
+    old = dict(row)
+    row.update(values)
+    store.emit(table, "UPDATE", dict(row), old)
+
+
+def decrement_product_stock(store, product_id, quantity):
+    product = _find(store, "products", product_id)
+    if product is None or product.get("stock_quantity") is None:
+        return True
+    if product["stock_quantity"] < quantity:
+        return False
+    _update(store, "products", product, stock_quantity=product["stock_quantity"] - quantity)
+    return True
+
+
+def confirm_order_payment(store, params):
+    order = _find(store, "orders", params.get("p_order_id"))
+    if order is None:
+        return {"success": False, "error": "Order not found"}
+    if order.get("status") == "paid":
+        return {"success": True, "already_paid": True, "order": dict(order)}
+
+    stock_decremented = decrement_product_stock(store, order["product_id"], order.get("quantity") or 1)
+    _update(
+        store, "orders", order,
+        status="paid",
+        yabetoo_status=params.get("p_yabetoo_status") or order.get("yabetoo_status"),
+        yabetoo_intent_id=params.get("p_yabetoo_intent_id") or order.get("yabetoo_intent_id"),
+    )
+    return {"success": True, "stock_decremented": stock_decremented, "order": dict(order)}
+
+
+def _credit(store, profile_id, amount):
+    profile = _find(store, "profiles", profile_id)
+    if profile is None:
+        return None
+    _update(store, "profiles", profile, wallet_balance=float(profile.get("wallet_balance") or 0) + amount)
+    return profile["wallet_balance"]
+
+
+def _balance(store, profile_id):
+    return (_find(store, "profiles", profile_id) or {}).get("wallet_balance")
+
+
+def settle_order_delivery(store, params):
+    order = _find(store, "orders", _uuid(params.get("p_order_id")))
+    if order is None:
+        return {"success": False, "error": "Order not found"}
+    if order.get("status") == "delivered":
+        return {"success": True, "already_delivered": True, "order": dict(order),
+                "seller_balance": _balance(store, order["seller_id"]),
+                "affiliate_balance": _balance(store, order.get("affiliate_id"))}
+    if order.get("status") != "shipped":
+        return {"success": False, "error": "Order not shipped"}
+    if order.get("delivery_otp_hash") != (params.get("p_otp") or "").strip():
+        return {"success": False, "error": "Invalid OTP"}
+
+    _update(store, "orders", order, status="delivered")
+    amount = float(order["amount"])
+    commission = float(order.get("commission_amount") or 0)
+    quantity = order.get("quantity") or 1
+    product = _find(store, "products", order.get("product_id")) or {}
+    name = product.get("name") or "Produit"
+
+    seller_balance = _credit(store, order["seller_id"], amount - commission)
+    affiliate_balance = None
+    if order.get("affiliate_id") and commission > 0:
+        affiliate_balance = _credit(store, order["affiliate_id"], commission)
+    buyer_balance = _balance(store, order["buyer_id"])
+
+    common = {"order_id": order["id"], "product_name": name, "product_image": product.get("image_url"),
+              "quantity": quantity, "unit_price": amount / quantity}
+    ledger = [
+        dict(common, user_id=order["buyer_id"], type="purchase", amount=-amount,
+             balance_after=buyer_balance or 0, description=f"Achat de {quantity}x {name}"),
+        dict(common, user_id=order["seller_id"], type="sale", amount=amount - commission,
+             balance_after=seller_balance, description=f"Vente de {quantity}x {name}"),
+    ]
+    if affiliate_balance is not None:
+        rate = product.get("default_commission") or 0
+        ledger.append({"user_id": order["affiliate_id"], "type": "commission", "amount": commission,
+                       "balance_after": affiliate_balance, "order_id": order["id"], "product_name": name,
+                       "commission_rate": rate, "description": f"Commission {rate}% sur vente de {amount} FCFA"})
+    store.insert("transactions", ledger, [])
+    return {"success": True, "order": dict(order), "seller_balance": seller_balance,
+            "affiliate_balance": affiliate_balance, "buyer_balance": buyer_balance}
+
+
+def settle_order_deliveries(store, params):
+    # Same outcome as the SQL version; grouping the writes only matters in Postgres
+    deliveries = params.get("p_deliveries")
+    if deliveries is None:
+        deliveries = []
+    if not isinstance(deliveries, list):
+        kind = "an object" if isinstance(deliveries, dict) else "a scalar"
+        raise QueryError(f"cannot extract elements from {kind}", code="22023")
+    # Every id is cast before anything is locked or written: one bad id fails the whole call
+    order_ids = [_uuid(d.get("order_id")) if isinstance(d, dict) else None for d in deliveries]
+
+    results, balances, seen = [], {}, set()
+    for delivery, order_id in zip(deliveries, order_ids):
+        otp = delivery.get("otp") if isinstance(delivery, dict) else None
+        if order_id in seen and _find(store, "orders", order_id) is not None:
+            results.append({"order_id": order_id, "success": False, "error": "Duplicate order"})
+            continue
+        seen.add(order_id)
+        outcome = settle_order_delivery(store, {"p_order_id": order_id, "p_otp": otp})
+        result = {"order_id": order_id, "success": outcome["success"]}
+        if not outcome["success"]:
+            result["error"] = outcome["error"]
+        elif outcome.get("already_delivered"):
+            result["already_delivered"] = True
+        else:
+            order = outcome["order"]
+            balances[order["seller_id"]] = outcome["seller_balance"]
+            if outcome["affiliate_balance"] is not None:
+                balances[order["affiliate_id"]] = outcome["affiliate_balance"]
+        results.append(result)
+    settled = sum(1 for r in results if r["success"] and not r.get("already_delivered"))
+    return {"success": True, "settled": settled, "results": results, "balances": balances}
+
+
+def get_admin_stats(store, params):
+    orders = store.table("orders")
+    profiles = store.table("profiles")
+    delivered = [o for o in orders if o.get("status") == "delivered"]
+    withdrawals = [t for t in store.table("transactions")
+                   if t.get("type") == "withdrawal" and t.get("status") == "pending"]
+    today = now_iso()[:10]
+    roles = Counter(p.get("role") for p in profiles)
+    return {
+        "total_gmv": sum(float(o.get("amount") or 0) for o in delivered),
+        "total_commissions": sum(float(o.get("commission_amount") or 0) for o in delivered),
+        "total_orders": len(delivered),
+        "completed_today": sum(1 for o in delivered if (o.get("created_at") or "").startswith(today)),
+        "total_sellers": roles["seller"],
+        "verified_sellers": sum(1 for p in profiles if p.get("role") == "seller" and p.get("kyc_verified")),
+        "total_affiliates": roles["affiliate"],
+        "total_buyers": roles["buyer"],
+        "total_products": len(store.table("products")),
+        "active_orders": sum(1 for o in orders if o.get("status") in ("pending", "processing", "shipped")),
+        "pending_withdrawals": len(withdrawals),
+        "pending_withdrawal_amount": sum(float(t.get("amount") or 0) for t in withdrawals),
+        "refreshed_at": now_iso(),
+    }
+
+
+def get_admin_stats_series(store, params):
+    bucket = params.get("p_bucket") or "day"
+    if bucket not in ("day", "week", "month"):
+        raise QueryError(f"Unknown bucket: {bucket}", code="P0001")
+    today = date.fromisoformat(now_iso()[:10])
+    start = date.fromisoformat(params.get("p_from") or str(today - timedelta(days=30)))
+    end = date.fromisoformat(params.get("p_to") or str(today))
+    points = {}
+    for order in store.table("orders"):
+        day = date.fromisoformat((order.get("created_at") or "")[:10] or str(today))
+        if not start <= day <= end:
+            continue
+        if bucket == "week":
+            day -= timedelta(days=day.weekday())  # date_trunc('week') starts on Monday
+        elif bucket == "month":
+            day = day.replace(day=1)
+        point = points.setdefault(day, {"bucket": str(day), "gmv": 0, "commissions": 0,
+                                        "delivered_orders": 0, "created_orders": 0})
+        point["created_orders"] += 1
+        if order.get("status") == "delivered":
+            point["gmv"] += float(order.get("amount") or 0)
+            point["commissions"] += float(order.get("commission_amount") or 0)
+            point["delivered_orders"] += 1
+    return [points[day] for day in sorted(points)]
+
+
+def get_affiliate_stats(store, params):
+    rows = [r for r in affiliate_product_earnings(store) if r["affiliate_id"] == params.get("p_affiliate_id")]
+    sold = sorted((r for r in rows if r["sales_count"]), key=lambda r: (-r["total_earned"], r["product_id"]))
+    offset = params.get("p_offset") or 0
+    page = []
+    for row in sold[offset:offset + (params.get("p_limit") or 20)]:
+        product = _find(store, "products", row["product_id"]) or {}
+        page.append({"product_id": row["product_id"], "product_name": product.get("name") or "Produit",
+                     "product_image": product.get("image_url") or "", "product_price": product.get("price") or 0,
+                     "sales_count": row["sales_count"], "total_earned": row["total_earned"],
+                     "last_sale": row["last_sale"]})
+    return {
+        "total_earned": sum(r["total_earned"] for r in rows),
+        "pending_earnings": sum(r["pending_earnings"] for r in rows),
+        "sales_count": sum(r["sales_count"] for r in rows),
+        "pending_sales_count": sum(r["pending_count"] for r in rows),
+        "product_count": len(sold),
+        "sales_by_product": page,
+    }
+
+
+def _search_rank(product, store, words):
+    """Rough stand-in for ts_rank + word_similarity: weighted hits, fuzzy on the name."""
+    category = _find(store, "categories", product.get("category_id")) or {}
+    seller = _find(store, "profiles", product.get("seller_id")) or {}
+    fields = ((product.get("name"), 1.0), (category.get("name"), 0.4),
+              (seller.get("store_name") or seller.get("full_name"), 0.2), (product.get("description"), 0.1))
+    rank = 0.0
+    for word in words:
+        for text, weight in fields:
+            if text and word in text.lower():
+                rank += weight
+        name_words = (product.get("name") or "").lower().split()
+        rank += max((SequenceMatcher(None, word, w).ratio() for w in name_words), default=0) * 0.5
+    return round(rank, 6)
+
+
+def search_products(store, params):
+    words = (params.get("p_query") or "").lower().split()
+    categories = params.get("p_categories") or []
+    matches = []
+    for product in store.table("products"):
+        rank = _search_rank(product, store, words)
+        seller = _find(store, "profiles", product.get("seller_id")) or {}
+        if rank < 0.4 * len(words):
+            continue
+        if categories and product.get("category_id") not in categories:
+            continue
+        if params.get("p_verified_only") and not seller.get("is_verified_seller"):
+            continue
+        if params.get("p_city_id") and (product.get("city_id") or seller.get("city_id")) != params["p_city_id"]:
+            continue
+        if params.get("p_moq_one") and product.get("min_order_quantity") != 1:
+            continue
+        if params.get("p_promo_only") and product.get("original_price") is None:
+            continue
+        if params.get("p_seller_id") and product.get("seller_id") != params["p_seller_id"]:
+            continue
+        category = _find(store, "categories", product.get("category_id"))
+        matches.append(dict(
+            {k: v for k, v in product.items() if k != "search_vector"},
+            profiles={k: seller.get(k) for k in ("id", "full_name", "is_verified_seller", "avatar_url",
+                                                 "store_name", "total_sales_count", "average_rating")},
+            categories={k: category.get(k) for k in ("id", "name", "icon")} if category else None,
+            search_rank=rank,
+        ))
+
+    sort = params.get("p_sort") or "relevance"
+    column = {"price_asc": "price", "price_desc": "price", "newest": "created_at"}.get(sort, "search_rank")
+    ascending = sort == "price_asc"
+    matches.sort(key=lambda p: (p[column], p["id"]), reverse=not ascending)
+    if params.get("p_after_id"):
+        after = (type(matches[0][column])(params["p_after_value"]) if matches else None, params["p_after_id"])
+        matches = [p for p in matches
+                   if ((p[column], p["id"]) > after if ascending else (p[column], p["id"]) < after)]
+    offset = params.get("p_offset") or 0
+    return matches[offset:offset + (params.get("p_limit") or 20)]
+
+
+def mark_conversation_read(store, params):
+    user_id = params.get("p_user_id")
+    conversation = _find(store, "conversations", params.get("p_conversation_id"))
+    if conversation is None or user_id not in (conversation.get("buyer_id"), conversation.get("seller_id")):
+        return {"success": False, "error": "Conversation not found"}
+    role = "buyer" if user_id == conversation.get("buyer_id") else "seller"
+    cleared = conversation_unread_fields(store, conversation)[f"unread_for_{role}"]
+    for message in store.table("messages"):
+        if (message.get("conversation_id") == conversation["id"] and message.get("sender_id") != user_id
+                and not message.get("is_read")):
+            _update(store, "messages", message, is_read=True, read_at=now_iso())
+    return {"success": True, "cleared": cleared}
+
+
+RPCS = {
+    "confirm_order_payment": confirm_order_payment,
+    "settle_order_delivery": settle_order_delivery,
+    "settle_order_deliveries": settle_order_deliveries,
+    "get_admin_stats": get_admin_stats,
+    "get_admin_stats_series": get_admin_stats_series,
+    "get_affiliate_stats": get_affiliate_stats,
+    "search_products": search_products,
+    "mark_conversation_read": mark_conversation_read,
+}
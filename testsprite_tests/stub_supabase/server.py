@@ -0,0 +1,303 @@
+"""aiohttp application serving the PostgREST, auth and realtime endpoints.
+
+Requires ``aiohttp``. The app talks to it when the Vite dev server is started
+with ``VITE_SUPABASE_URL`` pointing at the stand-in (see __init__.py).
+"""
+import asyncio
+import base64
+import json
+import time
+import uuid
+
+from aiohttp import WSMsgType, web
+
+from .rpc import RPCS
+from .store import QueryError, Store, now_iso
+
+ACCESS_TOKEN_TTL_S = 3600
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, PATCH, PUT, DELETE, HEAD, OPTIONS",
+    "Access-Control-Allow-Headers": "*",
+    "Access-Control-Expose-Headers": "Content-Range, Range",
+}
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+
+def make_jwt(user, expires_at):
+    # Unsigned: supabase-js only decodes the payload, nothing verifies it here
+    header = {"alg": "HS256", "typ": "JWT"}
+    payload = {"sub": user["id"], "email": user["email"], "role": "authenticated",
+               "aud": "authenticated", "exp": expires_at, "iat": int(time.time())}
+    return f"{_b64(header)}.{_b64(payload)}.stub"
+
+
+def public_user(user):
+    return {
+        "id": user["id"],
+        "aud": "authenticated",
+        "role": "authenticated",
+        "email": user["email"],
+        "email_confirmed_at": user.get("created_at", now_iso()),
+        "app_metadata": {"provider": "email", "providers": ["email"]},
+        "user_metadata": user.get("user_metadata", {}),
+        "created_at": user.get("created_at", now_iso()),
+    }
+
+
+def json_response(data, status=200, headers=None):
+    return web.json_response(data, status=status, headers=headers, dumps=lambda d: json.dumps(d, default=str))
+
+
+def error_response(exc):
+    return json_response(exc.body, status=exc.status)
+
+
+class StubSupabase:
+    def __init__(self, store):
+        self.store = store
+        self.sessions = {}        # access or refresh token -> user id
+        self.sockets = []         # one {"ws", "channels"} dict per realtime client
+        store.listeners.append(self._broadcast)
+
+    # --- PostgREST ----------------------------------------------------------
+
+    async def rest(self, request):
+        table = request.match_info["table"]
+        params = list(request.query.items())
+        prefer = request.headers.get("Prefer", "")
+        single = "vnd.pgrst.object" in request.headers.get("Accept", "")
+        try:
+            if request.method in ("GET", "HEAD"):
+                return self._select(request, table, params, prefer, single)
+            body = await request.json() if request.can_read_body else {}
+            if request.method == "POST":
+                records = body if isinstance(body, list) else [body]
+                rows = self.store.insert(table, records, params, upsert="resolution=merge-duplicates" in prefer)
+                status = 201
+            elif request.method == "PATCH":
+                rows = self.store.update(table, body, params)
+                status = 200
+            elif request.method == "DELETE":
+                rows = self.store.delete(table, params)
+                status = 200
+            else:
+                raise QueryError(f"Unsupported method {request.method}", status=405)
+        except QueryError as exc:
+            return error_response(exc)
+
+        if "return=representation" not in prefer:
+            return web.Response(status=204)
+        if single:
+            if len(rows) != 1:
+                return self._not_single(len(rows))
+            return json_response(rows[0], status=status)
+        return json_response(rows, status=status)
+
+    def _select(self, request, table, params, prefer, single):
+        range_ = None
+        if "Range" in request.headers:
+            start, _, end = request.headers["Range"].partition("-")
+            range_ = (int(start), int(end))
+        count = "count=exact" in prefer or "count=planned" in prefer or "count=estimated" in prefer
+        rows, total, start = self.store.select(table, params, count=count, range_=range_)
+        end = start + len(rows) - 1
+        headers = {"Content-Range": f"{start}-{end}/{total if total is not None else '*'}" if rows
+                   else f"*/{total if total is not None else '*'}"}
+        if request.method == "HEAD":
+            return web.Response(status=200, headers=headers)
+        if single:
+            if len(rows) != 1:
+                return self._not_single(len(rows))
+            return json_response(rows[0], headers=headers)
+        return json_response(rows, headers=headers)
+
+    @staticmethod
+    def _not_single(found):
+        return json_response({
+            "code": "PGRST116",
+            "message": "JSON object requested, multiple (or no) rows returned",
+            "details": f"The result contains {found} rows",
+            "hint": None,
+        }, status=406)
+
+    async def rpc(self, request):
+        name = request.match_info["name"]
+        func = RPCS.get(name)
+        if func is None:
+            return json_response({"code": "PGRST202", "message": f"Could not find the function public.{name}",
+                                  "details": None, "hint": None}, status=404)
+        params = await request.json() if request.can_read_body else dict(request.query)
+        try:
+            return json_response(func(self.store, params or {}))
+        except QueryError as exc:
+            return error_response(exc)
+
+    # --- auth ---------------------------------------------------------------
+
+    def _session(self, user):
+        expires_at = int(time.time()) + ACCESS_TOKEN_TTL_S
+        access_token = make_jwt(user, expires_at)
+        refresh_token = uuid.uuid4().hex
+        self.sessions[access_token] = user["id"]
+        self.sessions[refresh_token] = user["id"]
+        return {
+            "access_token": access_token,
+            "token_type": "bearer",
+            "expires_in": ACCESS_TOKEN_TTL_S,
+            "expires_at": expires_at,
+            "refresh_token": refresh_token,
+            "user": public_user(user),
+        }
+
+    def _user_by_id(self, user_id):
+        return next((u for u in self.store.users if u["id"] == user_id), None)
+
+    def _bearer_user(self, request):
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        return self._user_by_id(self.sessions.get(token))
+
+    async def token(self, request):
+        body = await request.json()
+        grant = request.query.get("grant_type")
+        if grant == "password":
+            user = next((u for u in self.store.users
+                         if u["email"].lower() == (body.get("email") or "").lower()
+                         and u["password"] == body.get("password")), None)
+        elif grant == "refresh_token":
+            user = self._user_by_id(self.sessions.get(body.get("refresh_token")))
+        else:
+            user = None
+        if user is None:
+            return json_response({"error": "invalid_grant", "error_description": "Invalid login credentials",
+                                  "code": 400, "msg": "Invalid login credentials"}, status=400)
+        return json_response(self._session(user))
+
+    async def signup(self, request):
+        body = await request.json()
+        email = (body.get("email") or "").lower()
+        if any(u["email"].lower() == email for u in self.store.users):
+            return json_response({"code": 422, "error_code": "user_already_exists",
+                                  "msg": "User already registered"}, status=422)
+        metadata = (body.get("data") or {})
+        user = {"id": str(uuid.uuid4()), "email": email, "password": body.get("password"),
+                "user_metadata": metadata, "created_at": now_iso()}
+        self.store.users.append(user)
+        # Mirrors the handle_new_user trigger
+        self.store.insert("profiles", [{"id": user["id"], "full_name": metadata.get("full_name"),
+                                        "role": metadata.get("role", "buyer"), "wallet_balance": 0}], [])
+        return json_response(self._session(user))
+
+    async def user(self, request):
+        user = self._bearer_user(request)
+        if user is None:
+            return json_response({"code": 401, "msg": "invalid JWT"}, status=401)
+        if request.method == "PUT":
+            body = await request.json()
+            if body.get("password"):
+                user["password"] = body["password"]
+            user.setdefault("user_metadata", {}).update(body.get("data") or {})
+        return json_response(public_user(user))
+
+    async def logout(self, request):
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        self.sessions.pop(token, None)
+        return web.Response(status=204)
+
+    # --- realtime -----------------------------------------------------------
+
+    async def realtime(self, request):
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        socket = {"ws": ws, "channels": {}}
+        self.sockets.append(socket)
+        try:
+            async for msg in ws:
+                if msg.type == WSMsgType.TEXT:
+                    await self._on_realtime_message(socket, json.loads(msg.data))
+        finally:
+            self.sockets.remove(socket)
+        return ws
+
+    async def _on_realtime_message(self, socket, message):
+        topic, event, ref = message.get("topic"), message.get("event"), message.get("ref")
+        response = {}
+        if event == "phx_join":
+            changes = []
+            for spec in (message.get("payload", {}).get("config", {}).get("postgres_changes") or []):
+                changes.append({"id": len(changes) + 1, **spec})
+            socket["channels"][topic] = {"changes": changes, "join_ref": message.get("join_ref") or ref}
+            response = {"postgres_changes": changes}
+        elif event == "phx_leave":
+            socket["channels"].pop(topic, None)
+        await socket["ws"].send_json({"topic": topic, "event": "phx_reply", "ref": ref,
+                                      "join_ref": message.get("join_ref"),
+                                      "payload": {"status": "ok", "response": response}})
+        if event == "phx_join":
+            await socket["ws"].send_json({"topic": topic, "event": "system", "ref": None,
+                                          "payload": {"status": "ok", "message": "Subscribed to PostgreSQL",
+                                                      "extension": "postgres_changes", "channel": topic}})
+
+    def _broadcast(self, table, change, record, old_record):
+        for socket in list(self.sockets):
+            for topic, channel in socket["channels"].items():
+                ids = [c["id"] for c in channel["changes"] if self._wants(c, table, change, record or old_record)]
+                if not ids:
+                    continue
+                frame = {"topic": topic, "event": "postgres_changes", "ref": None,
+                         "join_ref": channel["join_ref"],
+                         "payload": {"ids": ids, "data": {
+                             "schema": "public", "table": table, "type": change,
+                             "commit_timestamp": now_iso(), "columns": [], "errors": None,
+                             "record": record, "old_record": old_record}}}
+                asyncio.ensure_future(socket["ws"].send_str(json.dumps(frame, default=str)))
+
+    @staticmethod
+    def _wants(spec, table, change, row):
+        if spec.get("table") not in (None, "*", table):
+            return False
+        if spec.get("event") not in (None, "*", change):
+            return False
+        if spec.get("filter"):
+            column, _, rest = spec["filter"].partition("=")
+            op, _, value = rest.partition(".")
+            if op == "in":
+                return str(row.get(column)) in value.strip("()").split(",")
+            return op == "eq" and str(row.get(column)) == value
+        return True
+
+
+def create_app(store):
+    stub = StubSupabase(store)
+
+    @web.middleware
+    async def cors(request, handler):
+        if request.method == "OPTIONS":
+            return web.Response(status=204, headers=CORS_HEADERS)
+        response = await handler(request)
+        if not isinstance(response, web.WebSocketResponse):
+            response.headers.update(CORS_HEADERS)
+        return response
+
+    app = web.Application(middlewares=[cors])
+    app["stub"] = stub
+    app.router.add_route("*", "/rest/v1/rpc/{name}", stub.rpc)
+    app.router.add_route("*", "/rest/v1/{table}", stub.rest)
+    app.router.add_post("/auth/v1/token", stub.token)
+    app.router.add_post("/auth/v1/signup", stub.signup)
+    app.router.add_route("*", "/auth/v1/user", stub.user)
+    app.router.add_post("/auth/v1/logout", stub.logout)
+    app.router.add_get("/realtime/v1/websocket", stub.realtime)
+    return app
+
+
+async def start_server(fixtures_path, host="127.0.0.1", port=54321):
+    """Start the stand-in on the running loop and return its AppRunner."""
+    runner = web.AppRunner(create_app(Store.from_file(fixtures_path)))
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
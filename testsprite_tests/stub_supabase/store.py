@@ -0,0 +1,342 @@
+"""In-memory tables and the subset of PostgREST the services rely on.
+
+Supports ``select`` with embedded resources (``products(name)``,
+``seller:profiles!orders_seller_id_fkey(full_name)``, ``!inner``), the usual
+filter operators including ``or=(...)`` and ``not.``, ``order``, ranges,
+exact counts, inserts/upserts, updates and deletes. Tables that are not in
+the fixtures behave as empty tables rather than erroring; trigger-maintained
+tables are computed on read (derived.py).
+"""
+import copy
+import json
+import re
+import uuid
+from datetime import datetime, timezone
+
+from .derived import COMPUTED, DERIVED
+
+# Many-to-one relations that don't follow the ``<singular target>_id`` rule
+FOREIGN_KEYS = {
+    ("products", "profiles"): "seller_id",
+    ("kyc_requests", "profiles"): "seller_id",
+    ("affiliate_links", "profiles"): "affiliate_id",
+    ("reviews", "profiles"): "buyer_id",
+    ("transactions", "profiles"): "user_id",
+    ("notifications", "profiles"): "user_id",
+}
+
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+
+class QueryError(Exception):
+    def __init__(self, message, code="PGRST100", status=400, details=None):
+        super().__init__(message)
+        self.status = status
+        self.body = {"code": code, "message": message, "details": details, "hint": None}
+
+
+def now_iso():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def singular(name):
+    if name.endswith("ies"):
+        return name[:-3] + "y"
+    return name[:-1] if name.endswith("s") else name
+
+
+def split_top_level(text, sep=","):
+    """Split on ``sep`` outside parentheses."""
+    parts, depth, current = [], 0, []
+    for char in text:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == sep and depth == 0:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+# --- select ---------------------------------------------------------------
+
+_EMBED = re.compile(r"^(?:(?P<alias>\w+):)?(?P<name>\w+)(?:!(?P<hint>\w+))?(?:!(?P<inner>inner))?\((?P<inner_select>.*)\)$", re.S)
+
+
+def parse_select(text):
+    """Return a list of ('column', alias, name) / ('embed', alias, name, hint, inner, children)."""
+    fields = []
+    for item in split_top_level(re.sub(r"\s+", "", text or "*")):
+        match = _EMBED.match(item)
+        if match:
+            hint, inner = match.group("hint"), bool(match.group("inner"))
+            if hint == "inner":
+                hint, inner = None, True
+            fields.append(("embed", match.group("alias") or match.group("name"), match.group("name"),
+                           hint, inner, parse_select(match.group("inner_select"))))
+            continue
+        item = item.split("::")[0]
+        alias, _, name = item.rpartition(":")
+        fields.append(("column", alias or name, name))
+    return fields
+
+
+# --- filters --------------------------------------------------------------
+
+def _coerce(value, text):
+    """Compare a stored value with the textual operand of a filter."""
+    if isinstance(value, bool):
+        return value, text.lower() == "true"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        try:
+            return value, float(text)
+        except ValueError:
+            return str(value), text
+    return ("" if value is None else str(value)), text
+
+
+def _like(pattern, value, flags=0):
+    regex = "^" + re.escape(pattern).replace("%", ".*").replace("\\*", ".*").replace("_", ".") + "$"
+    return value is not None and re.match(regex, str(value), flags | re.S) is not None
+
+
+def _matches(value, op, operand):
+    if op == "is":
+        expected = {"null": None, "true": True, "false": False}.get(operand.lower(), operand)
+        return value is expected if expected is None else value == expected
+    if op == "in":
+        options = [o.strip().strip('"') for o in operand.strip("()").split(",")]
+        return any(_matches(value, "eq", o) for o in options)
+    if op in ("like", "ilike"):
+        return _like(operand, value, re.I if op == "ilike" else 0)
+    if value is None:
+        return False
+    left, right = _coerce(value, operand)
+    return {
+        "eq": left == right,
+        "neq": left != right,
+        "gt": left > right,
+        "gte": left >= right,
+        "lt": left < right,
+        "lte": left <= right,
+    }.get(op, False)
+
+
+def parse_condition(column, expression):
+    """``eq.5`` / ``not.is.null`` -> (column, negate, op, operand)."""
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    op, _, operand = expression.partition(".")
+    # PostgREST lets operands be double-quoted (timestamps, values with commas)
+    if len(operand) > 1 and operand[0] == operand[-1] == '"':
+        operand = operand[1:-1]
+    return column, negate, op, operand
+
+
+def parse_logic(expression):
+    """``(a.eq.1,b.ilike.%x%)`` -> list of conditions (nested and/or supported)."""
+    conditions = []
+    for part in split_top_level(expression.strip()[1:-1]):
+        part = part.strip()
+        for logic in ("or", "and"):
+            if part.startswith(logic + "("):
+                conditions.append((logic, parse_logic(part[len(logic):])))
+                break
+        else:
+            column, _, rest = part.partition(".")
+            conditions.append(("cond", parse_condition(column, rest)))
+    return conditions
+
+
+def _get(row, column):
+    # Embedded filters (profiles.is_verified_seller) look into the embed
+    for key in column.split("."):
+        row = row.get(key) if isinstance(row, dict) else None
+    return row
+
+
+def evaluate(row, condition):
+    kind, payload = condition
+    if kind == "or":
+        return any(evaluate(row, c) for c in payload)
+    if kind == "and":
+        return all(evaluate(row, c) for c in payload)
+    column, negate, op, operand = payload
+    return _matches(_get(row, column), op, operand) != negate
+
+
+def parse_filters(params):
+    filters = []
+    for key, value in params:
+        if key in RESERVED_PARAMS:
+            continue
+        if key in ("or", "and"):
+            filters.append((key, parse_logic(value)))
+        else:
+            filters.append(("cond", parse_condition(key, value)))
+    return filters
+
+
+# --- store ----------------------------------------------------------------
+
+class Store:
+    def __init__(self, fixtures):
+        self.tables = copy.deepcopy(fixtures.get("tables", {}))
+        self.users = copy.deepcopy(fixtures.get("users", []))
+        self.listeners = []
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding="utf-8") as fh:
+            return cls(json.load(fh))
+
+    def table(self, name):
+        return self.tables.setdefault(name, [])
+
+    def emit(self, table, change, record, old_record=None):
+        for listener in self.listeners:
+            listener(table, change, record, old_record or {})
+
+    # Relations ------------------------------------------------------------
+
+    def _relation(self, table, target, hint):
+        """Return ('one', fk column on table) or ('many', fk column on target)."""
+        if hint:
+            if hint.endswith("_fkey"):
+                if hint.startswith(table + "_"):
+                    return "one", hint[len(table) + 1:-5]
+                if hint.startswith(target + "_"):
+                    return "many", hint[len(target) + 1:-5]
+            return "one", hint
+        if (table, target) in FOREIGN_KEYS:
+            return "one", FOREIGN_KEYS[(table, target)]
+        column = singular(target) + "_id"
+        rows = self.table(table)
+        if rows and column in rows[0]:
+            return "one", column
+        return "many", singular(table) + "_id"
+
+    def project(self, table, row, fields):
+        out = {}
+        for field in fields:
+            if field[0] == "column":
+                _, alias, name = field
+                if name == "*":
+                    out.update({k: v for k, v in row.items() if not k.startswith("_")})
+                else:
+                    out[alias] = row.get(name)
+                continue
+            _, alias, target, hint, _inner, children = field
+            kind, column = self._relation(table, target, hint)
+            if kind == "one":
+                match = next((r for r in self.table(target) if r.get("id") == row.get(column)), None)
+                out[alias] = self.project(target, match, children) if match else None
+            else:
+                out[alias] = [self.project(target, r, children)
+                              for r in self.table(target) if r.get(column) == row.get("id")]
+        return out
+
+    # Queries --------------------------------------------------------------
+
+    def select(self, table, params, count=False, range_=None):
+        fields = parse_select(dict(params).get("select"))
+        filters = parse_filters(params)
+        embedded = [f for f in filters if f[0] == "cond" and "." in f[1][0]]
+        plain = [f for f in filters if f not in embedded]
+
+        source = DERIVED[table](self) if table in DERIVED else self.table(table)
+        if table in COMPUTED:
+            source = [dict(row, **COMPUTED[table](self, row)) for row in source]
+        rows = [r for r in source if all(evaluate(r, f) for f in plain)]
+        rows = self._order(rows, dict(params).get("order"))
+        rows = [self.project(table, row, fields) for row in rows]
+        for field in fields:
+            if field[0] == "embed" and field[4]:
+                rows = [r for r in rows if r.get(field[1])]
+        # Like PostgREST, a filter on an embed only nulls the embed out
+        for condition in embedded:
+            embed = condition[1][0].split(".")[0]
+            for row in rows:
+                if row.get(embed) is not None and not evaluate(row, condition):
+                    row[embed] = None
+
+        total = len(rows)
+        start, end = self._range(params, range_, total)
+        return rows[start:end + 1], (total if count else None), start
+
+    @staticmethod
+    def _order(rows, order):
+        if not order:
+            return rows
+        for term in reversed(split_top_level(order)):
+            column, *modifiers = term.split(".")
+            if "(" in column:
+                continue
+            descending = "desc" in modifiers
+            nulls_first = "nullsfirst" in modifiers or ("nullslast" not in modifiers and descending)
+            present = [r for r in rows if r.get(column) is not None]
+            missing = [r for r in rows if r.get(column) is None]
+            present.sort(key=lambda r: r[column], reverse=descending)
+            rows = missing + present if nulls_first else present + missing
+        return rows
+
+    @staticmethod
+    def _range(params, range_, total):
+        values = dict(params)
+        start = int(values.get("offset", 0))
+        end = total - 1
+        if "limit" in values:
+            end = start + int(values["limit"]) - 1
+        if range_:
+            start, end = range_
+        return start, min(end, total - 1)
+
+    def insert(self, table, records, params, upsert=False):
+        rows = self.table(table)
+        conflict = (dict(params).get("on_conflict") or "id").split(",")
+        inserted = []
+        for record in records:
+            record = dict(record)
+            existing = None
+            if upsert:
+                existing = next((r for r in rows if all(r.get(c) == record.get(c) for c in conflict)), None)
+            if existing is not None:
+                old = dict(existing)
+                existing.update(record)
+                inserted.append(existing)
+                self.emit(table, "UPDATE", dict(existing), old)
+                continue
+            record.setdefault("id", str(uuid.uuid4()))
+            record.setdefault("created_at", now_iso())
+            rows.append(record)
+            inserted.append(record)
+            self.emit(table, "INSERT", dict(record))
+        return self._returning(table, inserted, params)
+
+    def update(self, table, values, params):
+        targets = self._targets(table, params)
+        for row in targets:
+            old = dict(row)
+            row.update(values)
+            self.emit(table, "UPDATE", dict(row), old)
+        return self._returning(table, targets, params)
+
+    def delete(self, table, params):
+        targets = self._targets(table, params)
+        self.tables[table] = [r for r in self.table(table) if r not in targets]
+        for row in targets:
+            self.emit(table, "DELETE", {}, dict(row))
+        return self._returning(table, targets, params)
+
+    def _targets(self, table, params):
+        filters = parse_filters(params)
+        return [r for r in self.table(table) if all(evaluate(r, f) for f in filters)]
+
+    def _returning(self, table, rows, params):
+        fields = parse_select(dict(params).get("select"))
+        return [self.project(table, row, fields) for row in rows]
@@ -0,0 +1 @@
+"""Shared helpers for the testsprite Playwright scenarios."""
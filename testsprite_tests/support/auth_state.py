@@ -0,0 +1,116 @@
+"""Log in once per role and reuse the Playwright storage state.
+
+The Supabase session lives in localStorage under ``zwa-auth-token`` (see
+src/lib/supabase.ts), so a saved ``storage_state`` is enough for a new
+context to start authenticated. States are cached in tmp/auth/ keyed by role
+and build, and are refreshed only when the access token is about to expire.
+
+Credentials default to ``loginUser``/``loginPassword`` from tmp/config.json
+(or to the fixture user of that role when the Supabase stand-in is enabled)
+and can be overridden per role with ``ZWA_<ROLE>_EMAIL``/``ZWA_<ROLE>_PASSWORD``.
+"""
+import asyncio
+import json
+import os
+import subprocess
+import time
+
+import stub_supabase
+
+from .config import CONFIG, DEFAULT_TIMEOUT_MS, TESTS_DIR, TMP_DIR
+from . import readiness as ready
+from . import replay
+
+ROLES = ("buyer", "seller", "affiliate", "admin")
+
+AUTH_DIR = TMP_DIR / "auth"
+SESSION_KEY = "zwa-auth-token"
+
+# Refresh a cached state when its JWT expires within this many seconds
+EXPIRY_MARGIN_S = int(os.environ.get("ZWA_AUTH_EXPIRY_MARGIN_S", "300"))
+
+_locks = {}
+
+
+def credentials(role):
+    prefix = f"ZWA_{role.upper()}_"
+    email, password = CONFIG.get("loginUser"), CONFIG.get("loginPassword")
+    if stub_supabase.enabled():
+        email, password = stub_supabase.role_credentials(role) or (email, password)
+    return (
+        os.environ.get(prefix + "EMAIL", email),
+        os.environ.get(prefix + "PASSWORD", password),
+    )
+
+
+def build_id():
+    """Identify the app build: ZWA_BUILD_ID, else the current git commit."""
+    if os.environ.get("ZWA_BUILD_ID"):
+        return os.environ["ZWA_BUILD_ID"]
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=TESTS_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip() or "dev"
+    except (OSError, subprocess.CalledProcessError):
+        return "dev"
+
+
+def state_path(role):
+    # Sessions issued by the stand-in are useless against the hosted project
+    backend = "stub" if stub_supabase.enabled() else "live"
+    return AUTH_DIR / f"{role}-{build_id()}-{backend}.json"
+
+
+def session_expires_at(state):
+    """Return the ``expires_at`` (epoch seconds) of the Supabase session, or None."""
+    for origin in state.get("origins", []):
+        for item in origin.get("localStorage", []):
+            if item.get("name") != SESSION_KEY:
+                continue
+            try:
+                return json.loads(item["value"]).get("expires_at")
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+def is_fresh(path):
+    try:
+        with open(path, encoding="utf-8") as fh:
+            expires_at = session_expires_at(json.load(fh))
+    except (OSError, ValueError):
+        return False
+    return bool(expires_at) and expires_at - time.time() > EXPIRY_MARGIN_S
+
+
+async def login(browser, role, path):
+    email, password = credentials(role)
+    context = await browser.new_context()
+    context.set_default_timeout(DEFAULT_TIMEOUT_MS)
+    await replay.attach(context)
+    try:
+        page = await ready.open_app(context, "/auth")
+        await ready.fill(page.locator('form input[type="email"]'), email)
+        await ready.fill(page.locator('form input[type="password"]'), password)
+        await ready.click(page.locator('form button[type="submit"]'))
+        await page.wait_for_function(
+            f"() => !!window.localStorage.getItem('{SESSION_KEY}')", timeout=15000,
+        )
+        await ready.settle(page)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        await context.storage_state(path=str(path))
+    finally:
+        await context.close()
+
+
+async def storage_state(browser, role):
+    """Return the path of a valid storage state for ``role``, logging in if needed."""
+    if role not in ROLES:
+        raise ValueError(f"Unknown role {role!r}, expected one of {ROLES}")
+    lock = _locks.setdefault(role, asyncio.Lock())
+    async with lock:
+        path = state_path(role)
+        if not is_fresh(path):
+            await login(browser, role, path)
+        return str(path)
@@ -0,0 +1,48 @@
+"""Suite-wide settings, read from tmp/config.json with env overrides."""
+import json
+import os
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+TMP_DIR = TESTS_DIR / "tmp"
+
+
+def load_config():
+    with open(TMP_DIR / "config.json", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+CONFIG = load_config()
+
+# Where the Vite dev server (or a preview build) is listening
+BASE_URL = os.environ.get("ZWA_BASE_URL", CONFIG.get("localEndpoint", "http://localhost:5173")).rstrip("/")
+
+
+def _read_dotenv(path):
+    values = {}
+    try:
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                key, sep, value = line.strip().partition("=")
+                if sep and not key.startswith("#"):
+                    values[key.strip()] = value.strip().strip('"').strip("'")
+    except OSError:
+        pass
+    return values
+
+
+# Supabase project the app talks to, for tools that call its REST API directly
+# (load generator). Falls back to the app's own .env.
+_dotenv = _read_dotenv(TESTS_DIR.parent / ".env")
+SUPABASE_URL = os.environ.get("VITE_SUPABASE_URL", _dotenv.get("VITE_SUPABASE_URL", "")).rstrip("/")
+SUPABASE_ANON_KEY = os.environ.get("VITE_SUPABASE_ANON_KEY", _dotenv.get("VITE_SUPABASE_ANON_KEY", ""))
+
+# Default per-action timeout handed to every browser context
+DEFAULT_TIMEOUT_MS = int(os.environ.get("ZWA_DEFAULT_TIMEOUT_MS", "5000"))
+
+# Path prefixes of the Supabase services the app talks to
+SUPABASE_PATHS = ("/rest/v1/", "/auth/v1/", "/storage/v1/", "/functions/v1/")
+
+
+def is_supabase_request(url):
+    return any(marker in url for marker in SUPABASE_PATHS)
@@ -0,0 +1,219 @@
+"""Data-driven scenarios: compile scenarios/*.json (or .yaml) into steps.
+
+A scenario file references its entry in testsprite_frontend_test_plan.json
+through ``plan`` and lists structured steps::
+
+    {"action": "click", "target": {"role": "link", "name": "Se connecter",
+                                   "xpath": "html/body/div/div/nav/a[2]"}}
+    {"action": "fill", "target": {"css": "input[type=\\"email\\"]"}, "value": "..."}
+    {"action": "goto", "path": "/messages"}
+    {"action": "scroll", "by": 500}             # or "page" / "-page"
+    {"action": "expect", "state": "visible", "target": {"text": "Accueil"}}
+
+Targets are resolved by a shared resolver that prefers test ids, ARIA roles,
+labels, placeholders and text over CSS and absolute XPath, and remembers per
+page template (route with ids collapsed) which candidate matched, so later
+runs and repeated steps skip the probing.
+
+Given a support.flaky.Budget, a failing step is retried on its own (with the
+memoized locator forgotten) rather than failing the whole scenario.
+"""
+import asyncio
+import json
+import time
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import expect
+
+from . import readiness as ready
+from . import timeline
+from .flaky import step_key
+from .config import TESTS_DIR
+from .timeline import route_of
+
+try:
+    import yaml
+except ImportError:  # YAML scenarios are optional
+    yaml = None
+
+PLAN_PATH = TESTS_DIR / "testsprite_frontend_test_plan.json"
+SCENARIOS_DIR = TESTS_DIR / "scenarios"
+
+# Failures worth retrying a single step for
+RETRYABLE = (PlaywrightTimeoutError, AssertionError)
+
+# Resolution order, most to least robust
+SELECTOR_KINDS = ("test_id", "role", "label", "placeholder", "text", "css", "xpath")
+
+
+class ScenarioError(Exception):
+    pass
+
+
+class Resolver:
+    """Turns target specs into locators, memoizing the winner per page template."""
+
+    def __init__(self):
+        self.memo = {}
+
+    @staticmethod
+    def candidates(page, target):
+        found = []
+        for kind in SELECTOR_KINDS:
+            if kind not in target:
+                continue
+            value = target[kind]
+            if kind == "test_id":
+                found.append((kind, page.get_by_test_id(value)))
+            elif kind == "role":
+                found.append((kind, page.get_by_role(value, name=target.get("name"))))
+            elif kind == "label":
+                found.append((kind, page.get_by_label(value)))
+            elif kind == "placeholder":
+                found.append((kind, page.get_by_placeholder(value)))
+            elif kind == "text":
+                found.append((kind, page.get_by_text(value)))
+            elif kind == "css":
+                found.append((kind, page.locator(value)))
+            else:
+                found.append((kind, page.locator(f"xpath={value}")))
+        if not found:
+            raise ScenarioError(f"Target has no selector: {target}")
+        return found
+
+    @staticmethod
+    def _key(page, target):
+        return route_of(page.url), json.dumps(target, sort_keys=True, ensure_ascii=False)
+
+    def forget(self, page, target):
+        """Drop a memoized winner that just failed, so the next attempt re-probes."""
+        if target:
+            self.memo.pop(self._key(page, target), None)
+
+    async def resolve(self, page, target):
+        key = self._key(page, target)
+        candidates = self.candidates(page, target)
+        if key in self.memo:
+            return candidates[self.memo[key]][1].first
+        await ready.settle(page)
+        for position, (_kind, locator) in enumerate(candidates):
+            if await locator.count():
+                self.memo[key] = position
+                return locator.first
+        # Nothing matched yet: let the last candidate's auto-wait report the failure
+        return candidates[-1][1].first
+
+
+RESOLVER = Resolver()
+
+
+class Scenario:
+    def __init__(self, spec, plan=None):
+        self.id = spec["id"]
+        self.role = spec.get("role")
+        self.start = spec.get("start", "/")
+        self.steps = spec.get("steps", [])
+        self.failure_message = spec.get("failure_message")
+        self.plan = plan or {}
+        for number, step in enumerate(self.steps):
+            if step.get("action") not in STEP_ACTIONS:
+                raise ScenarioError(f"{self.id} step {number}: unknown action {step.get('action')!r}")
+
+    @property
+    def title(self):
+        return self.plan.get("title", self.id)
+
+    async def run_test(self, context, budget=None):
+        await ready.open_app(context, self.start)
+        for number, step in enumerate(self.steps):
+            key = step_key(self.id, number, step)
+            attempt = 0
+            while True:
+                page = context.pages[-1]
+                started = time.monotonic()
+                try:
+                    await STEP_ACTIONS[step["action"]](page, step)
+                    break
+                except RETRYABLE as exc:
+                    delay = budget.backoff(attempt, (time.monotonic() - started) * 1000) if budget else None
+                    if delay is None:
+                        if budget:
+                            budget.record(key, "failed")
+                        if isinstance(exc, AssertionError) and step["action"] == "expect" and self.failure_message:
+                            raise AssertionError(self.failure_message) from exc
+                        raise
+                    RESOLVER.forget(page, step.get("target"))
+                    await asyncio.sleep(delay / 1000)
+                    attempt += 1
+            if budget:
+                budget.record(key, "flaky" if attempt else "passed")
+
+
+async def _click(page, step):
+    await ready.click(await RESOLVER.resolve(page, step["target"]))
+
+
+async def _fill(page, step):
+    await ready.fill(await RESOLVER.resolve(page, step["target"]), step["value"])
+
+
+async def _goto(page, step):
+    await ready.goto(page, step["path"])
+
+
+async def _scroll(page, step):
+    by = step.get("by", "page")
+    async with timeline.step(page, "scroll", f"wheel {by}") as current:
+        if isinstance(by, str):
+            height = await page.evaluate("() => window.innerHeight")
+            by = -height if by.startswith("-") else height
+        await current.phase("action", page.mouse.wheel(0, by))
+
+
+async def _expect(page, step):
+    locator = await RESOLVER.resolve(page, step["target"])
+    timeout = step.get("timeout", 30000)
+    state = step.get("state", "visible")
+    async with timeline.step(page, "expect", locator) as current:
+        current.record["state"] = state
+        if state == "hidden":
+            await current.phase("assert", expect(locator).not_to_be_visible(timeout=timeout))
+        else:
+            await current.phase("assert", expect(locator).to_be_visible(timeout=timeout))
+
+
+STEP_ACTIONS = {
+    "click": _click,
+    "fill": _fill,
+    "goto": _goto,
+    "scroll": _scroll,
+    "expect": _expect,
+}
+
+
+def load_plan(path=PLAN_PATH):
+    with open(path, encoding="utf-8") as fh:
+        return {entry["id"]: entry for entry in json.load(fh)}
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as fh:
+        if path.suffix in (".yaml", ".yml"):
+            if yaml is None:
+                raise ScenarioError(f"{path.name}: PyYAML is required for YAML scenarios")
+            return yaml.safe_load(fh)
+        return json.load(fh)
+
+
+def load_scenarios(directory=SCENARIOS_DIR, plan_path=PLAN_PATH):
+    plan = load_plan(plan_path)
+    scenarios = []
+    for path in sorted(directory.iterdir()):
+        if path.suffix not in (".json", ".yaml", ".yml"):
+            continue
+        spec = _read(path)
+        spec.setdefault("id", path.stem)
+        if spec.get("plan") and spec["plan"] not in plan:
+            raise ScenarioError(f"{path.name}: unknown plan id {spec['plan']!r}")
+        scenarios.append(Scenario(spec, plan.get(spec.get("plan"))))
+    return scenarios
@@ -0,0 +1,121 @@
+"""Step-level retries and flakiness bookkeeping.
+
+A failed step (Playwright timeout or failed expectation) is retried with
+exponential backoff instead of rerunning the whole scenario, as long as the
+scenario's retry budget lasts. Every run's outcome per step and per scenario
+("passed", "flaky" = passed after a retry, "failed") is kept in a rolling
+window in tmp/flakiness.json (ZWA_FLAKINESS_PATH to share it between CI
+runs). A step or scenario whose window mixes passes with retries/failures
+above FLAKE_THRESHOLD is quarantined: its failures are still reported but no
+longer fail the run. Something that fails most of the time (passing in less
+than MIN_PASS_RATE of its window) is broken, not flaky, and is never
+quarantined.
+"""
+import json
+import os
+import time
+from pathlib import Path
+
+from .config import TMP_DIR
+
+STATS_PATH = Path(os.environ.get("ZWA_FLAKINESS_PATH", TMP_DIR / "flakiness.json"))
+
+# Time a scenario may spend on failed attempts and backoff, in total
+RETRY_BUDGET_MS = float(os.environ.get("ZWA_RETRY_BUDGET_MS", "60000"))
+MAX_RETRIES = int(os.environ.get("ZWA_MAX_RETRIES", "2"))
+BACKOFF_BASE_MS = 250
+
+WINDOW = 20
+MIN_RUNS = 5
+FLAKE_THRESHOLD = float(os.environ.get("ZWA_FLAKE_THRESHOLD", "0.1"))
+# Share of runs (passed or flaky) below which failures count as a real breakage
+MIN_PASS_RATE = float(os.environ.get("ZWA_MIN_PASS_RATE", "0.5"))
+
+
+def step_key(scenario_id, number, step):
+    target = json.dumps(step.get("target") or step.get("path") or "", sort_keys=True, ensure_ascii=False)
+    return f"{scenario_id}#{number}:{step['action']}:{target}"
+
+
+class Budget:
+    """Retry allowance of one scenario run, and the step outcomes it saw."""
+
+    def __init__(self, scenario_id, budget_ms=RETRY_BUDGET_MS, max_retries=MAX_RETRIES):
+        self.scenario_id = scenario_id
+        self.remaining_ms = budget_ms
+        self.max_retries = max_retries
+        self.outcomes = {}
+        self.retries = 0
+        self.failed_step = None
+
+    def backoff(self, attempt, failed_ms):
+        """Delay before retry number ``attempt + 1`` in ms, or None to give up."""
+        self.remaining_ms -= failed_ms
+        delay = BACKOFF_BASE_MS * 2 ** attempt
+        if attempt >= self.max_retries or self.remaining_ms < delay:
+            return None
+        self.remaining_ms -= delay
+        self.retries += 1
+        return delay
+
+    def record(self, key, outcome):
+        self.outcomes[key] = outcome
+        if outcome == "failed":
+            self.failed_step = key
+
+    @property
+    def outcome(self):
+        if self.failed_step:
+            return "failed"
+        return "flaky" if self.retries else "passed"
+
+
+class Stats:
+    def __init__(self, data=None):
+        self.data = data or {"scenarios": {}, "steps": {}}
+
+    @classmethod
+    def load(cls, path=STATS_PATH):
+        try:
+            with open(path, encoding="utf-8") as fh:
+                return cls(json.load(fh))
+        except (OSError, ValueError):
+            return cls()
+
+    def save(self, path=STATS_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.data, fh, indent=2, ensure_ascii=False)
+
+    def _push(self, kind, key, outcome):
+        entry = self.data[kind].setdefault(key, {"window": []})
+        entry["window"] = (entry["window"] + [outcome])[-WINDOW:]
+        entry["last_seen"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        entry["flake_rate"] = self.flake_rate(kind, key)
+
+    def record(self, budget, outcome=None):
+        """Fold one scenario run in; ``outcome`` overrides the budget's (e.g. setup errors)."""
+        for key, step_outcome in budget.outcomes.items():
+            self._push("steps", key, step_outcome)
+        self._push("scenarios", budget.scenario_id, outcome or budget.outcome)
+
+    def flake_rate(self, kind, key):
+        window = self.data[kind].get(key, {}).get("window", [])
+        if len(window) < MIN_RUNS or "passed" not in window and "flaky" not in window:
+            return 0.0
+        unstable = sum(1 for outcome in window if outcome != "passed")
+        return round(unstable / len(window), 3)
+
+    def pass_rate(self, kind, key):
+        window = self.data[kind].get(key, {}).get("window", [])
+        if not window:
+            return 0.0
+        return round(sum(1 for outcome in window if outcome != "failed") / len(window), 3)
+
+    def is_quarantined(self, kind, key):
+        return (self.flake_rate(kind, key) > FLAKE_THRESHOLD
+                and self.pass_rate(kind, key) >= MIN_PASS_RATE)
+
+    def quarantined(self):
+        return {kind: sorted(k for k in self.data[kind] if self.is_quarantined(kind, k))
+                for kind in ("scenarios", "steps")}
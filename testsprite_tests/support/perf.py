@@ -0,0 +1,109 @@
+"""In-page performance probes for the benchmark mode.
+
+An init script registers PerformanceObservers for LCP and long tasks before
+the app boots; ``collect`` then reads them together with the Navigation
+Timing entry and Chromium's JS heap size. Supabase traffic is counted from
+the context's network events.
+"""
+import asyncio
+import math
+
+from .config import is_supabase_request
+
+PERF_INIT_JS = """
+(() => {
+    const perf = window.__zwaPerf = { lcp: 0, longTasks: [] };
+    try {
+        new PerformanceObserver((list) => {
+            for (const entry of list.getEntries()) {
+                perf.lcp = entry.renderTime || entry.loadTime || entry.startTime;
+            }
+        }).observe({ type: 'largest-contentful-paint', buffered: true });
+        new PerformanceObserver((list) => {
+            for (const entry of list.getEntries()) perf.longTasks.push(entry.duration);
+        }).observe({ type: 'longtask', buffered: true });
+    } catch (e) {
+        // Observer types unsupported: metrics stay at 0
+    }
+})();
+"""
+
+COLLECT_JS = """
+() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const perf = window.__zwaPerf || { lcp: 0, longTasks: [] };
+    return {
+        ttfb_ms: nav ? nav.responseStart : 0,
+        dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd : 0,
+        load_ms: nav ? nav.loadEventEnd : 0,
+        lcp_ms: perf.lcp,
+        long_tasks: perf.longTasks.length,
+        blocking_ms: perf.longTasks.reduce((sum, d) => sum + Math.max(0, d - 50), 0),
+        js_heap_bytes: performance.memory ? performance.memory.usedJSHeapSize : 0,
+    };
+}
+"""
+
+
+class SupabaseTraffic:
+    """Counts Supabase requests and response bytes seen by a context."""
+
+    def __init__(self, context):
+        self.requests = 0
+        self.bytes = 0
+        self._pending = set()
+        context.on("requestfinished", self._on_finished)
+
+    def _on_finished(self, request):
+        if not is_supabase_request(request.url):
+            return
+        self.requests += 1
+        task = asyncio.ensure_future(self._add_size(request))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _add_size(self, request):
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return
+        self.bytes += sizes.get("responseBodySize", 0) + sizes.get("responseHeadersSize", 0)
+
+    async def drain(self):
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+
+async def install(context):
+    await context.add_init_script(PERF_INIT_JS)
+    return SupabaseTraffic(context)
+
+
+async def collect(page, traffic):
+    metrics = await page.evaluate(COLLECT_JS)
+    await traffic.drain()
+    metrics["supabase_requests"] = traffic.requests
+    metrics["supabase_bytes"] = traffic.bytes
+    return {key: round(value, 1) for key, value in metrics.items()}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile; good enough for a handful of repetitions."""
+    if not values:
+        return 0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples):
+    """Turn a list of metric dicts into {metric: {p50, p95, mean}}."""
+    summary = {}
+    for key in samples[0] if samples else []:
+        values = [sample[key] for sample in samples]
+        summary[key] = {
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "mean": round(sum(values) / len(values), 1),
+        }
+    return summary
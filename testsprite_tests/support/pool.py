@@ -0,0 +1,74 @@
+"""A small pool of Chromium instances shared by every scenario.
+
+Launching Chromium is the most expensive part of a scenario, so the pool
+starts the browsers once and hands out a fresh BrowserContext (an isolated
+incognito profile) per scenario instead.
+"""
+import itertools
+from contextlib import asynccontextmanager
+
+from playwright import async_api
+
+from . import auth_state, replay
+from .config import DEFAULT_TIMEOUT_MS
+
+# Same flags as the generated scripts, minus --single-process: with several
+# contexts open at once a single-process Chromium becomes unstable.
+BROWSER_ARGS = [
+    "--window-size=1280,720",         # Set the browser window size
+    "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
+    "--ipc=host",                     # Use host-level IPC for better stability
+]
+
+
+class BrowserPool:
+    def __init__(self, size=1, headless=True):
+        self.size = max(1, size)
+        self.headless = headless
+        self._pw = None
+        self._browsers = []
+        self._cycle = None
+
+    async def start(self):
+        self._pw = await async_api.async_playwright().start()
+        for _ in range(self.size):
+            browser = await self._pw.chromium.launch(headless=self.headless, args=BROWSER_ARGS)
+            self._browsers.append(browser)
+        self._cycle = itertools.cycle(self._browsers)
+        return self
+
+    async def stop(self):
+        for browser in self._browsers:
+            try:
+                await browser.close()
+            except async_api.Error:
+                pass
+        self._browsers = []
+        if self._pw:
+            await self._pw.stop()
+            self._pw = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    def acquire(self):
+        # Round-robin: contexts are cheap, so spreading them evenly is enough
+        return next(self._cycle)
+
+    @asynccontextmanager
+    async def context(self, role=None, **options):
+        """Open an isolated context, already logged in as ``role`` if given."""
+        browser = self.acquire()
+        if role:
+            options["storage_state"] = await auth_state.storage_state(browser, role)
+        context = await browser.new_context(**options)
+        context.set_default_timeout(DEFAULT_TIMEOUT_MS)
+        await replay.attach(context)
+        try:
+            yield context
+        finally:
+            await context.close()
+
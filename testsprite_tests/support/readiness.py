@@ -0,0 +1,172 @@
+"""Event-driven waits that replace fixed ``wait_for_timeout`` sleeps.
+
+Before each interaction we wait for the app to be quiet rather than for a
+fixed 3 s: no Supabase REST/auth/storage request in flight, every realtime
+channel join acknowledged, and React Query reporting no fetch or mutation in
+progress (``window.__zwaQueryIdle``, exposed by App.tsx in dev builds).
+Playwright's own actionability checks then cover visibility and stability.
+
+Every wait is capped by ``READY_CAP_MS``; hitting the cap is not an error,
+the step simply proceeds the way the old fixed sleep did.
+"""
+import asyncio
+import json
+import os
+import time
+import weakref
+
+from playwright import async_api
+
+from . import timeline
+from .config import BASE_URL, DEFAULT_TIMEOUT_MS, is_supabase_request
+
+READY_CAP_MS = int(os.environ.get("ZWA_READY_CAP_MS", "10000"))
+
+# A request must have been settled for this long before the network counts as idle
+QUIET_MS = int(os.environ.get("ZWA_READY_QUIET_MS", "150"))
+
+_QUERY_IDLE_JS = "() => typeof window.__zwaQueryIdle !== 'function' || window.__zwaQueryIdle()"
+
+_trackers = weakref.WeakKeyDictionary()
+
+
+def _decode_frame(payload):
+    """Return (event, ref) of a Phoenix frame in either serializer format."""
+    try:
+        message = json.loads(payload)
+    except (TypeError, ValueError):
+        return None, None
+    if isinstance(message, list) and len(message) == 5:
+        # vsn 2.0.0: [join_ref, ref, topic, event, payload]
+        return message[3], message[1]
+    if isinstance(message, dict):
+        return message.get("event"), message.get("ref")
+    return None, None
+
+
+class NetworkTracker:
+    """Follows the Supabase traffic of one browser context."""
+
+    def __init__(self, context):
+        self.inflight = set()
+        self.pending_joins = set()
+        self.last_activity = time.monotonic()
+        context.on("request", self._on_request)
+        context.on("requestfinished", self._on_done)
+        context.on("requestfailed", self._on_done)
+        context.on("page", self._watch_page)
+        for page in context.pages:
+            self._watch_page(page)
+
+    def _touch(self):
+        self.last_activity = time.monotonic()
+
+    def _on_request(self, request):
+        if is_supabase_request(request.url):
+            self.inflight.add(request)
+            self._touch()
+
+    def _on_done(self, request):
+        if request in self.inflight:
+            self.inflight.discard(request)
+            self._touch()
+
+    def _watch_page(self, page):
+        page.on("websocket", self._watch_socket)
+
+    def _watch_socket(self, ws):
+        if "/realtime/v1/" not in ws.url:
+            return
+        ws.on("framesent", self._on_frame_sent)
+        ws.on("framereceived", self._on_frame_received)
+        ws.on("close", lambda _ws: self.pending_joins.clear())
+
+    def _on_frame_sent(self, payload):
+        event, ref = _decode_frame(payload)
+        if event == "phx_join" and ref is not None:
+            self.pending_joins.add(ref)
+            self._touch()
+
+    def _on_frame_received(self, payload):
+        event, ref = _decode_frame(payload)
+        if event == "phx_reply" and ref in self.pending_joins:
+            self.pending_joins.discard(ref)
+            self._touch()
+
+    def is_idle(self):
+        if self.inflight or self.pending_joins:
+            return False
+        return (time.monotonic() - self.last_activity) * 1000 >= QUIET_MS
+
+    async def wait_idle(self, timeout_ms=READY_CAP_MS):
+        deadline = time.monotonic() + timeout_ms / 1000
+        while not self.is_idle():
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.05)
+        return True
+
+
+def track(context):
+    """Attach (once) and return the network tracker of a context."""
+    tracker = _trackers.get(context)
+    if tracker is None:
+        tracker = _trackers[context] = NetworkTracker(context)
+    return tracker
+
+
+async def settle(page, timeout_ms=READY_CAP_MS):
+    """Wait until the page is quiet, or until ``timeout_ms`` has elapsed."""
+    deadline = time.monotonic() + timeout_ms / 1000
+    try:
+        await page.wait_for_load_state("domcontentloaded", timeout=timeout_ms)
+    except async_api.Error:
+        pass
+    tracker = track(page.context)
+    await tracker.wait_idle(max(0, (deadline - time.monotonic()) * 1000))
+    remaining = max(1, (deadline - time.monotonic()) * 1000)
+    try:
+        await page.wait_for_function(_QUERY_IDLE_JS, timeout=remaining, polling=50)
+    except async_api.Error:
+        pass
+    # React Query finishing usually kicks off a render that may fetch again
+    await tracker.wait_idle(max(0, (deadline - time.monotonic()) * 1000))
+
+
+async def _act(action, locator, perform, timeout):
+    page = locator.page
+    async with timeline.step(page, action, locator) as step:
+        await step.phase("settle", settle(page))
+        await step.phase("locate", locator.wait_for(state="visible", timeout=timeout))
+        url_before = page.url
+        await step.phase("action", perform())
+        if page.url != url_before:
+            await step.phase("navigation", settle(page))
+
+
+async def click(locator, timeout=DEFAULT_TIMEOUT_MS, **options):
+    await _act("click", locator, lambda: locator.click(timeout=timeout, **options), timeout)
+
+
+async def fill(locator, value, timeout=DEFAULT_TIMEOUT_MS, **options):
+    await _act("fill", locator, lambda: locator.fill(value, timeout=timeout, **options), timeout)
+
+
+def url(path="/"):
+    if path.startswith("http"):
+        return path
+    return BASE_URL + "/" + path.lstrip("/")
+
+
+async def goto(page, path="/", timeout=10000):
+    async with timeline.step(page, "goto", url(path)) as step:
+        await step.phase("navigation", page.goto(url(path), wait_until="commit", timeout=timeout))
+        await step.phase("settle", settle(page))
+
+
+async def open_app(context, path="/"):
+    """Open a new tab on ``path`` and wait for the app to be ready."""
+    track(context)
+    page = await context.new_page()
+    await goto(page, path)
+    return page
@@ -0,0 +1,159 @@
+"""Record and replay the Supabase/Cloudinary traffic of a scenario.
+
+``ZWA_NETWORK_MODE=record`` passes matching requests through to the network
+and stores every response in a zip archive; ``ZWA_NETWORK_MODE=replay``
+loads the archive into memory once and fulfils the same requests from it
+without touching the network. Realtime websockets are not routed.
+
+Requests are keyed by method, host and path, the sorted query string, the
+headers that change the response shape (Accept, Prefer, Range) and a hash of
+the body, with ISO timestamps in JSON bodies masked so that ``read_at: now()``
+style payloads still match. A key that was seen several times replays its
+responses in order. Bodies are stored by content hash, so the same product
+image referenced from many pages is stored once.
+"""
+import hashlib
+import json
+import os
+import re
+import zipfile
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from .config import TMP_DIR, is_supabase_request
+
+MODE = os.environ.get("ZWA_NETWORK_MODE", "").lower()
+ARCHIVE_PATH = os.environ.get("ZWA_NETWORK_ARCHIVE", str(TMP_DIR / "network_archive.zip"))
+
+CAPTURED_HOSTS = ("supabase.co", "cloudinary.com")
+KEY_HEADERS = ("accept", "prefer", "range")
+DROPPED_HEADERS = {"content-length", "content-encoding", "transfer-encoding", "date", "set-cookie", "connection"}
+
+_ISO_TIMESTAMP = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}")
+
+
+def should_capture(url):
+    if is_supabase_request(url):
+        return True
+    host = urlparse(url).hostname or ""
+    return any(host.endswith(captured) for captured in CAPTURED_HOSTS)
+
+
+def _mask(value):
+    if isinstance(value, dict):
+        return {k: _mask(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_mask(v) for v in value]
+    if isinstance(value, str) and _ISO_TIMESTAMP.match(value):
+        return "<timestamp>"
+    return value
+
+
+def body_hash(body):
+    if not body:
+        return ""
+    try:
+        body = json.dumps(_mask(json.loads(body)), sort_keys=True).encode()
+    except (ValueError, UnicodeDecodeError):
+        pass
+    return hashlib.sha256(body).hexdigest()[:16]
+
+
+def request_key(method, url, headers, body):
+    parsed = urlparse(url)
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    shape = "|".join(f"{h}={headers.get(h, '')}" for h in KEY_HEADERS)
+    return f"{method} {parsed.hostname}{parsed.path}?{query} [{shape}] #{body_hash(body)}"
+
+
+class Archive:
+    def __init__(self):
+        self.entries = {}      # key -> [{"status", "headers", "blob"}, ...]
+        self.blobs = {}        # sha256 -> bytes
+        self.misses = []
+
+    @classmethod
+    def load(cls, path):
+        archive = cls()
+        with zipfile.ZipFile(path) as zf:
+            archive.entries = json.loads(zf.read("index.json"))
+            for name in zf.namelist():
+                if name.startswith("blobs/"):
+                    archive.blobs[name[len("blobs/"):]] = zf.read(name)
+        return archive
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("index.json", json.dumps(self.entries, indent=1, sort_keys=True))
+            for digest, data in self.blobs.items():
+                zf.writestr(f"blobs/{digest}", data)
+
+    def add(self, key, status, headers, body):
+        digest = hashlib.sha256(body).hexdigest()
+        self.blobs.setdefault(digest, body)
+        headers = {k: v for k, v in headers.items() if k.lower() not in DROPPED_HEADERS}
+        self.entries.setdefault(key, []).append({"status": status, "headers": headers, "blob": digest})
+
+
+class Recorder:
+    def __init__(self, archive):
+        self.archive = archive
+
+    async def handle(self, route):
+        request = route.request
+        response = await route.fetch()
+        body = await response.body()
+        key = request_key(request.method, request.url, request.headers, request.post_data_buffer)
+        self.archive.add(key, response.status, response.headers, body)
+        await route.fulfill(response=response, body=body)
+
+
+class Replayer:
+    def __init__(self, archive):
+        self.archive = archive
+        self.cursors = {}      # key -> responses already served, per context
+
+    async def handle(self, route):
+        request = route.request
+        key = request_key(request.method, request.url, request.headers, request.post_data_buffer)
+        responses = self.archive.entries.get(key)
+        if not responses:
+            self.archive.misses.append(key)
+            await route.fulfill(status=504, content_type="application/json",
+                                body=json.dumps({"message": "Not in network archive", "key": key}))
+            return
+        index = self.cursors.get(key, 0)
+        self.cursors[key] = index + 1
+        entry = responses[min(index, len(responses) - 1)]
+        await route.fulfill(status=entry["status"], headers=entry["headers"],
+                            body=self.archive.blobs[entry["blob"]])
+
+
+_archive = None
+
+
+def archive():
+    """The process-wide archive: loaded once for replay, accumulated for record."""
+    global _archive
+    if _archive is None:
+        _archive = Archive.load(ARCHIVE_PATH) if MODE == "replay" else Archive()
+    return _archive
+
+
+async def attach(context):
+    """Route the context's captured traffic through the recorder or replayer."""
+    if MODE == "record":
+        handler = Recorder(archive()).handle
+    elif MODE == "replay":
+        # Each context replays from the start of every key's sequence
+        handler = Replayer(archive()).handle
+    else:
+        return
+    await context.route(should_capture, handler)
+
+
+def save():
+    """Write the recorded archive (record mode) and return replay misses."""
+    if MODE == "record" and _archive is not None:
+        _archive.save(ARCHIVE_PATH)
+    return list(_archive.misses) if _archive is not None else []
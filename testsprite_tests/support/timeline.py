@@ -0,0 +1,157 @@
+"""Per-step timing of a scenario, written as a JSON timeline.
+
+Every click, fill and navigation made through support.readiness is recorded
+as a step with monotonic start/end, time spent waiting for the app to settle,
+resolving the locator, performing the action and following a navigation, plus
+the number of requests (all / Supabase) it triggered. The runner writes one
+timeline per scenario to tmp/timelines/ and an aggregate of the slowest steps
+and routes to tmp/slowest_steps.json.
+"""
+import json
+import re
+import time
+import weakref
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+from .config import TMP_DIR, is_supabase_request
+
+TIMELINE_DIR = TMP_DIR / "timelines"
+REPORT_PATH = TMP_DIR / "slowest_steps.json"
+
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$", re.I)
+
+_timelines = weakref.WeakKeyDictionary()
+
+
+def route_of(url):
+    """Collapse ids so /product/5f0c… and /product/81ab… aggregate together."""
+    path = urlparse(url).path or "/"
+    return "/".join(":id" if _ID_SEGMENT.match(part) else part for part in path.split("/")) or "/"
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1)
+
+
+class Timeline:
+    def __init__(self, context, scenario):
+        self.scenario = scenario
+        self.started = time.monotonic()
+        self.steps = []
+        self.requests = 0
+        self.supabase_requests = 0
+        context.on("request", self._on_request)
+
+    def _on_request(self, request):
+        self.requests += 1
+        if is_supabase_request(request.url):
+            self.supabase_requests += 1
+
+    def to_dict(self, status=None, error=None):
+        return {
+            "scenario": self.scenario,
+            "status": status,
+            "error": error,
+            "duration_ms": _ms(time.monotonic() - self.started),
+            "requests": self.requests,
+            "supabase_requests": self.supabase_requests,
+            "steps": self.steps,
+        }
+
+
+class Step:
+    def __init__(self, page, action, target, timeline):
+        self.page = page
+        self.timeline = timeline
+        self.record = {"action": action, "target": target, "url": page.url, "route": route_of(page.url)}
+
+    async def phase(self, name, awaitable):
+        """Await ``awaitable`` and record how long it took as ``<name>_ms``."""
+        started = time.monotonic()
+        try:
+            return await awaitable
+        finally:
+            self.record[f"{name}_ms"] = _ms(time.monotonic() - started)
+
+
+def start(context, scenario):
+    timeline = _timelines[context] = Timeline(context, scenario)
+    return timeline
+
+
+def finish(context, status, error=None):
+    """Write the context's timeline to tmp/timelines/ and return it as a dict."""
+    timeline = _timelines.pop(context, None)
+    if timeline is None:
+        return None
+    data = timeline.to_dict(status, error)
+    TIMELINE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(TIMELINE_DIR / f"{timeline.scenario}.json", "w", encoding="utf-8") as fh:
+        json.dump(data, fh, indent=2, ensure_ascii=False)
+    return data
+
+
+def describe(target):
+    if isinstance(target, str):
+        return target
+    # Locator reprs look like <Locator frame=... selector='xpath=...'>
+    match = re.search(r"selector='(.*)'>", repr(target))
+    return match.group(1) if match else repr(target)
+
+
+@asynccontextmanager
+async def step(page, action, target=None):
+    timeline = _timelines.get(page.context)
+    current = Step(page, action, describe(target), timeline)
+    if timeline is None:
+        yield current
+        return
+
+    record = current.record
+    record["index"] = len(timeline.steps)
+    requests_before, supabase_before = timeline.requests, timeline.supabase_requests
+    started = time.monotonic()
+    record["start_ms"] = _ms(started - timeline.started)
+    record["status"] = "passed"
+    try:
+        yield current
+    except BaseException as exc:
+        record["status"] = "failed"
+        record["error"] = f"{type(exc).__name__}: {exc}".splitlines()[0]
+        raise
+    finally:
+        ended = time.monotonic()
+        record["end_ms"] = _ms(ended - timeline.started)
+        record["duration_ms"] = _ms(ended - started)
+        record["requests"] = timeline.requests - requests_before
+        record["supabase_requests"] = timeline.supabase_requests - supabase_before
+        record["url_after"] = page.url
+        timeline.steps.append(record)
+
+
+def slowest_steps(timelines, limit=10):
+    """Aggregate a suite run: slowest individual steps and time spent per route."""
+    steps = []
+    routes = {}
+    for data in timelines:
+        if not data:
+            continue
+        for record in data["steps"]:
+            steps.append({"scenario": data["scenario"], **record})
+            route = routes.setdefault(record["route"], {"route": record["route"], "steps": 0, "total_ms": 0.0, "max_ms": 0.0})
+            route["steps"] += 1
+            route["total_ms"] = round(route["total_ms"] + record["duration_ms"], 1)
+            route["max_ms"] = max(route["max_ms"], record["duration_ms"])
+    steps.sort(key=lambda r: r["duration_ms"], reverse=True)
+    by_route = sorted(routes.values(), key=lambda r: r["total_ms"], reverse=True)
+    for route in by_route:
+        route["mean_ms"] = round(route["total_ms"] / route["steps"], 1)
+    return {"slowest_steps": steps[:limit], "routes": by_route}
+
+
+def write_report(timelines, limit=10):
+    report = slowest_steps(timelines, limit)
+    with open(REPORT_PATH, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2, ensure_ascii=False)
+    return report
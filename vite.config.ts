@@ -1,9 +1,65 @@
-import { defineConfig } from 'vite'
+import { defineConfig, Plugin } from 'vite'
 import react from '@vitejs/plugin-react'
+import { gzipSync } from 'node:zlib'
+
+// Startup budget (gzip KB): the entry chunk alone, and everything a first visit downloads before
+// rendering (entry + statically imported chunks + their CSS). Lazy route chunks are not counted.
+// Override for a one-off build with ZWA_BUDGET_ENTRY_KB / ZWA_BUDGET_STARTUP_KB.
+const BUDGET_KB = {
+    entry: Number(process.env.ZWA_BUDGET_ENTRY_KB || 90),
+    startup: Number(process.env.ZWA_BUDGET_STARTUP_KB || 230),
+}
+
+function startupBudget(): Plugin {
+    return {
+        name: 'zwa-startup-budget',
+        apply: 'build',
+        generateBundle(_options, bundle) {
+            const entry = Object.values(bundle).find(file => file.type === 'chunk' && file.isEntry)
+            if (!entry || entry.type !== 'chunk') return
+
+            const startup = new Set<string>()
+            const visit = (fileName: string) => {
+                const file = bundle[fileName]
+                if (!file || startup.has(fileName)) return
+                startup.add(fileName)
+                if (file.type === 'chunk') {
+                    file.imports.forEach(visit)
+                    file.viteMetadata?.importedCss.forEach(visit)
+                }
+            }
+            visit(entry.fileName)
+
+            const gzipKb = (fileName: string) => {
+                const file = bundle[fileName]
+                const source = file.type === 'chunk' ? file.code : file.source
+                return Math.round(gzipSync(source).length / 102.4) / 10
+            }
+            const files = Array.from(startup).map(fileName => ({ file: fileName, gzipKb: gzipKb(fileName) }))
+            const report = {
+                budgetKb: BUDGET_KB,
+                entry: files[0],
+                startupKb: Math.round(files.reduce((sum, f) => sum + f.gzipKb, 0) * 10) / 10,
+                startupFiles: files,
+            }
+
+            this.emitFile({ type: 'asset', fileName: 'startup-budget.json', source: JSON.stringify(report, null, 2) })
+            console.log(`\n[budget] entry ${report.entry.gzipKb} / ${BUDGET_KB.entry} KB gz, startup ${report.startupKb} / ${BUDGET_KB.startup} KB gz`)
+
+            const over = [
+                report.entry.gzipKb > BUDGET_KB.entry && `entry chunk ${report.entry.file} is ${report.entry.gzipKb} KB gz (budget ${BUDGET_KB.entry} KB)`,
+                report.startupKb > BUDGET_KB.startup && `startup payload is ${report.startupKb} KB gz (budget ${BUDGET_KB.startup} KB)`,
+            ].filter(Boolean)
+            if (over.length) {
+                this.error(`Startup budget exceeded: ${over.join('; ')}. Lazy-load the new code (see src/routes.ts) or raise the budget in vite.config.ts.`)
+            }
+        },
+    }
+}
 
 // https://vitejs.dev/config/
 export default defineConfig({
-    plugins: [react()],
+    plugins: [react(), startupBudget()],
     build: {
         rollupOptions: {
             output: {